@@ -0,0 +1,646 @@
+import asyncio , collections , contextlib , contextvars , functools , itertools , time , weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from DbUnify.DbUnify import DatabaseManager, QueryInstrumentation, ResultCache, _table_key
+
+# DatabaseManager methods exposed as coroutines on AsyncDatabaseManager.
+_MIRRORED_METHODS = [
+    'set_password', 'backup_database', 'restore_database', 'execute_query', 'fetch_all', 'fetch_columns',
+    'create_table', 'drop_table', 'add_column', 'insert_row', 'insert_rows', 'delete_column', 'delete_row',
+    'update_row', 'search_one', 'search_all', 'list_tables', 'chart_data', 'create_chart_table',
+    'create_chart_database', 'export_data_csv', 'export_database_csv', 'import_data_csv', 'create_json_table',
+    'create_xml_table', 'insert_json_data', 'insert_xml_data', 'retrieve_json_data', 'retrieve_xml_data',
+    'find_json', 'create_json_index', 'insert_json_many', 'retrieve_json_many', 'import_xml', 'export_to_pdf',
+    'insert_base64', 'read_base64', 'write_blob', 'create_index', 'drop_index', 'list_indexes', 'explain',
+    'index_advice', 'paginate',
+]
+
+class _ConnectionWorker:
+    """
+    One DatabaseManager connection plus the single thread that is allowed to use it.
+
+    Every driver call for the connection runs on the worker's own thread, so drivers that are not
+    thread-safe (or, like sqlite3, tied to the thread that opened them) behave as in synchronous code.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dbunify-async')
+        self.manager = None
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking callable on the worker's thread.
+
+        Args:
+            func (callable): The callable to run.
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+
+        Returns:
+            The callable's result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def open(self, db_type, db_name, password, kwargs):
+        """
+        Open the worker's connection on its own thread.
+        """
+        try:
+            self.manager = await self.run(DatabaseManager, db_type, db_name, password, **kwargs)
+        except BaseException:
+            self.executor.shutdown(wait=False)
+            raise
+
+    async def close(self):
+        """
+        Close the worker's connection and stop its thread.
+        """
+        try:
+            if self.manager is not None:
+                await self.run(self.manager.close)
+        finally:
+            self.executor.shutdown(wait=False)
+
+class _AsyncPool:
+    """
+    asyncio pool of _ConnectionWorker objects with checkout wait-time metrics.
+    """
+
+    def __init__(self, open_worker, min_size, max_size, checkout_timeout):
+        """
+        Initialize the _AsyncPool instance.
+
+        Args:
+            open_worker (callable): Coroutine function returning a new, open _ConnectionWorker.
+            min_size (int): Number of connections opened by AsyncDatabaseManager.open().
+            max_size (int): Maximum number of connections (and threads).
+            checkout_timeout (float): Seconds to wait for a free connection.
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self._open_worker = open_worker
+        self._idle = collections.deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_in_use = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _condition(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def fill(self):
+        """
+        Open connections until the pool holds min_size of them.
+        """
+        while self._size < self.min_size:
+            self._size += 1
+            try:
+                worker = await self._open_worker()
+            except BaseException:
+                self._size -= 1
+                raise
+            self._idle.append(worker)
+
+    async def acquire(self):
+        """
+        Check out a connection worker, opening one if the pool is below max_size.
+
+        Returns:
+            _ConnectionWorker: The checked-out worker.
+
+        Raises:
+            TimeoutError: If no connection became free in time.
+        """
+        cond = self._condition()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    worker = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    worker = None
+                    break
+                remaining = start + self.checkout_timeout - loop.time()
+                try:
+                    await asyncio.wait_for(cond.wait(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise TimeoutError(f"Timed out after {loop.time() - start:.3f}s waiting for a pooled connection")
+            waited = loop.time() - start
+            self._in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+        if worker is None:
+            try:
+                worker = await self._open_worker()
+            except BaseException:
+                async with cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    cond.notify()
+                raise
+        return worker
+
+    async def release(self, worker):
+        """
+        Return a checked-out worker to the pool.
+
+        Args:
+            worker (_ConnectionWorker): The worker returned by acquire().
+        """
+        cond = self._condition()
+        async with cond:
+            self._in_use -= 1
+            if self._closed:
+                self._size -= 1
+            else:
+                self._idle.append(worker)
+                worker = None
+            cond.notify()
+        if worker is not None:
+            await worker.close()
+
+    def stats(self):
+        """
+        Get pool size, utilization and wait-time metrics.
+
+        Returns:
+            dict: Pool metrics.
+        """
+        return {
+            'size': self._size,
+            'idle': len(self._idle),
+            'in_use': self._in_use,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'utilization': self._in_use / self.max_size,
+            'peak_in_use': self.peak_in_use,
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'wait_time_total': self.wait_time_total,
+            'wait_time_avg': self.wait_time_total / self.checkouts if self.checkouts else 0.0,
+            'wait_time_max': self.wait_time_max,
+        }
+
+    async def close(self):
+        """
+        Close all idle connections. Connections still checked out are closed when released.
+        """
+        cond = self._condition()
+        async with cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            cond.notify_all()
+        for worker in idle:
+            await worker.close()
+
+class AsyncDatabaseManager:
+    """
+    asyncio front end for DatabaseManager.
+
+    Each pooled connection is owned by its own single-thread executor, so driver calls never block the
+    event loop and never hop between threads. Calls from concurrent tasks are spread over up to
+    pool_max_size connections. All DatabaseManager methods listed in _MIRRORED_METHODS are available
+    as coroutines with the same arguments; iter_query, iter_table and iter_base64 are async generators.
+
+    open_blob is not mirrored: its file object reads through the connection of the thread that opened it.
+    Open, read and close the BLOB inside a function passed to run() instead.
+    """
+
+    def __init__(self, db_type, db_name, password=None, pool_max_size=10, pool_min_size=1, pool_checkout_timeout=30.0,
+                 result_cache_size=None, result_cache_bytes=None, result_cache_ttl=None, **kwargs):
+        """
+        Initialize the AsyncDatabaseManager instance. Connections are opened by open() or on first use.
+
+        Args:
+            db_type (str): The type of the database ('sqlite', 'mysql', 'postgresql', 'mongodb', 'sqlserver').
+            db_name (str): The name of the database or connection URI.
+            password (str): The password for the database (if required).
+            pool_max_size (int): Maximum number of connections, each with its own thread.
+            pool_min_size (int): Connections opened by open().
+            pool_checkout_timeout (float): Seconds to wait for a free connection.
+            result_cache_size (int): Enable a result cache shared by all connections, as in DatabaseManager.
+            result_cache_bytes (int): Approximate memory limit of the result cache in bytes.
+            result_cache_ttl (float): Seconds a cached result stays valid.
+            **kwargs: Additional keyword arguments passed to DatabaseManager.
+        """
+        self.db_type = db_type
+        self.db_name = db_name
+        self._password = password
+        self._kwargs = kwargs
+        self.result_cache = None
+        if result_cache_size is not None or result_cache_bytes is not None:
+            self.result_cache = ResultCache(result_cache_size, result_cache_bytes, result_cache_ttl)
+        self.instrumentation = QueryInstrumentation()
+        self._workers = weakref.WeakSet()
+        self.pool = _AsyncPool(self._open_worker, pool_min_size, pool_max_size, pool_checkout_timeout)
+        self._group_commit = None
+        # Worker pinned to the current task by transaction(), batch() and checkout().
+        self._pinned = contextvars.ContextVar(f'dbunify_pinned_{id(self)}', default=None)
+
+    async def _open_worker(self):
+        worker = _ConnectionWorker()
+        await worker.open(self.db_type, self.db_name, self._password, self._kwargs)
+        # One cache for all connections, so a write on any of them invalidates it.
+        worker.manager.result_cache = self.result_cache
+        worker.manager._group_commit = self._group_commit
+        worker.manager.instrumentation = self.instrumentation
+        worker.manager._instrumentation_changed()
+        self._workers.add(worker)
+        return worker
+
+    def _instrumentation_changed(self):
+        for worker in list(self._workers):
+            worker.manager._instrumentation_changed()
+
+    def add_query_hook(self, before=None, after=None):
+        """
+        Register hooks called around every statement, on the thread of the connection running it.
+
+        Args:
+            before (callable): Called as before(sql, param_count) before the statement runs.
+            after (callable): Called as after(sql, param_count, row_count, duration, error) once it finished.
+        """
+        self.instrumentation.add_hook(before, after)
+        self._instrumentation_changed()
+
+    def remove_query_hook(self, before=None, after=None):
+        """
+        Unregister hooks added with add_query_hook().
+
+        Args:
+            before (callable): The before hook to remove.
+            after (callable): The after hook to remove.
+        """
+        self.instrumentation.remove_hook(before, after)
+        self._instrumentation_changed()
+
+    def set_slow_query_log(self, threshold_ms, logger=None):
+        """
+        Log a warning for every statement slower than a threshold.
+
+        Args:
+            threshold_ms (float): Threshold in milliseconds. None disables the slow-query log.
+            logger (logging.Logger): Logger to write to. Defaults to the 'DbUnify' logger.
+        """
+        self.instrumentation.set_slow_query_log(threshold_ms, logger)
+        self._instrumentation_changed()
+
+    def set_query_stats(self, enabled=True, max_fingerprints=1000):
+        """
+        Enable or disable latency histograms per statement fingerprint, shared by all connections.
+
+        Args:
+            enabled (bool): Whether to record latencies. Disabling discards the recorded ones.
+            max_fingerprints (int): Distinct fingerprints tracked; further ones are counted under 'other'.
+        """
+        self.instrumentation.set_stats(enabled, max_fingerprints)
+        self._instrumentation_changed()
+
+    def set_index_advisor(self, enabled=True, max_conditions=1000):
+        """
+        Enable or disable the index advisor for all connections; index_advice() reads what it recorded.
+
+        Args:
+            enabled (bool): Whether to record conditions. Disabling discards the recorded ones.
+            max_conditions (int): Distinct (table, condition fingerprint) pairs tracked; further ones are ignored.
+        """
+        self.instrumentation.set_advisor(enabled, max_conditions)
+        self._instrumentation_changed()
+
+    def query_stats(self, reset=False):
+        """
+        Get latency statistics per statement fingerprint.
+
+        Args:
+            reset (bool): Discard the recorded latencies after taking the snapshot.
+
+        Returns:
+            dict: Fingerprint -> count, errors, total/mean/p50/p95/p99/max seconds, or None when disabled.
+        """
+        snapshot = self.instrumentation.snapshot()
+        if reset:
+            self.instrumentation.reset()
+        return snapshot
+
+    def query_stats_prometheus(self, prefix='dbunify_query'):
+        """
+        Export the latency statistics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: A summary metric with p50/p95/p99 quantiles and an error counter, labelled by fingerprint.
+        """
+        return self.instrumentation.prometheus(prefix)
+
+    async def open(self):
+        """
+        Open pool_min_size connections up front.
+
+        Returns:
+            AsyncDatabaseManager: The manager itself.
+
+        Raises:
+            ConnectionError: If there is an error connecting to the database.
+        """
+        await self.pool.fill()
+        return self
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    @contextlib.asynccontextmanager
+    async def _worker(self):
+        """
+        Use the worker pinned to the current task, or check one out for the duration of the block.
+        """
+        pinned = self._pinned.get()
+        if pinned is not None:
+            yield pinned
+            return
+        worker = await self.pool.acquire()
+        try:
+            yield worker
+        finally:
+            await self.pool.release(worker)
+
+    async def _call(self, name, *args, **kwargs):
+        async with self._worker() as worker:
+            return await worker.run(getattr(worker.manager, name), *args, **kwargs)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking callable against a pooled DatabaseManager on its connection's thread.
+
+        Args:
+            func (callable): Called as func(manager, *args, **kwargs).
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+
+        Returns:
+            The callable's result.
+        """
+        async with self._worker() as worker:
+            return await worker.run(func, worker.manager, *args, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def checkout(self):
+        """
+        Pin one connection to the current task for the block.
+
+        Yields:
+            AsyncDatabaseManager: The manager itself; calls inside the block use the pinned connection.
+        """
+        if self._pinned.get() is not None:
+            yield self
+            return
+        async with self._worker() as worker:
+            token = self._pinned.set(worker)
+            try:
+                yield self
+            finally:
+                self._pinned.reset(token)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """
+        Run the block in a database transaction on one pinned connection.
+
+        Statements are committed once when the block exits and rolled back if it raises; nested blocks
+        use savepoints, as with DatabaseManager.transaction().
+
+        Yields:
+            AsyncDatabaseManager: The manager itself.
+        """
+        async with self._context_block(lambda manager: manager.transaction()):
+            yield self
+
+    @contextlib.asynccontextmanager
+    async def batch(self, commit_every=None, commit_interval_ms=None):
+        """
+        Defer commits for the block on one pinned connection, as with DatabaseManager.batch().
+
+        Args:
+            commit_every (int): Commit after this many statements.
+            commit_interval_ms (float): Commit once this many milliseconds have passed since the last commit.
+
+        Yields:
+            AsyncDatabaseManager: The manager itself.
+        """
+        async with self._context_block(lambda manager: manager.batch(commit_every, commit_interval_ms)):
+            yield self
+
+    async def set_group_commit(self, commit_every=None, commit_interval_ms=None):
+        """
+        Enable or disable group commit on every connection, as with DatabaseManager.set_group_commit().
+
+        Connections opened later use the same setting. Disabling it commits the statements pending on the
+        connection pinned to the current task, or on every idle connection.
+
+        Args:
+            commit_every (int): Commit after this many statements. None with no interval disables group commit.
+            commit_interval_ms (float): Commit once this many milliseconds have passed since the last commit.
+        """
+        enabled = commit_every is not None or commit_interval_ms is not None
+        self._group_commit = (commit_every, commit_interval_ms) if enabled else None
+        for worker in list(self._workers):
+            # Statements read the setting on their connection's thread; storing it needs no hop.
+            worker.manager._group_commit = self._group_commit
+        if not enabled:
+            await self.flush()
+
+    async def flush(self):
+        """
+        Commit the statements pending in group-commit mode.
+
+        Inside checkout(), transaction() or batch() this flushes the pinned connection. Otherwise every idle
+        connection is flushed; connections pinned by other tasks are left to their own blocks.
+
+        Raises:
+            RuntimeError: If there is an error committing.
+        """
+        pinned = self._pinned.get()
+        if pinned is not None:
+            await pinned.run(pinned.manager.flush)
+            return
+        # Submitted without yielding to the event loop, so no task can check one of them out in between.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(worker.executor, worker.manager.flush) for worker in self.pool._idle])
+
+    @contextlib.asynccontextmanager
+    async def _context_block(self, factory):
+        """
+        Enter and exit a synchronous context manager of the pinned worker's manager on its thread.
+
+        Args:
+            factory (callable): Called with the DatabaseManager to create the context manager.
+        """
+        async with self.checkout():
+            worker = self._pinned.get()
+            block = await worker.run(factory, worker.manager)
+            await worker.run(block.__enter__)
+            try:
+                yield
+            except BaseException as e:
+                await worker.run(block.__exit__, type(e), e, e.__traceback__)
+                raise
+            else:
+                await worker.run(block.__exit__, None, None, None)
+
+    async def iter_query(self, query, *args, chunk_size=1000):
+        """
+        Execute a query and asynchronously yield its rows, fetched chunk_size at a time.
+
+        The connection stays checked out until the iteration finishes or the generator is closed.
+
+        Args:
+            query (str): The SQL query to be executed.
+            *args: Parameters to be passed to the query.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            tuple: One fetched row.
+
+        Raises:
+            RuntimeError: If there is an error fetching data.
+        """
+        async for row in self._iterate(lambda manager: manager.iter_query(query, *args, chunk_size=chunk_size), chunk_size):
+            yield row
+
+    async def iter_table(self, table_name, columns=None, chunk_size=1000):
+        """
+        Asynchronously yield all rows of a table, fetched chunk_size at a time.
+
+        Args:
+            table_name (str): Name of the table (or MongoDB collection) to read.
+            columns (list): Columns to select. All columns when None.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            tuple: One fetched row (a dict per document on MongoDB).
+
+        Raises:
+            RuntimeError: If there is an error fetching data.
+        """
+        async for row in self._iterate(lambda manager: manager.iter_table(table_name, columns, chunk_size), chunk_size):
+            yield row
+
+    async def iter_base64(self, table_name, columns=None, chunk_size=1000):
+        """
+        Asynchronously yield the decoded base64 data of every row of a table, fetched chunk_size rows at a time.
+
+        Args:
+            table_name (str): Name of the table to read data from.
+            columns (list): Columns to read and decode. All columns when None.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            dict: Column name -> decoded bytes (None for NULL) for one row.
+
+        Raises:
+            RuntimeError: If there is an error selecting or decoding the data.
+        """
+        async for row in self._iterate(lambda manager: manager.iter_base64(table_name, columns, chunk_size), chunk_size):
+            yield row
+
+    async def _iterate(self, factory, chunk_size):
+        """
+        Drive a synchronous row iterator on the worker's thread, one chunk per hop.
+
+        Args:
+            factory (callable): Called with the DatabaseManager to create the row iterator.
+            chunk_size (int): Number of rows moved to the event loop per hop.
+        """
+        async with self.checkout():
+            worker = self._pinned.get()
+            rows = await worker.run(factory, worker.manager)
+            try:
+                while True:
+                    chunk = await worker.run(lambda: list(itertools.islice(rows, chunk_size)))
+                    if not chunk:
+                        break
+                    for row in chunk:
+                        yield row
+            finally:
+                await worker.run(rows.close)
+
+    def invalidate(self, table_name=None):
+        """
+        Drop cached results of a table, e.g. after it was changed by another process.
+
+        Args:
+            table_name (str): Name of the table. None drops every cached result.
+        """
+        if self.result_cache is not None:
+            self.result_cache.invalidate(None if table_name is None else (_table_key(table_name),))
+
+    def result_cache_info(self):
+        """
+        Get result cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit rate, entries, bytes, limits and eviction counters, or None when the cache is disabled.
+        """
+        return self.result_cache.info() if self.result_cache is not None else None
+
+    def pool_stats(self):
+        """
+        Get connection pool metrics.
+
+        Returns:
+            dict: Pool size, utilization and wait-time metrics.
+        """
+        return self.pool.stats()
+
+    async def close(self):
+        """
+        Close all connections and stop their threads.
+        """
+        await self.pool.close()
+
+def _mirror(name):
+    """
+    Build the coroutine version of a DatabaseManager method.
+
+    Args:
+        name (str): Name of the DatabaseManager method.
+
+    Returns:
+        function: A coroutine function running the method on a pooled connection's thread.
+    """
+    async def method(self, *args, **kwargs):
+        return await self._call(name, *args, **kwargs)
+    method.__name__ = name
+    method.__qualname__ = f'AsyncDatabaseManager.{name}'
+    method.__doc__ = getattr(DatabaseManager, name).__doc__
+    return method
+
+for _name in _MIRRORED_METHODS:
+    setattr(AsyncDatabaseManager, _name, _mirror(_name))
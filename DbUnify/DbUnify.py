@@ -1,591 +1,4735 @@
-import sqlite3 , pymysql , psycopg2 , pymongo , pyodbc , csv , json , matplotlib.pyplot as plt , xml.etree.ElementTree as ET , os , base64 , seaborn as sns 
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+import copy , csv , json , os , io , shutil , tempfile , gzip , base64 , decimal , datetime , numbers , importlib , functools , itertools , types , threading , collections , contextlib , time , re , sys , math , xml.etree.ElementTree as ET
+
+# Backend drivers are imported on demand so that a plain SQLite user does not
+# pay for (or need) pymysql, psycopg2, pymongo and pyodbc.
+_DRIVER_MODULES = {
+    'sqlite': 'sqlite3',
+    'mysql': 'pymysql',
+    'postgresql': 'psycopg2',
+    'mongodb': 'pymongo',
+    'sqlserver': 'pyodbc',
+}
+
+# Maximum number of bound parameters per statement. SQLite's limit is read from the connection when possible.
+_MAX_PARAMETERS = {
+    'sqlite': 999,
+    'mysql': 65535,
+    'postgresql': 65535,
+    'sqlserver': 2100,
+}
+
+# Parameter placeholder used by each backend's DB-API driver.
+_PLACEHOLDERS = {
+    'sqlite': '?',
+    'mysql': '%s',
+    'postgresql': '%s',
+    'sqlserver': '?',
+}
+
+# SQLite PRAGMAs that can be set at connect time, in the order they are applied.
+_SQLITE_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout',
+                   'wal_autocheckpoint')
+
+# SQLite connection profiles. Explicit PRAGMA keyword arguments override them.
+_SQLITE_PROFILES = {
+    # WAL lets readers run alongside a writer; a 64 MiB page cache and 256 MiB of mmap serve reads from memory.
+    'read_heavy': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -65536, 'mmap_size': 268435456,
+                   'temp_store': 'MEMORY', 'busy_timeout': 5000},
+    # NORMAL in WAL mode syncs only at checkpoints; committed transactions can be lost on power failure, the
+    # database cannot be corrupted. Larger checkpoints amortize the syncs.
+    'write_heavy': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -65536, 'temp_store': 'MEMORY',
+                    'busy_timeout': 5000, 'wal_autocheckpoint': 10000},
+    # Every commit is synced; WAL still keeps readers from blocking behind the writer.
+    'durable': {'journal_mode': 'WAL', 'synchronous': 'FULL', 'busy_timeout': 5000},
+}
+
+def _load_driver(db_type):
+    """
+    Import and return the driver module for a database type.
+
+    Args:
+        db_type (str): The type of the database ('sqlite', 'mysql', 'postgresql', 'mongodb', 'sqlserver').
+
+    Returns:
+        module: The imported driver module.
+
+    Raises:
+        ValueError: If the database type is not supported.
+        ImportError: If the driver for the database type is not installed.
+    """
+    module_name = _DRIVER_MODULES.get(db_type)
+    if module_name is None:
+        raise ValueError(f"Unsupported database type: {db_type}")
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(f"The '{module_name}' package is required for db_type '{db_type}': {str(e)}")
+
+@functools.lru_cache(maxsize=None)
+def _figure_class():
+    """
+    Import matplotlib's object-oriented Figure on the first chart call.
+
+    Charts are drawn on standalone Figure objects with the Agg canvas instead of pyplot's global
+    state, which keeps rendering safe in threads and worker processes.
+
+    Returns:
+        type: The matplotlib.figure.Figure class.
+    """
+    from matplotlib.figure import Figure
+    return Figure
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """
+    Import numpy on the first columnar fetch.
+
+    Returns:
+        module: The numpy module.
+
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(f"The 'numpy' package is required for columnar results: {str(e)}")
+    return numpy
+
+@functools.lru_cache(maxsize=None)
+def _reportlab():
+    """
+    Import the reportlab pieces used by export_to_pdf on the first export.
+
+    Returns:
+        SimpleNamespace: The reportlab names used for PDF export.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle
+    from reportlab.lib import colors
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    return types.SimpleNamespace(letter=letter, SimpleDocTemplate=SimpleDocTemplate, Table=Table, LongTable=LongTable,
+                                 TableStyle=TableStyle, colors=colors, pdfmetrics=pdfmetrics, TTFont=TTFont)
+
+@functools.lru_cache(maxsize=None)
+def _pdf_fonts(font_name):
+    """
+    Resolve the body and header fonts of a PDF export, registering a TrueType font once per process.
+
+    Args:
+        font_name (str): None for Helvetica, a standard PDF font name, or the path of a .ttf file.
+
+    Returns:
+        tuple: (body font name, header font name).
+    """
+    if font_name is None:
+        return 'Helvetica', 'Helvetica-Bold'
+    rl = _reportlab()
+    if font_name in rl.pdfmetrics.standardFonts:
+        return font_name, font_name
+    registered = os.path.splitext(os.path.basename(font_name))[0]
+    rl.pdfmetrics.registerFont(rl.TTFont(registered, font_name))
+    return registered, registered
+
+class _FlowableFeed(list):
+    """
+    List of flowables that refills itself from a generator as reportlab consumes it.
+
+    DocTemplate.build() loops on len(flowables) and pops from the front, so only a couple of
+    page-sized tables exist at any time instead of one flowable per page for the whole document.
+    """
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+
+    def __len__(self):
+        if list.__len__(self) < 2:
+            self.extend(itertools.islice(self._source, 2))
+        return list.__len__(self)
+
+# JSON codecs tried by json_codec='auto', fastest first.
+_JSON_CODECS = ['orjson', 'ujson', 'json']
+
+@functools.lru_cache(maxsize=None)
+def _json_codec(name):
+    """
+    Import a JSON codec by name and wrap it as dumps (returning str) and loads.
+
+    Args:
+        name (str): 'json', 'orjson', 'ujson' or 'auto' for the fastest one installed.
+
+    Returns:
+        SimpleNamespace: name, dumps and loads of the codec.
+
+    Raises:
+        ValueError: If the codec is unknown.
+        ImportError: If the codec is not installed.
+    """
+    if name == 'auto':
+        for candidate in _JSON_CODECS:
+            try:
+                return _json_codec(candidate)
+            except ImportError:
+                continue
+    if name not in _JSON_CODECS:
+        raise ValueError(f"Unsupported JSON codec: {name}")
+    try:
+        module = importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(f"The '{name}' package is required for json_codec='{name}': {str(e)}")
+    if name == 'orjson':
+        # orjson encodes to bytes; the JSON columns are bound as text.
+        return types.SimpleNamespace(name=name, dumps=lambda obj: module.dumps(obj).decode(), loads=module.loads)
+    return types.SimpleNamespace(name=name, dumps=module.dumps, loads=module.loads)
+
+# A tag name at the start of an XPath step, e.g. 'author' in 'author/name' or 'item' in 'item[1]'.
+_XML_PATH_STEP = re.compile(r"(^|/)([A-Za-z_][\w.-]*)(?=\[|/|$)")
+
+def _xml_extractor(xpath, sql_type):
+    """
+    Build a function reading one value out of a record element.
+
+    Like the record tag, tag names without a '{namespace}' match any namespace: when the xpath names
+    no namespace, each step is rewritten to '{*}name'.
+
+    Args:
+        xpath (str): ElementTree XPath relative to the record; a trailing '@name' selects an attribute.
+        sql_type (str): Column type; INT-like types convert to int, REAL/FLOAT/DOUBLE/NUMERIC/DECIMAL to float.
+
+    Returns:
+        callable: Called with the record element; returns the value or None when it is missing or empty.
+    """
+    path, _, attribute = xpath.rpartition('@') if xpath.rsplit('/', 1)[-1].startswith('@') else (xpath, None, None)
+    path = path.rstrip('/') or '.'
+    if '{' not in path:
+        path = _XML_PATH_STEP.sub(r"\1{*}\2", path)
+    kind = sql_type.upper()
+    if 'INT' in kind:
+        convert = int
+    elif any(name in kind for name in ('REAL', 'FLOAT', 'DOUBLE', 'NUMERIC', 'DECIMAL')):
+        convert = float
+    else:
+        convert = str
+
+    def extract(element):
+        if attribute:
+            target = element.find(path)
+            text = target.get(attribute) if target is not None else None
+        else:
+            text = element.findtext(path)
+        if text is None:
+            return None
+        text = text.strip()
+        return convert(text) if text else None
+
+    return extract
+
+def _iter_xml_records(f, record_tag, extractors):
+    """
+    Stream the record elements of an XML file as table rows, keeping memory bounded.
+
+    Args:
+        f (file): Binary file object of the XML document.
+        record_tag (str): Tag of the record elements; without '{namespace}' it matches any namespace.
+        extractors (list): Functions returning the extracted column values of a record.
+
+    Yields:
+        tuple: (record XML text, *extracted values).
+    """
+    namespaced_tag = None if record_tag.startswith('{') else '}' + record_tag
+    ancestors = []
+    # Namespaces declared as the default (xmlns="..."), and whether one is undone by xmlns="" somewhere.
+    defaults, reset = [], False
+    for event, element in ET.iterparse(f, events=('start-ns', 'start', 'end')):
+        if event == 'start-ns':
+            # Register the document's prefixes so stored records keep them instead of ns0, ns1, ...
+            prefix, uri = element
+            if prefix == '' and uri == '':
+                # Unqualified elements below a default namespace cannot be written with that default;
+                # give the default namespaces prefixes of their own from here on.
+                reset = True
+                for position, default in enumerate(defaults):
+                    ET.register_namespace(f"default{position}", default)
+            elif uri and not (prefix == '' and reset):
+                if prefix == '':
+                    defaults.append(uri)
+                try:
+                    ET.register_namespace(prefix, uri)
+                except ValueError:
+                    # Prefixes such as ns0 are reserved by ElementTree.
+                    pass
+            continue
+        if event == 'start':
+            ancestors.append(element)
+            continue
+        ancestors.pop()
+        tag = element.tag
+        if tag != record_tag and (namespaced_tag is None or not isinstance(tag, str) or not tag.endswith(namespaced_tag)):
+            continue
+        element.tail = None
+        yield (ET.tostring(element, encoding='unicode'),) + tuple(extract(element) for extract in extractors)
+        # Detach the stored record so neither it nor its parent keeps growing.
+        if ancestors:
+            ancestors[-1].remove(element)
+        element.clear()
+
+# File suffix used for each supported compression.
+_COMPRESSION_SUFFIXES = {
+    None: '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+def _open_binary(path, mode, compression=None):
+    """
+    Open a binary file, optionally compressed.
+
+    Args:
+        path (str): Path of the file.
+        mode (str): 'r' or 'w'.
+        compression (str): None, 'gzip' or 'zstd'.
+
+    Returns:
+        file: A binary file object.
+
+    Raises:
+        ValueError: If the compression is not supported.
+        ImportError: If zstd is requested and the zstandard package is not installed.
+    """
+    if compression is None:
+        return open(path, mode + 'b')
+    elif compression == 'gzip':
+        return gzip.open(path, mode + 'b')
+    elif compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(f"The 'zstandard' package is required for zstd compression: {str(e)}")
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+def _open_text(path, mode, compression=None):
+    """
+    Open a text file for CSV reading or writing, optionally compressed.
+
+    Args:
+        path (str): Path of the file.
+        mode (str): 'r' or 'w'.
+        compression (str): None, 'gzip' or 'zstd'.
+
+    Returns:
+        file: A text-mode file object.
+    """
+    if compression is None:
+        return open(path, mode, newline='', encoding='utf-8')
+    return io.TextIOWrapper(_open_binary(path, mode, compression), newline='', encoding='utf-8')
+
+# Column types chosen by CSV type inference: (integer, floating point, text) per backend.
+_CSV_TYPES = {
+    'sqlite': ('INTEGER', 'REAL', 'TEXT'),
+    'mysql': ('BIGINT', 'DOUBLE', 'TEXT'),
+    'postgresql': ('BIGINT', 'DOUBLE PRECISION', 'TEXT'),
+    'sqlserver': ('BIGINT', 'FLOAT', 'NVARCHAR(MAX)'),
+}
+
+# Numbers without leading zeros, so codes like '007' stay text.
+_CSV_INTEGER = re.compile(r"^[+-]?(?:0|[1-9][0-9]*)$")
+_CSV_FLOAT = re.compile(r"^[+-]?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?$")
+
+def _infer_csv_type(values, db_type):
+    """
+    Pick the narrowest column type that fits every non-empty sample value.
+
+    Args:
+        values (iterable): Sampled CSV fields of one column.
+        db_type (str): The backend the type is for.
+
+    Returns:
+        str: The SQL type.
+    """
+    integer, floating, text = _CSV_TYPES.get(db_type, _CSV_TYPES['sqlite'])
+    inferred = None
+    for value in values:
+        if value is None or value == '':
+            continue
+        if inferred in (None, integer) and _CSV_INTEGER.match(value) and -2 ** 63 <= int(value) < 2 ** 63:
+            inferred = integer
+            continue
+        if not _CSV_FLOAT.match(value):
+            return text
+        inferred = floating
+    return inferred or text
+
+def _throughput(rows, nbytes, seconds):
+    """
+    Build a throughput report.
+
+    Args:
+        rows (int): Number of rows processed.
+        nbytes (int): Number of bytes processed.
+        seconds (float): Elapsed wall time.
+
+    Returns:
+        dict: rows, bytes, seconds, rows_per_sec and bytes_per_sec.
+    """
+    return {
+        'rows': rows,
+        'bytes': nbytes,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else 0.0,
+        'bytes_per_sec': nbytes / seconds if seconds > 0 else 0.0,
+    }
+
+def _pdf_column_widths(header, rows, total_width):
+    """
+    Split the page width between columns in proportion to the longest text in a sample of rows.
+
+    Args:
+        header (list): Column names.
+        rows (list): Sample rows, usually the first page.
+        total_width (float): Available width in points.
+
+    Returns:
+        list: Column widths in points.
+    """
+    lengths = [len(str(name)) for name in header]
+    for row in rows:
+        for i, value in enumerate(row):
+            lengths[i] = max(lengths[i], len(str(value)))
+    lengths = [min(max(length, 3), 60) for length in lengths]
+    return [total_width * length / sum(lengths) for length in lengths]
+
+def _pdf_cell(value, limit):
+    """
+    Render a value as PDF table cell text, truncated to fit its column.
+    """
+    text = '' if value is None else str(value)
+    return text if len(text) <= limit else text[:max(1, limit - 3)] + '...'
+
+def _unmasked(values):
+    """
+    Drop the masked (NULL) entries of a column array.
+
+    Args:
+        values (ndarray): A plain or masked NumPy array.
+
+    Returns:
+        ndarray: The non-NULL values.
+    """
+    compressed = getattr(values, 'compressed', None)
+    return compressed() if compressed is not None else values
+
+def _as_number(value, default):
+    """
+    Convert an x value to a float for geometric downsampling.
+
+    Args:
+        value: The x value.
+        default (float): Used for values with no numeric meaning (e.g. strings), typically the row index.
+
+    Returns:
+        float: The numeric position of the value.
+    """
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return float(value)
+    timestamp = getattr(value, 'timestamp', None)
+    if timestamp is not None:
+        return timestamp()
+    return float(default)
+
+def _lttb(points, total, threshold):
+    """
+    Downsample a stream of points with Largest-Triangle-Three-Buckets.
+
+    Only two buckets are buffered at a time, so memory is bounded by the bucket size, not the stream length.
+
+    Args:
+        points (iterable): (x_number, x_value, y) tuples ordered by x.
+        total (int): Expected number of points (used to size the buckets).
+        threshold (int): Number of points to keep.
+
+    Yields:
+        tuple: The selected points, in order.
+    """
+    points = iter(points)
+    if threshold < 3 or total <= threshold:
+        yield from points
+        return
+    first = next(points, None)
+    if first is None:
+        return
+    yield first
+    every = (total - 2) / (threshold - 2)
+    state = {'selected': first}
+
+    def pick(bucket, following):
+        a = state['selected']
+        cx = sum(p[0] for p in following) / len(following)
+        cy = sum(p[2] for p in following) / len(following)
+        best = max(bucket, key=lambda p: abs((a[0] - cx) * (p[2] - a[2]) - (a[0] - p[0]) * (cy - a[2])))
+        state['selected'] = best
+        return best
+
+    pending = []
+    for index, point in enumerate(points, start=1):
+        bucket_id = min(int((index - 1) / every), threshold - 3)
+        if pending and pending[-1][0] == bucket_id:
+            pending[-1][1].append(point)
+            continue
+        if len(pending) == 2:
+            yield pick(pending[0][1], pending[1][1])
+            pending.pop(0)
+        pending.append((bucket_id, [point]))
+
+    if not pending:
+        return
+    last = pending[-1][1].pop()
+    if not pending[-1][1]:
+        pending.pop()
+    for position, (_, bucket) in enumerate(pending):
+        following = pending[position + 1][1] if position + 1 < len(pending) else [last]
+        yield pick(bucket, following)
+    yield last
+
+# Inferred column dtypes, from narrowest to widest; a column is promoted when a wider value shows up.
+_DTYPE_ORDER = ['bool', 'int64', 'float64', 'object']
+
+class _ColumnBuffer:
+    """
+    Growable NumPy buffer for one result column, with a null mask allocated on the first NULL.
+    """
+
+    def __init__(self, np, dtype=None):
+        """
+        Initialize the _ColumnBuffer instance.
+
+        Args:
+            np (module): The numpy module.
+            dtype: Fixed dtype for the column. Inferred from the values when None.
+        """
+        self.np = np
+        self.fixed = dtype is not None
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        self.data = None
+        self.mask = None
+        self.size = 0
+
+    def _chunk_dtype(self, values):
+        """
+        Get the dtype needed to hold the buffer's current values plus a new chunk.
+
+        Args:
+            values (tuple): The chunk's values for this column.
+
+        Returns:
+            dtype: The (possibly promoted) dtype.
+        """
+        if self.fixed:
+            return self.dtype
+        kinds = {type(value) for value in values}
+        kinds.discard(type(None))
+        if not kinds:
+            return self.dtype if self.dtype is not None else self.np.dtype('bool')
+        if kinds <= {bool}:
+            name = 'bool'
+        elif kinds <= {bool, int}:
+            name = 'int64'
+        elif kinds <= {bool, int, float, decimal.Decimal}:
+            name = 'float64'
+        else:
+            name = 'object'
+        if self.dtype is not None:
+            name = max(name, self.dtype.name, key=_DTYPE_ORDER.index)
+        return self.np.dtype(name)
+
+    def _set_dtype(self, dtype):
+        self.dtype = dtype
+        if self.data is not None and self.data.dtype != dtype:
+            self.data = self.data.astype(dtype)
+
+    def extend(self, values):
+        """
+        Append one chunk of values, growing the buffer geometrically when it is full.
+
+        Args:
+            values (tuple): The chunk's values for this column.
+        """
+        np = self.np
+        self._set_dtype(self._chunk_dtype(values))
+        end = self.size + len(values)
+        if self.data is None:
+            self.data = np.empty(max(end, 1024), dtype=self.dtype)
+        elif end > len(self.data):
+            self.data.resize(max(end, 2 * len(self.data)), refcheck=False)
+
+        nulls = [i for i, value in enumerate(values) if value is None]
+        if nulls:
+            fill = None if self.dtype.kind == 'O' else 0
+            values = [fill if value is None else value for value in values]
+            if self.mask is None:
+                self.mask = np.zeros(len(self.data), dtype=bool)
+        if self.mask is not None and len(self.mask) < len(self.data):
+            self.mask.resize(len(self.data), refcheck=False)
+
+        try:
+            self.data[self.size:end] = values
+        except (OverflowError, ValueError, TypeError):
+            if self.fixed:
+                raise
+            self._set_dtype(np.dtype(object))
+            self.data[self.size:end] = values
+        if nulls:
+            self.mask[[self.size + i for i in nulls]] = True
+        self.size = end
+
+    def finish(self):
+        """
+        Trim the buffer to its size.
+
+        Returns:
+            ndarray: The column values, as a masked array when the column contains NULLs.
+        """
+        np = self.np
+        if self.data is None:
+            return np.empty(0, dtype=self.dtype or object)
+        self.data.resize(self.size, refcheck=False)
+        if self.mask is not None:
+            self.mask.resize(self.size, refcheck=False)
+            if self.mask.any():
+                return np.ma.MaskedArray(self.data, mask=self.mask)
+        return self.data
+
+# One segment of a JSON path: an identifier key or an array index.
+_JSON_PATH_SEGMENT = re.compile(r"\.?([A-Za-z_][A-Za-z0-9_]*)|\[(\d+)\]")
+
+# Comparison operators accepted by find_json.
+_JSON_OPERATORS = {'=': '=', '==': '=', '!=': '!=', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=', 'exists': 'exists'}
+# find_json operators as MongoDB query operators.
+_MONGO_OPERATORS = {'=': '$eq', '!=': '$ne', '<': '$lt', '<=': '$lte', '>': '$gt', '>=': '$gte'}
+
+def _json_path(path):
+    """
+    Parse a JSON path such as 'address.city', 'items[0].sku' or '$.address.city'.
+
+    Keys are restricted to identifiers, so a parsed path can be spliced into SQL safely.
+
+    Args:
+        path (str): The JSON path.
+
+    Returns:
+        tuple: Path segments; array indices are strings of digits.
+
+    Raises:
+        ValueError: If the path is empty or malformed.
+    """
+    text = path[1:] if path.startswith('$') else path
+    segments, position = [], 0
+    while position < len(text):
+        match = _JSON_PATH_SEGMENT.match(text, position)
+        if match is None or (match.group(1) and position and text[position] != '.'):
+            raise ValueError(f"Invalid JSON path: {path!r}")
+        segments.append(match.group(1) or match.group(2))
+        position = match.end()
+    if not segments:
+        raise ValueError(f"Invalid JSON path: {path!r}")
+    return tuple(segments)
+
+def _json_path_text(segments):
+    """
+    Render path segments as a SQL/JSON path string, e.g. '$.items[0].sku'.
+    """
+    return '$' + ''.join(f"[{segment}]" if segment.isdigit() else f".{segment}" for segment in segments)
+
+# One paginate() sort key: a (dotted) column name and an optional direction.
+_ORDER_KEY = re.compile(r"^\s*([A-Za-z_][\w.]*)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+
+def _order_keys(order_by):
+    """
+    Parse paginate() sort keys.
+
+    Args:
+        order_by (str or list): 'column', 'column DESC', or a list of them.
+
+    Returns:
+        list: (column, descending) tuples.
+
+    Raises:
+        ValueError: If a key is not a plain column name with an optional ASC/DESC.
+    """
+    keys = []
+    for key in ([order_by] if isinstance(order_by, str) else order_by):
+        match = _ORDER_KEY.match(key)
+        if match is None:
+            raise ValueError(f"Invalid order_by key: {key!r}")
+        keys.append((match.group(1), (match.group(2) or '').upper() == 'DESC'))
+    if not keys:
+        raise ValueError("order_by must name at least one column")
+    return keys
+
+def _encode_page_value(value):
+    """
+    Make a key value JSON-serializable for a page token, keeping its type.
+    """
+    if isinstance(value, datetime.datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {'$decimal': str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$bytes': base64.b64encode(bytes(value)).decode()}
+    if type(value).__name__ == 'ObjectId':
+        return {'$oid': str(value)}
+    return value
+
+def _decode_page_value(value):
+    """
+    Reverse _encode_page_value.
+    """
+    if not isinstance(value, dict):
+        return value
+    (tag, text), = value.items()
+    if tag == '$datetime':
+        return datetime.datetime.fromisoformat(text)
+    if tag == '$date':
+        return datetime.date.fromisoformat(text)
+    if tag == '$decimal':
+        return decimal.Decimal(text)
+    if tag == '$bytes':
+        return base64.b64decode(text)
+    if tag == '$oid':
+        from bson import ObjectId
+        return ObjectId(text)
+    raise ValueError(f"Unknown value tag {tag!r}")
+
+def _page_token(table_name, keys, values):
+    """
+    Build the opaque continuation token of a page: the table, the sort keys and the last row's key values.
+    """
+    state = {'t': table_name, 'o': [[column, descending] for column, descending in keys],
+             'k': [_encode_page_value(value) for value in values]}
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def _page_after(token, table_name, keys):
+    """
+    Decode a continuation token made by _page_token for the same table and sort keys.
+
+    Returns:
+        list: The key values to continue after.
+
+    Raises:
+        ValueError: If the token is malformed or belongs to another table or ordering.
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        values = [_decode_page_value(value) for value in state['k']]
+        matches = state['t'] == table_name and [tuple(key) for key in state['o']] == keys and len(values) == len(keys)
+    except Exception as e:
+        raise ValueError(f"Invalid page token: {str(e)}")
+    if not matches:
+        raise ValueError("The page token was made for another table or ordering")
+    return values
+
+class SQLCompiler:
+    """
+    Build the SQL text for DatabaseManager's generated statements and memoize it.
+
+    Statements are kept in a bounded LRU keyed by (operation, table, column tuple, condition), so hot
+    write loops skip string building and the driver sees identical SQL text for identical shapes.
+    Free-form WHERE conditions are not part of the key: an UPDATE caches its SET prefix only.
+    Placeholders are emitted in the style of the backend's driver ('?' or '%s').
+    """
+
+    def __init__(self, db_type, max_size=256):
+        """
+        Initialize the SQLCompiler instance.
+
+        Args:
+            db_type (str): The type of the database the statements are generated for.
+            max_size (int): Maximum number of statements kept in the cache. 0 disables caching.
+        """
+        self.db_type = db_type
+        self.placeholder = _PLACEHOLDERS.get(db_type, '?')
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, operation, table_name, columns=(), condition=None):
+        """
+        Return the SQL text for a generated statement, building it on a cache miss.
+
+        Args:
+            operation (str): The statement kind ('insert', 'insert_values', 'update', 'select_by_id', 'select_by_ids',
+                'find_json').
+            table_name (str): Name of the table the statement targets.
+            columns (iterable): Column names used by the statement.
+            condition (str): WHERE condition for statements that take one; the operator for 'find_json' and the
+                number of ids for 'select_by_ids'.
+
+        Returns:
+            str: The SQL text with backend-specific placeholders.
+        """
+        if operation == 'update':
+            # The condition is caller text that may differ on every call; keep it out of the cache.
+            return self.compile('update_prefix', table_name, columns) + condition
+        key = (operation, table_name, tuple(columns), condition)
+        with self._lock:
+            query = self._cache.get(key)
+            if query is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return query
+            self.misses += 1
+        query = self._build(operation, table_name, key[2], condition)
+        if self.max_size > 0:
+            with self._lock:
+                self._cache[key] = query
+                if len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return query
+
+    def _build(self, operation, table_name, columns, condition):
+        """
+        Build the SQL text for a statement.
+
+        Args:
+            operation (str): The statement kind.
+            table_name (str): Name of the table the statement targets.
+            columns (tuple): Column names used by the statement.
+            condition (str): WHERE condition for statements that take one.
+
+        Returns:
+            str: The SQL text.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        if operation == 'find_json':
+            return self._build_find_json(table_name, columns, condition)
+        column_list = ', '.join(columns)
+        if operation == 'insert':
+            placeholders = ', '.join([self.placeholder for _ in columns])
+            return f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+        elif operation == 'insert_values':
+            # psycopg2.extras.execute_values expands the single %s into the VALUES list.
+            return f"INSERT INTO {table_name} ({column_list}) VALUES %s"
+        elif operation == 'update_prefix':
+            set_clause = ', '.join([f"{col} = {self.placeholder}" for col in columns])
+            return f"UPDATE {table_name} SET {set_clause} WHERE "
+        elif operation == 'select_by_id':
+            return f"SELECT {column_list} FROM {table_name} WHERE id = {self.placeholder}"
+        elif operation == 'select_by_ids':
+            placeholders = ', '.join([self.placeholder] * int(condition))
+            return f"SELECT id, {column_list} FROM {table_name} WHERE id IN ({placeholders})"
+        raise ValueError(f"Unknown SQL operation: {operation}")
+
+    def json_document(self):
+        """
+        Get the select expression returning the json_data column as text.
+
+        Returns:
+            str: The expression; JSONB is cast to text on PostgreSQL so it decodes like the other backends.
+        """
+        return "json_data::text" if self.db_type == 'postgresql' else "json_data"
+
+    def json_expression(self, segments):
+        """
+        Build the expression extracting a JSON path from the json_data column.
+
+        The same text is used by find_json and create_json_index, so queries match the index expression.
+
+        Args:
+            segments (tuple): Path segments returned by _json_path.
+
+        Returns:
+            str: json_extract on SQLite, the JSONB #> operator on PostgreSQL and ->> on MySQL.
+        """
+        if self.db_type == 'postgresql':
+            return f"(json_data #> '{{{','.join(segments)}}}')"
+        if self.db_type == 'mysql':
+            return f"(json_data->>'{_json_path_text(segments)}')"
+        return f"json_extract(json_data, '{_json_path_text(segments)}')"
+
+    def _build_find_json(self, table_name, segments, operator):
+        """
+        Build the SELECT statement of find_json.
+
+        Args:
+            table_name (str): Name of the JSON table.
+            segments (tuple): Path segments returned by _json_path.
+            operator (str): A normalized operator from _JSON_OPERATORS.
+
+        Returns:
+            str: The SQL text.
+        """
+        select = f"SELECT id, {self.json_document()} FROM {table_name} WHERE "
+        expression = self.json_expression(segments)
+        if operator == 'exists':
+            if self.db_type == 'sqlite':
+                return select + f"json_type(json_data, '{_json_path_text(segments)}') IS NOT NULL ORDER BY id"
+            if self.db_type == 'mysql':
+                return select + f"JSON_CONTAINS_PATH(json_data, 'one', '{_json_path_text(segments)}') ORDER BY id"
+            return select + f"{expression} IS NOT NULL ORDER BY id"
+        if self.db_type == 'postgresql':
+            comparison = f"{expression} {operator} {self.placeholder}::jsonb"
+            if operator == '=' and not any(segment.isdigit() for segment in segments):
+                # Containment lets a GIN index on the whole document serve equality lookups.
+                comparison = f"json_data @> {self.placeholder}::jsonb AND {comparison}"
+            return select + comparison + " ORDER BY id"
+        return select + f"{expression} {operator} {self.placeholder} ORDER BY id"
+
+    def cache_info(self):
+        """
+        Get statement cache statistics.
+
+        Returns:
+            dict: Hits, misses, current size and maximum size of the cache.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'max_size': self.max_size}
+
+    def clear(self):
+        """
+        Empty the statement cache and reset its counters.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Statements that write to a table, and where the table name sits in them.
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|MERGE\s+INTO|TRUNCATE(?:\s+TABLE)?"
+    r"|(?:ALTER|DROP|CREATE)\s+TABLE(?:\s+IF\s+(?:NOT\s+)?EXISTS)?)\s+([^\s(]+)",
+    re.IGNORECASE)
+
+# Leading keywords of statements that never change table contents.
+_READ_ONLY_STATEMENT = re.compile(r"^\s*(?:(?:SELECT|EXPLAIN|SHOW|DESCRIBE|CREATE\s+(?:UNIQUE\s+)?INDEX|DROP\s+INDEX)\b|PRAGMA\s+\w+\s*(?:\(|;|$))", re.IGNORECASE)
+
+def _table_key(table_name):
+    """
+    Normalize a table name for result-cache bookkeeping: unquoted, lower case, without schema.
+
+    Args:
+        table_name (str): The table name as written by the caller or in SQL.
+
+    Returns:
+        str: The normalized name.
+    """
+    return str(table_name).split('.')[-1].strip('`"[]').lower()
+
+def _filter_key(condition):
+    """
+    Turn a MongoDB filter into a hashable result-cache key.
+
+    Args:
+        condition (dict): The filter document.
+
+    Returns:
+        str: The filter as canonical JSON.
+    """
+    return json.dumps(condition, sort_keys=True, default=repr)
+
+def _written_tables(query):
+    """
+    Work out which tables a statement passed to execute_query writes to.
+
+    Args:
+        query (str): The SQL statement.
+
+    Returns:
+        tuple: Normalized table names, () for read-only statements, or None when the statement is not
+        understood and every table must be assumed changed.
+    """
+    match = _WRITE_TARGET.match(query)
+    if match:
+        return (_table_key(match.group(1)),)
+    if _READ_ONLY_STATEMENT.match(query):
+        return ()
+    return None
+
+def _approximate_size(value):
+    """
+    Estimate the memory held by a query result.
+
+    Args:
+        value: A result made of lists, tuples, dicts and scalars.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_approximate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_approximate_size(k) + _approximate_size(v) for k, v in value.items())
+    return size
+
+class ResultCache:
+    """
+    Thread-safe read-through cache of query results, invalidated per table.
+
+    Entries are evicted least-recently-used first once either the entry or the byte limit is reached,
+    and expire after ttl seconds. Every table has a version counter: a result is only stored if none
+    of its tables was written while it was being fetched, so a slow read never re-caches stale rows.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None):
+        """
+        Initialize the ResultCache instance.
+
+        Args:
+            max_entries (int): Maximum number of cached results. None for no entry limit.
+            max_bytes (int): Maximum approximate size of all cached results. None for no byte limit.
+            ttl (float): Seconds a result stays valid. None to keep it until it is invalidated or evicted.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.bytes = 0
+        # key -> (value, tables, size, expires_at)
+        self._entries = collections.OrderedDict()
+        self._by_table = collections.defaultdict(set)
+        self._versions = collections.defaultdict(int)
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a cached result.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] is not None and entry[3] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def version(self, tables):
+        """
+        Snapshot the versions of some tables before fetching a result for them.
+
+        Args:
+            tables (tuple): Normalized table names the result depends on.
+
+        Returns:
+            tuple: An opaque token to pass to put().
+        """
+        with self._lock:
+            return (self._epoch,) + tuple(self._versions[table] for table in tables)
+
+    def put(self, key, tables, value, token):
+        """
+        Store a fetched result unless one of its tables changed since version() was called.
+
+        Args:
+            key (tuple): The cache key.
+            tables (tuple): Normalized table names the result depends on.
+            value: The result to cache.
+            token (tuple): The token returned by version() before the fetch.
+        """
+        size = _approximate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if token != (self._epoch,) + tuple(self._versions[table] for table in tables):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, tables, size, expires_at)
+            self.bytes += size
+            for table in tables:
+                self._by_table[table].add(key)
+            while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                                     (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tables=None):
+        """
+        Drop the cached results that depend on some tables.
+
+        Args:
+            tables (iterable): Normalized table names. None drops every result.
+        """
+        with self._lock:
+            if tables is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._by_table.clear()
+                self.bytes = 0
+                self._epoch += 1
+                return
+            for table in tables:
+                self._versions[table] += 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def _remove(self, key):
+        """
+        Remove one entry. Called with the lock held.
+        """
+        value, tables, size, _ = self._entries.pop(key)
+        self.bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def info(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit rate, size in entries and bytes, limits, and eviction counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+    def clear(self):
+        """
+        Empty the cache and reset its counters.
+        """
+        self.invalidate()
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+# Rewrites that turn a statement into its fingerprint: literals and placeholders become '?', IN lists collapse.
+_FINGERPRINT_RULES = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b"), '?'),
+    (re.compile(r"%s|:\w+|\$\d+"), '?'),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), '(?, ...)'),
+    (re.compile(r"\s+"), ' '),
+]
+
+@functools.lru_cache(maxsize=4096)
+def _fingerprint(query):
+    """
+    Reduce a SQL statement to its shape, so that executions differing only in literals share statistics.
+
+    Args:
+        query (str): The SQL statement.
+
+    Returns:
+        str: The statement with literals replaced by '?' and whitespace collapsed.
+    """
+    for pattern, replacement in _FINGERPRINT_RULES:
+        query = pattern.sub(replacement, query)
+    return query.strip()
+
+# Latency histogram buckets grow by 10% from 1 microsecond, so percentiles are within 10%.
+_HISTOGRAM_BASE = 1e-6
+_HISTOGRAM_GROWTH = math.log(1.1)
+
+class _LatencyHistogram:
+    """
+    Log-scale latency histogram of one statement fingerprint.
+    """
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration, error):
+        bucket = max(0, math.ceil(math.log(max(duration, _HISTOGRAM_BASE) / _HISTOGRAM_BASE) / _HISTOGRAM_GROWTH))
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        if error:
+            self.errors += 1
+
+    def percentile(self, fraction):
+        """
+        Estimate a latency percentile.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            float: The upper bound of the bucket holding the percentile, in seconds.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(_HISTOGRAM_BASE * math.exp(bucket * _HISTOGRAM_GROWTH), self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'p50_seconds': self.percentile(0.50),
+            'p95_seconds': self.percentile(0.95),
+            'p99_seconds': self.percentile(0.99),
+            'max_seconds': self.max,
+        }
+
+# Single-table SELECT / UPDATE / DELETE: the table and the WHERE condition, without trailing ORDER BY / LIMIT.
+_CONDITION_STATEMENT = re.compile(
+    r"^\s*(?:SELECT\s.+?\sFROM|DELETE\s+FROM|UPDATE)\s+([\w.`\"\[\]]+)\s+(?:SET\s.+?\s)?WHERE\s+(.+?)"
+    r"(?:\s+(?:ORDER\s+BY|GROUP\s+BY|LIMIT|OFFSET|FETCH|FOR\s+UPDATE)\b.*)?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL)
+
+# A column compared in a condition, and the comparison.
+_CONDITION_COLUMN = re.compile(
+    r"(?<![\w.])([A-Za-z_]\w*)\s*(==|=|<=|>=|<>|!=|<|>|\bIN\b|\bIS\s+NULL\b|\bLIKE\b|\bBETWEEN\b)", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=4096)
+def _statement_condition(query):
+    """
+    Split a single-table statement into its table and WHERE condition.
+
+    Args:
+        query (str): The SQL statement.
+
+    Returns:
+        tuple: (table, condition), or None for other statements.
+    """
+    match = _CONDITION_STATEMENT.match(query)
+    if match is None:
+        return None
+    return match.group(1), match.group(2).strip()
+
+def _condition_columns(condition):
+    """
+    Get the columns an index for a condition should cover, in index order.
+
+    Columns compared for equality come first, then the first column compared by range; columns only
+    compared with != are left out.
+
+    Args:
+        condition (str): The WHERE condition.
+
+    Returns:
+        list: Column names as written in the condition.
+    """
+    condition = re.sub(r"'(?:[^']|'')*'", "''", condition)
+    equality, ranges = [], []
+    for column, operator in _CONDITION_COLUMN.findall(condition):
+        operator = operator.upper()
+        if operator in ('!=', '<>'):
+            continue
+        target = equality if operator in ('=', '==', 'IN') or operator.startswith('IS') else ranges
+        if column not in equality and column not in ranges:
+            target.append(column)
+    return equality + ranges[:1]
+
+class QueryInstrumentation:
+    """
+    Hooks, slow-query log and per-fingerprint latency histograms for the statements a manager runs.
+
+    DatabaseManager only consults it while something is enabled, so the disabled path costs one
+    attribute check per statement.
+    """
+
+    def __init__(self):
+        self.before_hooks = ()
+        self.after_hooks = ()
+        self.slow_threshold = None
+        self._logger = None
+        self.max_fingerprints = None
+        self._histograms = None
+        self.max_conditions = None
+        self._conditions = None
+        self._lock = threading.Lock()
+
+    @property
+    def logger(self):
+        """
+        The logger slow queries and hook failures are written to; the 'DbUnify' logger unless one was set.
+        """
+        if self._logger is None:
+            # logging is only imported once something is logged, to keep `import DbUnify` light.
+            import logging
+            self._logger = logging.getLogger('DbUnify')
+        return self._logger
+
+    @logger.setter
+    def logger(self, logger):
+        self._logger = logger
+
+    @property
+    def active(self):
+        """
+        Whether any hook, the slow-query log or the histograms are enabled.
+        """
+        return bool(self.before_hooks or self.after_hooks or self.slow_threshold is not None or
+                    self._histograms is not None or self._conditions is not None)
+
+    def add_hook(self, before=None, after=None):
+        """
+        Register hooks called around every statement.
+
+        Args:
+            before (callable): Called as before(sql, param_count) before the statement runs.
+            after (callable): Called as after(sql, param_count, row_count, duration, error) once it finished.
+                duration is in seconds; row_count is None when unknown; error is the exception or None.
+        """
+        with self._lock:
+            if before is not None:
+                self.before_hooks += (before,)
+            if after is not None:
+                self.after_hooks += (after,)
+
+    def remove_hook(self, before=None, after=None):
+        """
+        Unregister hooks added with add_hook().
+
+        Args:
+            before (callable): The before hook to remove.
+            after (callable): The after hook to remove.
+        """
+        with self._lock:
+            self.before_hooks = tuple(hook for hook in self.before_hooks if hook is not before)
+            self.after_hooks = tuple(hook for hook in self.after_hooks if hook is not after)
+
+    def set_slow_query_log(self, threshold_ms, logger=None):
+        """
+        Log statements slower than a threshold.
+
+        Args:
+            threshold_ms (float): Threshold in milliseconds. None disables the slow-query log.
+            logger (logging.Logger): Logger to write to. Defaults to the 'DbUnify' logger.
+        """
+        self.slow_threshold = threshold_ms / 1000 if threshold_ms is not None else None
+        if logger is not None:
+            self.logger = logger
+
+    def set_stats(self, enabled=True, max_fingerprints=1000):
+        """
+        Enable or disable per-fingerprint latency histograms. Disabling discards them.
+
+        Args:
+            enabled (bool): Whether to record latencies.
+            max_fingerprints (int): Distinct fingerprints tracked; further ones are counted under 'other'.
+        """
+        with self._lock:
+            self.max_fingerprints = max_fingerprints
+            if not enabled:
+                self._histograms = None
+            elif self._histograms is None:
+                self._histograms = {}
+
+    def set_advisor(self, enabled=True, max_conditions=1000):
+        """
+        Enable or disable recording the WHERE conditions of single-table statements for index advice.
+        Disabling discards them.
+
+        Args:
+            enabled (bool): Whether to record conditions.
+            max_conditions (int): Distinct (table, condition fingerprint) pairs tracked; further ones are ignored.
+        """
+        with self._lock:
+            self.max_conditions = max_conditions
+            if not enabled:
+                self._conditions = None
+            elif self._conditions is None:
+                self._conditions = {}
+
+    def conditions(self):
+        """
+        Get the recorded conditions.
+
+        Returns:
+            list: (table, fingerprint, sample condition, calls, total seconds) tuples, slowest first.
+            None when disabled.
+        """
+        with self._lock:
+            if self._conditions is None:
+                return None
+            entries = [(table, fingerprint, sample, calls, total)
+                       for (_, fingerprint), (table, sample, calls, total) in self._conditions.items()]
+        return sorted(entries, key=lambda entry: entry[4], reverse=True)
+
+    def start(self, query, param_count):
+        """
+        Call the before hooks and start timing a statement.
+
+        Args:
+            query (str): The SQL statement.
+            param_count (int): Number of bound parameters.
+
+        Returns:
+            float: The start time to pass to finish().
+        """
+        for hook in self.before_hooks:
+            self._call_hook(hook, query, param_count)
+        return time.perf_counter()
+
+    def finish(self, query, param_count, row_count, started, error=None):
+        """
+        Record a finished statement: after hooks, slow-query log and histogram.
+
+        Args:
+            query (str): The SQL statement.
+            param_count (int): Number of bound parameters.
+            row_count (int): Rows fetched or affected. None or negative when unknown.
+            started (float): The value returned by start().
+            error (Exception): The exception the statement raised, if any.
+        """
+        duration = time.perf_counter() - started
+        if row_count is not None and row_count < 0:
+            row_count = None
+        if self._histograms is not None:
+            fingerprint = _fingerprint(query)
+            with self._lock:
+                histograms = self._histograms
+                if histograms is not None:
+                    histogram = histograms.get(fingerprint)
+                    if histogram is None:
+                        if len(histograms) >= self.max_fingerprints:
+                            fingerprint = 'other'
+                        histogram = histograms.setdefault(fingerprint, _LatencyHistogram())
+                    histogram.record(duration, error is not None)
+        if self._conditions is not None and error is None:
+            statement = _statement_condition(query)
+            if statement is not None:
+                table, condition = statement
+                key = (_table_key(table), _fingerprint(condition))
+                with self._lock:
+                    conditions = self._conditions
+                    if conditions is not None:
+                        entry = conditions.get(key)
+                        if entry is None and len(conditions) < self.max_conditions:
+                            entry = conditions[key] = [table, condition, 0, 0.0]
+                        if entry is not None:
+                            entry[2] += 1
+                            entry[3] += duration
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            self.logger.warning("Slow query (%.1f ms, %s params, %s rows%s): %s", duration * 1000, param_count,
+                                'unknown' if row_count is None else row_count,
+                                f", failed: {error}" if error is not None else '', query)
+        for hook in self.after_hooks:
+            self._call_hook(hook, query, param_count, row_count, duration, error)
+
+    def _call_hook(self, hook, *args):
+        # A broken hook must not fail or roll back the statement it observes.
+        try:
+            hook(*args)
+        except Exception:
+            self.logger.exception("Query hook %r failed", hook)
+
+    def snapshot(self):
+        """
+        Get the latency statistics of every fingerprint.
+
+        Returns:
+            dict: Fingerprint -> count, errors, total/mean/p50/p95/p99/max seconds. None when disabled.
+        """
+        with self._lock:
+            if self._histograms is None:
+                return None
+            return {fingerprint: histogram.snapshot() for fingerprint, histogram in self._histograms.items()}
+
+    def reset(self):
+        """
+        Discard the recorded latencies, keeping the histograms enabled.
+        """
+        with self._lock:
+            if self._histograms is not None:
+                self._histograms = {}
+
+    def prometheus(self, prefix='dbunify_query'):
+        """
+        Render the latency statistics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: A summary metric with p50/p95/p99 quantiles and an error counter, labelled by fingerprint.
+        """
+        stats = self.snapshot() or {}
+        lines = [
+            f"# HELP {prefix}_duration_seconds Statement latency by fingerprint.",
+            f"# TYPE {prefix}_duration_seconds summary",
+        ]
+        for fingerprint, stat in stats.items():
+            label = _prometheus_label(fingerprint)
+            for quantile, key in (('0.5', 'p50_seconds'), ('0.95', 'p95_seconds'), ('0.99', 'p99_seconds')):
+                lines.append(f'{prefix}_duration_seconds{{fingerprint="{label}",quantile="{quantile}"}} {stat[key]!r}')
+            lines.append(f'{prefix}_duration_seconds_sum{{fingerprint="{label}"}} {stat["total_seconds"]!r}')
+            lines.append(f'{prefix}_duration_seconds_count{{fingerprint="{label}"}} {stat["count"]}')
+        lines.append(f"# HELP {prefix}_errors_total Failed statements by fingerprint.")
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        for fingerprint, stat in stats.items():
+            lines.append(f'{prefix}_errors_total{{fingerprint="{_prometheus_label(fingerprint)}"}} {stat["errors"]}')
+        return '\n'.join(lines) + '\n'
+
+def _prometheus_label(value):
+    """
+    Escape a Prometheus label value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# SQLite EXPLAIN QUERY PLAN detail: SCAN/SEARCH, table, optional alias, optional USING clause.
+_SQLITE_PLAN_STEP = re.compile(r"^(SCAN|SEARCH)\s+(?:TABLE\s+)?([^\s()]+)(?:\s+AS\s+\S+)?(?:\s+USING\s+(.*))?$")
+
+# MySQL EXPLAIN join types that read through an index.
+_MYSQL_INDEX_ACCESS = {'const', 'eq_ref', 'ref', 'fulltext', 'ref_or_null', 'index_merge', 'unique_subquery',
+                       'index_subquery', 'range'}
+
+def _plan_node(depth, operation, access, table=None, index=None, rows=None, cost=None, detail=None):
+    return {'depth': depth, 'operation': operation, 'access': access, 'table': table, 'index': index,
+            'rows': rows, 'cost': cost, 'detail': detail}
+
+def _sqlite_plan(rows):
+    """
+    Normalize EXPLAIN QUERY PLAN rows (id, parent, notused, detail).
+    """
+    depths = {0: -1}
+    nodes = []
+    for node_id, parent, _, detail in rows:
+        depth = depths[node_id] = depths.get(parent, -1) + 1
+        match = _SQLITE_PLAN_STEP.match(detail)
+        if match is None or match.group(2) in ('CONSTANT', 'SUBQUERY') or match.group(2).startswith('('):
+            nodes.append(_plan_node(depth, detail.split(' ')[0], 'other', detail=detail))
+            continue
+        operation, table, using = match.groups()
+        index = None
+        if using:
+            index_match = re.search(r"INDEX\s+(\S+)", using)
+            index = index_match.group(1) if index_match else using.split(' (')[0]
+        if operation == 'SEARCH':
+            access = 'index_seek'
+        else:
+            access = 'index_scan' if using else 'full_scan'
+        nodes.append(_plan_node(depth, operation, access, table, index, detail=detail))
+    return nodes
+
+def _postgresql_plan(plan, depth=0, nodes=None):
+    """
+    Normalize one node of EXPLAIN (FORMAT JSON) output and its children.
+    """
+    nodes = [] if nodes is None else nodes
+    operation = plan.get('Node Type')
+    if operation == 'Seq Scan':
+        access = 'full_scan'
+    elif 'Index' in operation or operation == 'Bitmap Heap Scan':
+        access = 'index_seek' if 'Index Cond' in plan or 'Recheck Cond' in plan else 'index_scan'
+    else:
+        access = 'other'
+    detail = plan.get('Index Cond') or plan.get('Recheck Cond') or plan.get('Filter')
+    nodes.append(_plan_node(depth, operation, access, plan.get('Relation Name'), plan.get('Index Name'),
+                            plan.get('Plan Rows'), plan.get('Total Cost'), detail))
+    for child in plan.get('Plans', ()):
+        _postgresql_plan(child, depth + 1, nodes)
+    return nodes
+
+def _mysql_plan(columns, rows):
+    """
+    Normalize tabular EXPLAIN output.
+    """
+    nodes = []
+    for row in rows:
+        row = dict(zip(columns, row))
+        join_type = row.get('type')
+        if join_type == 'ALL':
+            access = 'full_scan'
+        elif join_type == 'index':
+            access = 'index_scan'
+        elif join_type in _MYSQL_INDEX_ACCESS:
+            access = 'index_seek'
+        else:
+            access = 'other'
+        nodes.append(_plan_node(0, join_type, access, row.get('table'), row.get('key'), row.get('rows'),
+                                detail=row.get('Extra')))
+    return nodes
+
+def _sqlserver_plan(showplan):
+    """
+    Normalize SHOWPLAN_XML output.
+    """
+    namespace = '{http://schemas.microsoft.com/sqlserver/2004/07/showplan}'
+    nodes = []
+
+    def visit(element, depth):
+        for child in element:
+            if child.tag != namespace + 'RelOp':
+                visit(child, depth)
+                continue
+            operation = child.get('PhysicalOp')
+            if operation in ('Table Scan', 'Clustered Index Scan'):
+                access = 'full_scan'
+            elif 'Seek' in operation:
+                access = 'index_seek'
+            elif operation == 'Index Scan':
+                access = 'index_scan'
+            else:
+                access = 'other'
+            target = child.find(f'./*/{namespace}Object')
+            table = index = None
+            if target is not None:
+                table = (target.get('Table') or '').strip('[]') or None
+                index = (target.get('Index') or '').strip('[]') or None
+            rows = child.get('EstimateRows')
+            cost = child.get('EstimatedTotalSubtreeCost')
+            nodes.append(_plan_node(depth, operation, access, table, index, float(rows) if rows else None,
+                                    float(cost) if cost else None, child.get('LogicalOp')))
+            visit(child, depth + 1)
+
+    visit(ET.fromstring(showplan), 0)
+    return nodes
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections used by DatabaseManager in pooled mode.
+
+    Connections are handed out most-recently-used first, health-checked on checkout, and closed once
+    they have been idle longer than idle_timeout (never going below min_size).
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300.0, checkout_timeout=30.0, health_check=None,
+                 on_close=None):
+        """
+        Initialize the ConnectionPool instance.
+
+        Args:
+            connect (callable): Called with no arguments to open a new connection.
+            min_size (int): Number of connections opened up front and kept open while idle.
+            max_size (int): Maximum number of connections open at the same time.
+            idle_timeout (float): Seconds after which an idle connection above min_size is closed.
+            checkout_timeout (float): Seconds to wait for a free connection before giving up.
+            health_check (callable): Called with a connection on checkout; a falsy result replaces it.
+            on_close (callable): Called with a connection right before the pool closes it.
+
+        Raises:
+            ValueError: If the sizes are inconsistent.
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect
+        self._health_check = health_check
+        self._on_close = on_close
+        self._idle = collections.deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.health_check_failures = 0
+        self.peak_in_use = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        for _ in range(min_size):
+            self._idle.append((connect(), time.monotonic()))
+            self._size += 1
+
+    def acquire(self, timeout=None):
+        """
+        Check out a connection, opening one if the pool is below max_size.
+
+        Args:
+            timeout (float): Seconds to wait for a free connection. Defaults to checkout_timeout.
+
+        Returns:
+            connection: A healthy database connection.
+
+        Raises:
+            TimeoutError: If no connection became free in time.
+        """
+        start = time.monotonic()
+        deadline = start + (self.checkout_timeout if timeout is None else timeout)
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                self._prune_idle()
+                if self._idle:
+                    connection = self._idle.pop()[0]
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise TimeoutError(f"Timed out after {time.monotonic() - start:.3f}s waiting for a pooled connection")
+                self._cond.wait(remaining)
+            waited = time.monotonic() - start
+            self._in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+        try:
+            if connection is not None and self._health_check is not None and not self._health_check(connection):
+                with self._cond:
+                    self.health_check_failures += 1
+                self._close_quietly(connection)
+                connection = None
+            if connection is None:
+                connection = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return connection
+
+    def release(self, connection, discard=False):
+        """
+        Return a checked-out connection to the pool.
+
+        Args:
+            connection: The connection returned by acquire().
+            discard (bool): Close the connection instead of keeping it for reuse.
+        """
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._cond.notify()
+        if connection is not None:
+            self._close_quietly(connection)
+
+    def _prune_idle(self):
+        """
+        Close connections idle for longer than idle_timeout, keeping min_size open. Called with the lock held.
+        """
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            connection = self._idle.popleft()[0]
+            self._size -= 1
+            self._close_quietly(connection)
+
+    def _close_quietly(self, connection):
+        try:
+            if self._on_close is not None:
+                self._on_close(connection)
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """
+        Get pool size, utilization and wait-time metrics.
+
+        Returns:
+            dict: Pool metrics.
+        """
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'utilization': self._in_use / self.max_size,
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'health_check_failures': self.health_check_failures,
+                'wait_time_total': self.wait_time_total,
+                'wait_time_avg': self.wait_time_total / self.checkouts if self.checkouts else 0.0,
+                'wait_time_max': self.wait_time_max,
+            }
+
+    def close(self):
+        """
+        Close all idle connections. Connections still checked out are closed when released.
+        """
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+class _ConnectionState:
+    """
+    A connection, its cursor and the transaction bookkeeping that goes with it.
+
+    Unpooled managers own exactly one; pooled managers keep one per thread while a connection is checked out.
+    """
+
+    def __init__(self, connection, cursor):
+        self.connection = connection
+        self.cursor = cursor
+        self.tx_depth = 0
+        self.session = None
+        self.pending = 0
+        self.last_commit = time.monotonic()
+        self.batch_group_commit = None
+        self.holds = 0
+        # Tables written since the last commit or rollback (None: unknown tables).
+        self.written = set()
+
+def _pooled(method):
+    """
+    Check a pooled connection out for the current thread for the duration of the call.
+
+    Nested calls on the same thread reuse the connection that is already checked out.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.pool is None:
+            return method(self, *args, **kwargs)
+        self._hold()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._release_hold()
+    return wrapper
+
+class _BlobReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over one BLOB value, read chunk by chunk.
+
+    DatabaseManager.open_blob() wraps it in an io.BufferedReader. The pooled connection it reads from
+    stays checked out until the reader is closed.
+    """
+
+    def __init__(self, size, read_at, on_close):
+        """
+        Initialize the _BlobReader instance.
+
+        Args:
+            size (int): Length of the value in bytes.
+            read_at (callable): Called as read_at(offset, length) to fetch bytes.
+            on_close (callable): Called once when the reader is closed.
+        """
+        super().__init__()
+        self.size = size
+        self.position = 0
+        self._read_at = read_at
+        self._on_close = on_close
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self.position = offset
+        return offset
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self.size - self.position)
+        if length <= 0:
+            return 0
+        data = self._read_at(self.position, length)
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._on_close()
+            finally:
+                super().close()
+
+class Transaction:
+    """
+    Context manager returned by DatabaseManager.transaction().
+    """
+
+    def __init__(self, manager):
+        """
+        Initialize the Transaction instance.
+
+        Args:
+            manager (DatabaseManager): The manager whose connection runs the transaction.
+        """
+        self.manager = manager
+        self.savepoint = None
+
+    def __enter__(self):
+        self.manager._hold()
+        try:
+            self.manager._begin_transaction(self)
+        except Exception as e:
+            self.manager._release_hold()
+            raise RuntimeError(f"Error starting transaction: {str(e)}")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.manager._end_transaction(self, commit=exc_type is None)
+        except Exception as e:
+            if exc_type is None:
+                raise RuntimeError(f"Error committing transaction: {str(e)}")
+        finally:
+            self.manager._release_hold()
+        return False
+
+    def __getattr__(self, name):
+        # transaction() used to return a bare cursor; keep cursor methods available on the object.
+        return getattr(self.manager.cursor, name)
 
 class DatabaseManager:
-    def __init__(self, db_type, db_name, password=None, **kwargs):
+    def __init__(self, db_type, db_name, password=None, statement_cache_size=256,
+                 pool_max_size=None, pool_min_size=1, pool_idle_timeout=300.0, pool_checkout_timeout=30.0,
+                 result_cache_size=None, result_cache_bytes=None, result_cache_ttl=None, json_codec='json', profile=None,
+                 **kwargs):
+        """
+        Initialize the DatabaseManager instance.
+
+        Args:
+            db_type (str): The type of the database ('sqlite', 'mysql', 'postgresql', 'mongodb', 'sqlserver').
+            db_name (str): The name of the database or connection URI.
+            password (str): The password for the database (if required).
+            statement_cache_size (int): Number of generated SQL statements kept in the LRU cache.
+            pool_max_size (int): Enable pooled mode with at most this many connections. None keeps one connection.
+            pool_min_size (int): Connections opened up front and kept open in pooled mode.
+            pool_idle_timeout (float): Seconds after which an idle pooled connection above pool_min_size is closed.
+            pool_checkout_timeout (float): Seconds to wait for a free pooled connection.
+            result_cache_size (int): Enable the result cache of search_one, search_all, retrieve_json_data and
+                retrieve_xml_data with at most this many entries. None disables it unless result_cache_bytes is set.
+            result_cache_bytes (int): Approximate memory limit of the result cache in bytes.
+            result_cache_ttl (float): Seconds a cached result stays valid. None keeps it until a write invalidates it.
+            json_codec (str): Serializer of the JSON table helpers: 'json', 'orjson', 'ujson', 'auto' (fastest
+                installed), or an object with dumps (returning str) and loads.
+            profile (str): SQLite connection profile: 'read_heavy', 'write_heavy' or 'durable'. None keeps the
+                SQLite defaults.
+            **kwargs: Additional keyword arguments specific to each database type. SQLite accepts journal_mode,
+                synchronous, cache_size, mmap_size, temp_store, busy_timeout and wal_autocheckpoint (PRAGMAs
+                applied to every connection, overriding the profile) and cached_statements.
+
+        Raises:
+            ValueError: If the profile or a PRAGMA value is invalid.
+            ConnectionError: If there is an error connecting to the database.
+        """
+        self.db_type = db_type
+        self.db_name = db_name
+        self.compiler = SQLCompiler(db_type, max_size=statement_cache_size)
+        self.pool = None
+        self._pooled_mode = pool_max_size is not None and db_type != 'mongodb'
+        self._single = None
+        self._local = threading.local()
+        self._group_commit = None
+        self._stream_ids = itertools.count()
+        self.result_cache = None
+        if result_cache_size is not None or result_cache_bytes is not None:
+            self.result_cache = ResultCache(result_cache_size, result_cache_bytes, result_cache_ttl)
+        self._json = _json_codec(json_codec) if isinstance(json_codec, str) else json_codec
+        self.instrumentation = QueryInstrumentation()
+        # The instrumentation while anything is enabled, else None; checked on every statement.
+        self._instrumented = None
+        if password is not None and self.db_type in ['mysql', 'postgresql', 'sqlserver']:
+            kwargs['password'] = password
+        if db_type == 'mongodb' and pool_max_size is not None:
+            # MongoClient is already a thread-safe pool; hand the sizes to it.
+            kwargs.setdefault('maxPoolSize', pool_max_size)
+            kwargs.setdefault('minPoolSize', pool_min_size)
+        self._connect_kwargs = kwargs
+        self._options = {'statement_cache_size': statement_cache_size}
+        self._sqlite_settings = {}
+        if profile is not None:
+            if db_type != 'sqlite':
+                raise ValueError("Connection profiles are only supported for sqlite")
+            if profile not in _SQLITE_PROFILES:
+                raise ValueError(f"Unknown profile {profile!r}; expected one of {', '.join(_SQLITE_PROFILES)}")
+            self._sqlite_settings.update(_SQLITE_PROFILES[profile])
+            self._options['profile'] = profile
+        if db_type == 'sqlite':
+            for name in _SQLITE_PRAGMAS + ('cached_statements',):
+                if kwargs.get(name) is not None:
+                    self._sqlite_settings[name] = kwargs[name]
+            for name in _SQLITE_PRAGMAS:
+                value = self._sqlite_settings.get(name)
+                if value is not None and not re.fullmatch(r"-?\d+|[A-Za-z]+", str(value)):
+                    raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+
+        try:
+            self._driver = _load_driver(db_type)
+            if self._pooled_mode:
+                self.pool = ConnectionPool(self._connect, min_size=pool_min_size, max_size=pool_max_size,
+                                           idle_timeout=pool_idle_timeout, checkout_timeout=pool_checkout_timeout,
+                                           health_check=self._ping,
+                                           on_close=self._optimize if db_type == 'sqlite' else None)
+            else:
+                connection = self._connect()
+                # MongoClient has no cursors; collections are reached through _collection.
+                self._single = _ConnectionState(connection, None if db_type == 'mongodb' else connection.cursor())
+        except Exception as e:
+            raise ConnectionError(f"Error connecting to the database: {str(e)}")
+
+    def _connect(self):
+        """
+        Open a new connection to the database.
+
+        Returns:
+            connection: A new driver connection.
+        """
+        driver, kwargs = self._driver, self._connect_kwargs
+        if self.db_type == 'sqlite':
+            settings = self._sqlite_settings
+            options = {}
+            if self._pooled_mode:
+                # Pooled connections move between threads.
+                options['check_same_thread'] = False
+            if settings.get('cached_statements') is not None:
+                options['cached_statements'] = settings['cached_statements']
+            connection = driver.connect(self.db_name, **options)
+            for name in _SQLITE_PRAGMAS:
+                if settings.get(name) is not None:
+                    connection.execute(f"PRAGMA {name} = {settings[name]}").fetchall()
+            return connection
+        elif self.db_type in ['mysql', 'postgresql']:
+            return driver.connect(database=self.db_name, **kwargs)
+        elif self.db_type == 'mongodb':
+            return driver.MongoClient(**kwargs)
+        elif self.db_type == 'sqlserver':
+            return driver.connect(**kwargs)
+
+    def _optimize(self, connection):
+        """
+        Let SQLite refresh the query planner statistics that are worth refreshing before a connection closes.
+
+        Args:
+            connection: The SQLite connection about to be closed.
+        """
+        try:
+            connection.execute("PRAGMA optimize")
+        except Exception:
+            pass
+
+    def _ping(self, connection):
+        """
+        Check that a pooled connection is still usable.
+
+        Args:
+            connection: The connection to check.
+
+        Returns:
+            bool: True if the connection answered a trivial query.
+        """
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @property
+    def _state(self):
+        """
+        The _ConnectionState of the current thread (the only one when pooling is disabled).
+        """
+        if self.pool is None:
+            return self._single
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            raise RuntimeError("No pooled connection is checked out by this thread; use `with db.checkout():`")
+        return state
+
+    @property
+    def connection(self):
+        """
+        The connection used by the current thread.
+        """
+        return self._state.connection
+
+    @property
+    def cursor(self):
+        """
+        The cursor used by the current thread.
+        """
+        return self._state.cursor
+
+    def _hold(self):
+        """
+        Pin a pooled connection to the current thread, checking one out if needed.
+        """
+        if self.pool is None:
+            return
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            try:
+                connection = self.pool.acquire()
+            except Exception as e:
+                raise ConnectionError(f"Error checking out a pooled connection: {str(e)}")
+            try:
+                state = _ConnectionState(connection, connection.cursor())
+            except Exception as e:
+                self.pool.release(connection, discard=True)
+                raise ConnectionError(f"Error checking out a pooled connection: {str(e)}")
+            self._local.state = state
+        state.holds += 1
+
+    def _release_hold(self):
+        """
+        Undo one _hold(); the connection goes back to the pool when the last hold is released.
+        """
+        if self.pool is None:
+            return
+        state = self._local.state
+        state.holds -= 1
+        if state.holds or state.tx_depth:
+            return
+        self._local.state = None
+        discard = False
+        try:
+            if state.pending:
+                state.connection.commit()
+            else:
+                # Do not hand the next borrower a connection with an open read transaction.
+                state.connection.rollback()
+            state.cursor.close()
+        except Exception:
+            discard = True
+        self._settle_writes(state)
+        self.pool.release(state.connection, discard=discard)
+
+    @contextlib.contextmanager
+    def checkout(self):
+        """
+        Pin one pooled connection to the current thread for the block.
+
+        Without a pool this simply yields the manager's cursor.
+
+        Yields:
+            cursor: The cursor of the checked-out connection.
+        """
+        self._hold()
+        try:
+            yield self.cursor
+        finally:
+            self._release_hold()
+
+    def pool_stats(self):
+        """
+        Get connection pool metrics.
+
+        Returns:
+            dict: Pool size, utilization and wait-time metrics, or None when pooling is disabled.
+        """
+        return self.pool.stats() if self.pool is not None else None
+
+    def _clone(self):
+        """
+        Open a new, unpooled DatabaseManager with the same connection settings.
+
+        Returns:
+            DatabaseManager: A manager with its own connection.
+        """
+        return DatabaseManager(self.db_type, self.db_name, **self._options, **self._connect_kwargs)
+
+    def _collection(self, table_name):
+        """
+        Get a MongoDB collection of the manager's database.
+
+        Args:
+            table_name (str): Name of the collection.
+
+        Returns:
+            Collection: The pymongo collection.
+        """
+        return self.connection[self.db_name][table_name]
+
+    def _document_write(self, table_name, write):
+        """
+        Run a write on a MongoDB collection, inside the open transaction's session if there is one.
+
+        MongoDB acknowledges each write on its own, so outside a transaction block the write is settled
+        for result-cache invalidation straight away.
+
+        Args:
+            table_name (str): Name of the collection.
+            write (callable): Called as write(collection, session).
+
+        Returns:
+            The result of write.
+        """
+        self._mark_written((_table_key(table_name),))
+        state = self._state
+        try:
+            return write(self._collection(table_name), state.session)
+        finally:
+            if not state.tx_depth:
+                self._settle_writes(state)
+
+    def _cached_documents(self, key, table_name, fetch):
+        """
+        Serve a MongoDB read through the result cache.
+
+        Documents are mutable, so a cached result is handed out as a deep copy.
+
+        Args:
+            key (tuple): The cache key.
+            table_name (str): Name of the collection read.
+            fetch (callable): Called with no arguments to run the read.
+
+        Returns:
+            The fetched documents.
+        """
+        result = self._cached_read(key, (_table_key(table_name),), fetch)
+        return copy.deepcopy(result) if self.result_cache is not None else result
+
+    @_pooled
+    def set_password(self, password):
+        """
+        Set a new password for the database user.
+
+        Args:
+            password (str): The new password.
+
+        Raises:
+            RuntimeError: If there is an error setting the password.
+        """
+        if self.db_type == 'mysql':
+            try:
+                query = f"ALTER USER '{self.db_name}'@'localhost' IDENTIFIED BY '{password}';"
+                self.execute_query(query)
+            except Exception as e:
+                raise RuntimeError(f"Error setting password: {str(e)}")
+        elif self.db_type == 'postgresql':
+            try:
+                query = f"ALTER USER {self.db_name} WITH PASSWORD '{password}';"
+                self.execute_query(query)
+            except Exception as e:
+                raise RuntimeError(f"Error setting password: {str(e)}")
+        elif self.db_type == 'sqlserver':
+            try:
+                query = f"ALTER LOGIN {self.db_name} WITH PASSWORD = '{password}';"
+                self.execute_query(query)
+            except Exception as e:
+                raise RuntimeError(f"Error setting password: {str(e)}")
+            
+    def transaction(self):
+        """
+        Start a database transaction.
+
+        Use the returned object as a context manager. Statements run inside the block are committed
+        once when it exits and rolled back if it raises. Nested blocks use savepoints, so an error in
+        an inner block only undoes that block. On MongoDB the block runs in a client session transaction.
+
+        Returns:
+            Transaction: A database transaction object.
+
+        Raises:
+            RuntimeError: If there is an error starting the transaction.
+        """
+        return Transaction(self)
+
+    @contextlib.contextmanager
+    def batch(self, commit_every=None, commit_interval_ms=None):
+        """
+        Defer commits for the statements run inside the block.
+
+        Without arguments this is the same as `with db.transaction():`. With commit_every or
+        commit_interval_ms the block runs in group-commit mode: a commit is issued every N statements or
+        once T milliseconds have passed since the last commit, and the remainder is committed on exit.
+
+        Args:
+            commit_every (int): Commit after this many statements.
+            commit_interval_ms (float): Commit once this many milliseconds have passed since the last commit.
+
+        Raises:
+            RuntimeError: If there is an error committing the batch.
+        """
+        if commit_every is None and commit_interval_ms is None:
+            with self.transaction() as transaction:
+                yield transaction
+            return
+
+        self._hold()
+        state = self._state
+        previous = state.batch_group_commit
+        state.batch_group_commit = (commit_every, commit_interval_ms)
+        state.last_commit = time.monotonic()
+        try:
+            yield self
+            self.flush()
+        except Exception:
+            self._rollback()
+            raise
+        finally:
+            state.batch_group_commit = previous
+            self._release_hold()
+
+    def set_group_commit(self, commit_every=None, commit_interval_ms=None):
+        """
+        Enable or disable group commit for statements run outside a transaction block.
+
+        In group-commit mode writes are committed every N statements or once T milliseconds have passed
+        since the last commit, instead of once per statement. Pending statements are committed by
+        flush() and close(). A failing statement rolls back the statements pending in its group.
+
+        Args:
+            commit_every (int): Commit after this many statements. None with no interval disables group commit.
+            commit_interval_ms (float): Commit once this many milliseconds have passed since the last commit.
+        """
+        if commit_every is None and commit_interval_ms is None:
+            self.flush()
+            self._group_commit = None
+        else:
+            self._group_commit = (commit_every, commit_interval_ms)
+
+    def flush(self):
+        """
+        Commit the statements pending in group-commit mode.
+
+        Raises:
+            RuntimeError: If there is an error committing.
+        """
+        state = self._single if self.pool is None else getattr(self._local, 'state', None)
+        if state is not None and state.pending and not state.tx_depth:
+            try:
+                state.connection.commit()
+            except Exception as e:
+                raise RuntimeError(f"Error committing: {str(e)}")
+            state.pending = 0
+            state.last_commit = time.monotonic()
+            self._settle_writes(state)
+
+    def _commit(self):
+        """
+        Commit after a write, unless a transaction block or group commit defers it.
+        """
+        state = self._state
+        if state.tx_depth:
+            return
+        group_commit = state.batch_group_commit or self._group_commit
+        if group_commit is None:
+            state.connection.commit()
+            self._settle_writes(state)
+            return
+        state.pending += 1
+        commit_every, commit_interval_ms = group_commit
+        if (commit_every is not None and state.pending >= commit_every) or (
+                commit_interval_ms is not None and (time.monotonic() - state.last_commit) * 1000 >= commit_interval_ms):
+            self.flush()
+
+    def _rollback(self):
+        """
+        Roll back after a failed write. Inside a transaction block the block's exit handles it.
+        """
+        state = self._state
+        if state.tx_depth:
+            return
+        state.pending = 0
+        state.connection.rollback()
+        self._settle_writes(state)
+
+    def _mark_written(self, tables):
+        """
+        Record a write for result-cache invalidation.
+
+        Cached results of the tables are dropped now and again when the write is committed or rolled
+        back, so readers on other connections cannot re-cache rows from before the commit.
+
+        Args:
+            tables (tuple): Normalized table names written to, or None when they are unknown.
+        """
+        if self.result_cache is None:
+            return
+        self.result_cache.invalidate(tables)
+        written = self._state.written
+        if tables is None:
+            written.add(None)
+        else:
+            written.update(tables)
+
+    def _settle_writes(self, state):
+        """
+        Invalidate the tables written on a connection once its writes are committed or rolled back.
+
+        Args:
+            state (_ConnectionState): The connection whose transaction ended.
+        """
+        if self.result_cache is None or not state.written:
+            return
+        written, state.written = state.written, set()
+        self.result_cache.invalidate(None if None in written else written)
+
+    def _cached_read(self, key, tables, fetch):
+        """
+        Serve a read from the result cache, fetching and storing it on a miss.
+
+        The cache is bypassed while the current connection has uncommitted writes, so a transaction
+        sees its own changes and never caches them.
+
+        Args:
+            key (tuple): The cache key.
+            tables (tuple): Normalized table names the result depends on.
+            fetch (callable): Called with no arguments to run the read.
+
+        Returns:
+            The cached or fetched result.
+        """
+        cache = self.result_cache
+        if cache is None:
+            return fetch()
+        state = self._state
+        if state.tx_depth or state.pending or state.written:
+            return fetch()
+        hit, value = cache.get(key)
+        if hit:
+            return value
+        token = cache.version(tables)
+        value = fetch()
+        cache.put(key, tables, value, token)
+        return value
+
+    def invalidate(self, table_name=None):
+        """
+        Drop cached results of a table, e.g. after it was changed by another process.
+
+        Args:
+            table_name (str): Name of the table. None drops every cached result.
+        """
+        if self.result_cache is not None:
+            self.result_cache.invalidate(None if table_name is None else (_table_key(table_name),))
+
+    def result_cache_info(self):
+        """
+        Get result cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit rate, entries, bytes, limits and eviction counters, or None when the cache is disabled.
+        """
+        return self.result_cache.info() if self.result_cache is not None else None
+
+    def _run_instrumented(self, query, param_count, run, row_count=None):
+        """
+        Run a statement through the enabled hooks, slow-query log and histograms.
+
+        Args:
+            query (str): The SQL statement.
+            param_count (int): Number of bound parameters.
+            run (callable): Executes the statement and returns its result.
+            row_count (callable): Called with the result to count its rows. Defaults to cursor.rowcount.
+
+        Returns:
+            The result of run().
+        """
+        instrumentation = self._instrumented
+        started = instrumentation.start(query, param_count)
+        try:
+            result = run()
+        except Exception as e:
+            instrumentation.finish(query, param_count, None, started, e)
+            raise
+        instrumentation.finish(query, param_count, self.cursor.rowcount if row_count is None else row_count(result), started)
+        return result
+
+    def _instrumentation_changed(self):
+        self._instrumented = self.instrumentation if self.instrumentation.active else None
+
+    def add_query_hook(self, before=None, after=None):
+        """
+        Register hooks called around every statement run by execute_query, fetch_all and the helpers built on them.
+
+        Args:
+            before (callable): Called as before(sql, param_count) before the statement runs.
+            after (callable): Called as after(sql, param_count, row_count, duration, error) once it finished.
+                duration is in seconds; row_count is None when unknown; error is the exception or None.
+        """
+        self.instrumentation.add_hook(before, after)
+        self._instrumentation_changed()
+
+    def remove_query_hook(self, before=None, after=None):
+        """
+        Unregister hooks added with add_query_hook().
+
+        Args:
+            before (callable): The before hook to remove.
+            after (callable): The after hook to remove.
+        """
+        self.instrumentation.remove_hook(before, after)
+        self._instrumentation_changed()
+
+    def set_slow_query_log(self, threshold_ms, logger=None):
+        """
+        Log a warning for every statement slower than a threshold.
+
+        Args:
+            threshold_ms (float): Threshold in milliseconds. None disables the slow-query log.
+            logger (logging.Logger): Logger to write to. Defaults to the 'DbUnify' logger.
+        """
+        self.instrumentation.set_slow_query_log(threshold_ms, logger)
+        self._instrumentation_changed()
+
+    def set_query_stats(self, enabled=True, max_fingerprints=1000):
+        """
+        Enable or disable latency histograms per statement fingerprint (the SQL with literals replaced by '?').
+
+        Args:
+            enabled (bool): Whether to record latencies. Disabling discards the recorded ones.
+            max_fingerprints (int): Distinct fingerprints tracked; further ones are counted under 'other'.
+        """
+        self.instrumentation.set_stats(enabled, max_fingerprints)
+        self._instrumentation_changed()
+
+    def set_index_advisor(self, enabled=True, max_conditions=1000):
+        """
+        Enable or disable the index advisor: record the WHERE conditions of single-table statements and their
+        cumulative time, for index_advice().
+
+        Args:
+            enabled (bool): Whether to record conditions. Disabling discards the recorded ones.
+            max_conditions (int): Distinct (table, condition fingerprint) pairs tracked; further ones are ignored.
+        """
+        self.instrumentation.set_advisor(enabled, max_conditions)
+        self._instrumentation_changed()
+
+    def query_stats(self, reset=False):
+        """
+        Get latency statistics per statement fingerprint.
+
+        Args:
+            reset (bool): Discard the recorded latencies after taking the snapshot.
+
+        Returns:
+            dict: Fingerprint -> count, errors, total/mean/p50/p95/p99/max seconds, or None when disabled.
+        """
+        snapshot = self.instrumentation.snapshot()
+        if reset:
+            self.instrumentation.reset()
+        return snapshot
+
+    def query_stats_prometheus(self, prefix='dbunify_query'):
+        """
+        Export the latency statistics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: A summary metric with p50/p95/p99 quantiles and an error counter, labelled by fingerprint.
+        """
+        return self.instrumentation.prometheus(prefix)
+
+    def _savepoint_sql(self, action, name):
+        """
+        Build the savepoint statement for the backend.
+
+        Args:
+            action (str): 'create', 'release' or 'rollback'.
+            name (str): Name of the savepoint.
+
+        Returns:
+            str: The SQL statement, or None if the backend has no such statement.
+        """
+        if self.db_type == 'sqlserver':
+            return {'create': f"SAVE TRANSACTION {name}", 'release': None, 'rollback': f"ROLLBACK TRANSACTION {name}"}[action]
+        return {'create': f"SAVEPOINT {name}", 'release': f"RELEASE SAVEPOINT {name}", 'rollback': f"ROLLBACK TO SAVEPOINT {name}"}[action]
+
+    def _begin_transaction(self, transaction):
+        """
+        Open a transaction block, or a savepoint when one is already open.
+
+        Args:
+            transaction (Transaction): The block being opened.
+        """
+        state = self._state
+        if state.tx_depth == 0:
+            self.flush()
+            if self.db_type == 'mongodb':
+                state.session = state.connection.start_session()
+                state.session.start_transaction()
+            elif self.db_type == 'sqlite' and not state.connection.in_transaction:
+                state.cursor.execute("BEGIN")
+        elif self.db_type != 'mongodb':
+            transaction.savepoint = f"dbunify_sp_{state.tx_depth}"
+            state.cursor.execute(self._savepoint_sql('create', transaction.savepoint))
+        state.tx_depth += 1
+
+    def _end_transaction(self, transaction, commit):
+        """
+        Close a transaction block, committing or rolling back its statements.
+
+        Args:
+            transaction (Transaction): The block being closed.
+            commit (bool): True to commit the block, False to roll it back.
+        """
+        state = self._state
+        state.tx_depth -= 1
+        if state.tx_depth == 0:
+            if self.db_type == 'mongodb':
+                try:
+                    if commit:
+                        state.session.commit_transaction()
+                    else:
+                        state.session.abort_transaction()
+                finally:
+                    state.session.end_session()
+                    state.session = None
+            elif commit:
+                state.connection.commit()
+            else:
+                state.connection.rollback()
+            state.last_commit = time.monotonic()
+            self._settle_writes(state)
+        elif transaction.savepoint is not None:
+            if not commit:
+                state.cursor.execute(self._savepoint_sql('rollback', transaction.savepoint))
+            release = self._savepoint_sql('release', transaction.savepoint)
+            if release is not None:
+                state.cursor.execute(release)
+
+    @_pooled
+    def backup_database(self, backup_path, pages=256, step_sleep=0.0, progress=None, compression=None):
+        """
+        Create a backup of the database.
+
+        SQLite databases are copied with the online backup API, a few pages at a time, from one read
+        snapshot, so a live database (including its WAL) is captured consistently. In WAL mode writers are
+        not blocked during the copy. The copy is written next to backup_path and moved into place when it
+        is complete.
+
+        On MongoDB, backup_path names a database on the same server; it is replaced by a copy of every
+        collection and its indexes.
+
+        Args:
+            backup_path (str): The path where the backup should be stored (a database name on MongoDB).
+            pages (int): SQLite pages copied per step. -1 copies everything in one step.
+            step_sleep (float): Seconds to sleep between steps, to throttle the I/O of the backup.
+            progress (callable): Called as progress(remaining_pages, total_pages) after each step.
+            compression (str): None, 'gzip' or 'zstd' to compress the backup file.
+
+        Returns:
+            bool: True if the backup was successful, False otherwise.
+
+        Raises:
+            RuntimeError: If there is an error creating the database backup.
+        """
+        if self.db_type == 'sqlite':
+            temp_path = f"{backup_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                self.flush()
+                # Pin a read snapshot for the whole copy. Otherwise every commit made by another connection
+                # restarts the backup; in WAL mode writers keep going while the snapshot is held.
+                snapshot = not self.connection.in_transaction
+                if snapshot:
+                    self.connection.execute("BEGIN")
+                    self.connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchall()
+                target = self._driver.connect(temp_path)
+                try:
+                    self.connection.backup(target, pages=pages, progress=self._backup_progress(step_sleep, progress))
+                finally:
+                    target.close()
+                    if snapshot:
+                        self.connection.rollback()
+                if compression is None:
+                    os.replace(temp_path, backup_path)
+                else:
+                    with open(temp_path, 'rb') as source, _open_binary(backup_path, 'w', compression) as output:
+                        shutil.copyfileobj(source, output, 1024 * 1024)
+                return True
+            except Exception as e:
+                raise RuntimeError(f"Error creating database backup: {str(e)}")
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        elif self.db_type == 'mongodb':
+            try:
+                if backup_path == self.db_name:
+                    raise ValueError("The backup database must differ from the live database")
+                self.connection.drop_database(backup_path)
+                self._copy_database(self.db_name, backup_path)
+                return True
+            except Exception as e:
+                raise RuntimeError(f"Error creating database backup: {str(e)}")
+        else:
+            raise ValueError(f"Database backup not supported for {self.db_type}")
+
+    @_pooled
+    def restore_database(self, backup_path, pages=256, step_sleep=0.0, progress=None, compression=None):
+        """
+        Restore the database from a backup.
+
+        SQLite backups are (decompressed and) checked with PRAGMA integrity_check first; only a backup
+        that passes is copied into the live database, through the online backup API on this connection.
+
+        On MongoDB, backup_path names the backup database; the live collections are replaced by its
+        collections and indexes.
+
+        Args:
+            backup_path (str): The path to the backup file (a database name on MongoDB).
+            pages (int): SQLite pages copied per step. -1 copies everything in one step.
+            step_sleep (float): Seconds to sleep between steps.
+            progress (callable): Called as progress(remaining_pages, total_pages) after each step.
+            compression (str): None, 'gzip' or 'zstd' if the backup file is compressed.
+
+        Returns:
+            bool: True if the restore was successful, False otherwise.
+
+        Raises:
+            RuntimeError: If there is an error restoring the database.
+        """
+        if self.db_type == 'sqlite':
+            temp_path = None
+            try:
+                if self._state.tx_depth:
+                    raise RuntimeError("Cannot restore inside a transaction block")
+                self.flush()
+                source_path = backup_path
+                if compression is not None:
+                    fd, temp_path = tempfile.mkstemp(prefix='.dbunify-restore-')
+                    with _open_binary(backup_path, 'r', compression) as compressed, os.fdopen(fd, 'wb') as output:
+                        shutil.copyfileobj(compressed, output, 1024 * 1024)
+                    source_path = temp_path
+                if not os.path.exists(source_path):
+                    raise FileNotFoundError(f"Backup file not found: {backup_path}")
+                source = self._driver.connect(source_path)
+                try:
+                    result = source.execute("PRAGMA integrity_check").fetchall()
+                    if result != [('ok',)]:
+                        raise RuntimeError(f"Backup failed integrity check: {'; '.join(str(row[0]) for row in result)}")
+                    if self.connection.in_transaction:
+                        self.connection.commit()
+                    # Every table may change; drop cached results now and again once the copy is done.
+                    self._mark_written(None)
+                    try:
+                        source.backup(self.connection, pages=pages, progress=self._backup_progress(step_sleep, progress))
+                    finally:
+                        self._settle_writes(self._state)
+                finally:
+                    source.close()
+                self.compiler.clear()
+                return True
+            except Exception as e:
+                raise RuntimeError(f"Error restoring database: {str(e)}")
+            finally:
+                if temp_path is not None and os.path.exists(temp_path):
+                    os.remove(temp_path)
+        elif self.db_type == 'mongodb':
+            try:
+                if self._state.tx_depth:
+                    raise RuntimeError("Cannot restore inside a transaction block")
+                if backup_path == self.db_name:
+                    raise ValueError("The backup database must differ from the live database")
+                if not self.connection[backup_path].list_collection_names():
+                    raise FileNotFoundError(f"Backup database not found or empty: {backup_path}")
+                self._mark_written(None)
+                try:
+                    self.connection.drop_database(self.db_name)
+                    self._copy_database(backup_path, self.db_name)
+                finally:
+                    self._settle_writes(self._state)
+                return True
+            except Exception as e:
+                raise RuntimeError(f"Error restoring database: {str(e)}")
+        else:
+            raise ValueError(f"Database restore not supported for {self.db_type}")
+
+    def _copy_database(self, source_name, target_name, batch_size=1000):
+        """
+        Copy every collection of a MongoDB database, with its indexes, into another database.
+
+        Each collection is copied on the server with $out (MongoDB 4.4+). Where that is not available the
+        documents are streamed through a batched find cursor and written with unordered insert_many.
+
+        Args:
+            source_name (str): Name of the database to copy.
+            target_name (str): Name of the database to copy into.
+            batch_size (int): Documents per batch for the client-side copy.
+        """
+        source, target = self.connection[source_name], self.connection[target_name]
+        for name in source.list_collection_names():
+            if name.startswith('system.'):
+                continue
+            collection = source[name]
+            try:
+                collection.aggregate([{'$match': {}}, {'$out': {'db': target_name, 'coll': name}}])
+            except Exception:
+                target.drop_collection(name)
+                target.create_collection(name)
+                cursor = collection.find({}, batch_size=batch_size)
+                try:
+                    while True:
+                        batch = list(itertools.islice(cursor, batch_size))
+                        if not batch:
+                            break
+                        target[name].insert_many(batch, ordered=False)
+                finally:
+                    cursor.close()
+            for index_name, info in collection.index_information().items():
+                if index_name == '_id_':
+                    continue
+                options = {key: value for key, value in info.items() if key not in ('key', 'v', 'ns')}
+                target[name].create_index(info['key'], name=index_name, **options)
+
+    @staticmethod
+    def _backup_progress(step_sleep, progress):
+        """
+        Build the per-step callback for sqlite3.Connection.backup.
+
+        Args:
+            step_sleep (float): Seconds to sleep after each step.
+            progress (callable): User callback, called as progress(remaining_pages, total_pages).
+
+        Returns:
+            callable: The callback, or None when there is nothing to do between steps.
+        """
+        if not step_sleep and progress is None:
+            return None
+
+        def callback(status, remaining, total):
+            if progress is not None:
+                progress(remaining, total)
+            if step_sleep and remaining:
+                time.sleep(step_sleep)
+        return callback
+
+    @_pooled
+    def execute_query(self, query, *args):
+        """
+        Execute a database query.
+
+        Args:
+            query (str): The SQL query to be executed.
+            *args: Parameters to be passed to the query.
+
+        Raises:
+            RuntimeError: If there is an error executing the query.
+        """
+        try:
+            if self.result_cache is not None:
+                self._mark_written(_written_tables(query))
+            if self._instrumented is None:
+                self.cursor.execute(query, args)
+            else:
+                self._run_instrumented(query, len(args), lambda: self.cursor.execute(query, args))
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            raise RuntimeError(f"Error executing query: {str(e)}")
+
+    @_pooled
+    def fetch_all(self, query, *args):
+        """
+        Execute a query and fetch all results.
+
+        Args:
+            query (str): The SQL query to be executed.
+            *args: Parameters to be passed to the query.
+
+        Returns:
+            list: List of fetched rows.
+
+        Raises:
+            RuntimeError: If there is an error fetching data.
+        """
+        try:
+            if self._instrumented is None:
+                self.cursor.execute(query, args)
+                return self.cursor.fetchall()
+            return self._run_instrumented(query, len(args), lambda: self._execute_fetch(query, args, 'fetchall'), len)
+        except Exception as e:
+            raise RuntimeError(f"Error fetching data: {str(e)}")
+
+    def iter_query(self, query, *args, chunk_size=1000):
+        """
+        Execute a query and yield its rows without materializing the whole result.
+
+        Rows are fetched with fetchmany in chunks of chunk_size. PostgreSQL uses a named server-side cursor
+        and MySQL an unbuffered SSCursor, so memory stays flat regardless of the result size. On MySQL the
+        connection cannot run other queries until the iterator is exhausted or closed.
+
+        Args:
+            query (str): The SQL query to be executed.
+            *args: Parameters to be passed to the query.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            tuple: One fetched row.
+
+        Raises:
+            RuntimeError: If there is an error fetching data.
+        """
+        for chunk in self._iter_chunks(query, args, chunk_size):
+            yield from chunk
+
+    def iter_table(self, table_name, columns=None, chunk_size=1000):
+        """
+        Yield all rows of a table without materializing them.
+
+        Args:
+            table_name (str): Name of the table (or MongoDB collection) to read.
+            columns (list): Columns to select. All columns when None.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            tuple: One fetched row (a dict per document on MongoDB).
+
+        Raises:
+            RuntimeError: If there is an error fetching data.
+        """
+        if self.db_type == 'mongodb':
+            yield from self._iter_documents(table_name, columns, chunk_size)
+            return
+        column_list = ', '.join(columns) if columns else '*'
+        yield from self.iter_query(f"SELECT {column_list} FROM {table_name}", chunk_size=chunk_size)
+
+    def fetch_columns(self, query, *args, dtypes=None, chunk_size=10000):
+        """
+        Execute a query and return its result as one NumPy array per column.
+
+        Rows are read chunk-wise from a streaming cursor into preallocated, geometrically growing
+        buffers, so memory stays at roughly one compact array per column. Column dtypes are inferred
+        (bool, int64, float64, object) unless given in dtypes; columns with NULLs become masked arrays.
+
+        Args:
+            query (str): The SQL query to be executed.
+            *args: Parameters to be passed to the query.
+            dtypes (dict): Optional mapping of column name to NumPy dtype.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            dict: Column name to numpy.ndarray (numpy.ma.MaskedArray when the column has NULLs).
+
+        Raises:
+            RuntimeError: If there is an error fetching data.
         """
-        Initialize the DatabaseManager instance.
+        try:
+            np = _numpy()
+            dtypes = dtypes or {}
+            names = []
+            buffers = None
+            for rows in self._iter_chunks(query, args, chunk_size, columns_out=names):
+                if buffers is None:
+                    buffers = [_ColumnBuffer(np, dtypes.get(name)) for name in names]
+                for buffer, values in zip(buffers, zip(*rows)):
+                    buffer.extend(values)
+            if buffers is None:
+                buffers = [_ColumnBuffer(np, dtypes.get(name)) for name in names]
+            return {name: buffer.finish() for name, buffer in zip(names, buffers)}
+        except Exception as e:
+            raise RuntimeError(f"Error fetching columns: {str(e)}")
+
+    def _table_columns(self, table_name):
+        """
+        Get the column names of a table without reading any rows.
 
         Args:
-            db_type (str): The type of the database ('sqlite', 'mysql', 'postgresql', 'mongodb', 'sqlserver').
-            db_name (str): The name of the database or connection URI.
-            password (str): The password for the database (if required).
-            **kwargs: Additional keyword arguments specific to each database type.
+            table_name (str): Name of the table.
+
+        Returns:
+            list: The column names in table order.
+        """
+        columns = []
+        for _ in self._iter_chunks(f"SELECT * FROM {table_name} WHERE 1 = 0", (), 1, columns_out=columns):
+            pass
+        return columns
+
+    def _iter_chunks(self, query, args, chunk_size, columns_out=None):
+        """
+        Execute a query on a dedicated streaming cursor and yield lists of rows.
+
+        Args:
+            query (str): The SQL query to be executed.
+            args (tuple): Parameters to be passed to the query.
+            chunk_size (int): Number of rows fetched per round trip.
+            columns_out (list): If given, filled with the result column names once they are known.
+
+        Yields:
+            list: Up to chunk_size rows.
 
         Raises:
-            ConnectionError: If there is an error connecting to the database.
+            RuntimeError: If there is an error fetching data.
         """
-        self.db_type = db_type
-        self.db_name = db_name
-        self.connection = None
-        if password is not None and self.db_type in ['mysql', 'postgresql', 'sqlserver']:
-            kwargs['password'] = password
+        if self.db_type == 'mongodb':
+            raise ValueError("SQL queries are not supported for mongodb; use iter_table")
+        self._hold()
+        cursor = None
+        try:
+            try:
+                cursor = self._stream_cursor(chunk_size)
+                cursor.execute(query, args)
+                rows = cursor.fetchmany(chunk_size)
+            except Exception as e:
+                raise RuntimeError(f"Error fetching data: {str(e)}")
+            if columns_out is not None and cursor.description:
+                columns_out.extend(description[0] for description in cursor.description)
+            while rows:
+                yield rows
+                try:
+                    rows = cursor.fetchmany(chunk_size)
+                except Exception as e:
+                    raise RuntimeError(f"Error fetching data: {str(e)}")
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            self._release_hold()
+
+    def _stream_cursor(self, chunk_size):
+        """
+        Open a cursor that fetches rows incrementally from the server.
+
+        Args:
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            cursor: A new cursor on the current connection.
+        """
+        if self.db_type == 'postgresql':
+            cursor = self.connection.cursor(name=f"dbunify_stream_{next(self._stream_ids)}")
+            cursor.itersize = chunk_size
+            return cursor
+        elif self.db_type == 'mysql':
+            from pymysql.cursors import SSCursor
+            return self.connection.cursor(SSCursor)
+        return self.connection.cursor()
+
+    def _iter_documents(self, table_name, columns, chunk_size):
+        """
+        Yield the documents of a MongoDB collection using a batched find cursor.
+
+        Args:
+            table_name (str): Name of the collection.
+            columns (list): Fields to project. All fields when None.
+            chunk_size (int): Number of documents fetched per batch.
+
+        Yields:
+            dict: One document.
+        """
+        projection = {column: 1 for column in columns} if columns else None
+        try:
+            cursor = self._collection(table_name).find({}, projection, batch_size=chunk_size)
+        except Exception as e:
+            raise RuntimeError(f"Error fetching data: {str(e)}")
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    @_pooled
+    def paginate(self, table_name, order_by, page_size, after=None, columns=None, where=None):
+        """
+        Read one page of a table with keyset (seek) pagination.
+
+        Instead of OFFSET, each page continues after the sort key of the previous page's last row, so with
+        an index on the order_by columns page 10,000 costs the same as page 1. The order_by columns must be
+        NOT NULL and unique together; end with a unique column (e.g. the id) to break ties.
+
+        Args:
+            table_name (str): Name of the table (or MongoDB collection).
+            order_by (str or list): Sort keys, e.g. 'id' or ['created DESC', 'id DESC'].
+            page_size (int): Maximum number of rows per page.
+            after (str): The 'next' token of the previous page. None for the first page.
+            columns (list): Columns (fields on MongoDB) to return. All columns when None.
+            where (str): Optional condition restricting the rows; a filter dict on MongoDB. Pass the same
+                value for every page.
+
+        Returns:
+            dict: 'rows', the page (tuples, or dicts on MongoDB), and 'next', the token of the following page
+            or None after the last page.
 
+        Raises:
+            ValueError: If order_by, page_size or the token is invalid.
+            RuntimeError: If there is an error fetching the page.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        keys = _order_keys(order_by)
+        values = _page_after(after, table_name, keys) if after is not None else None
+        if self.db_type == 'mongodb':
+            return self._paginate_documents(table_name, keys, page_size, values, columns, where)
         try:
-            if db_type == 'sqlite':
-                self.connection = sqlite3.connect(db_name)
-            elif db_type == 'mysql':
-                self.connection = pymysql.connect(database=db_name, **kwargs)
-            elif db_type == 'postgresql':
-                self.connection = psycopg2.connect(database=db_name, **kwargs)
-            elif db_type == 'mongodb':
-                self.connection = pymongo.MongoClient(**kwargs)
-            elif db_type == 'sqlserver':
-                self.connection = pyodbc.connect(**kwargs)
+            selected = list(columns) if columns else None
+            if selected is not None:
+                lowered = {column.lower() for column in selected}
+                selected += [column for column, _ in keys if column.lower() not in lowered]
+            conditions = [f"({where})"] if where else []
+            args = []
+            if values is not None:
+                # key1 >= v1 AND (key1 > v1 OR (key1 = v1 AND key2 > v2) OR ...); the redundant first bound
+                # lets the database seek on the leading index column.
+                placeholder = self.compiler.placeholder
+                first, first_descending = keys[0]
+                alternatives = []
+                for position, (column, descending) in enumerate(keys):
+                    equal = [f"{previous} = {placeholder}" for previous, _ in keys[:position]]
+                    alternatives.append(' AND '.join(equal + [f"{column} {'<' if descending else '>'} {placeholder}"]))
+                    args += values[:position] + [values[position]]
+                conditions.append(f"{first} {'<=' if first_descending else '>='} {placeholder} AND ({' OR '.join(f'({a})' for a in alternatives)})")
+                args.insert(0, values[0])
+            query = f"SELECT {', '.join(selected) if selected else '*'} FROM {table_name}"
+            if conditions:
+                query += f" WHERE {' AND '.join(conditions)}"
+            query += f" ORDER BY {', '.join(f'{column} DESC' if descending else column for column, descending in keys)}"
+            if self.db_type == 'sqlserver':
+                query += f" OFFSET 0 ROWS FETCH NEXT {page_size + 1} ROWS ONLY"
             else:
-                raise ValueError(f"Unsupported database type: {db_type}")
+                query += f" LIMIT {page_size + 1}"
+            rows = self.fetch_all(query, *args)
+            names = [description[0].lower() for description in self.cursor.description]
+            positions = [names.index(column.split('.')[-1].lower()) for column, _ in keys]
         except Exception as e:
-            raise ConnectionError(f"Error connecting to the database: {str(e)}")
+            raise RuntimeError(f"Error fetching page: {str(e)}")
+        token = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            token = _page_token(table_name, keys, [rows[-1][position] for position in positions])
+        if columns:
+            rows = [tuple(row[:len(columns)]) for row in rows]
+        return {'rows': list(rows), 'next': token}
+
+    def _paginate_documents(self, table_name, keys, page_size, values, columns, where):
+        """
+        paginate() for a MongoDB collection: sort plus an $or range filter on the sort keys.
+        """
+        filters = [where] if where else []
+        if values is not None:
+            alternatives = []
+            for position, (field, descending) in enumerate(keys):
+                alternative = {previous: values[index] for index, (previous, _) in enumerate(keys[:position])}
+                alternative[field] = {'$lt' if descending else '$gt': values[position]}
+                alternatives.append(alternative)
+            filters.append({'$or': alternatives})
+        query = filters[0] if len(filters) == 1 else ({'$and': filters} if filters else {})
+        projection = None
+        if columns:
+            projection = {column: 1 for column in columns}
+            projection.update({field: 1 for field, _ in keys})
+        try:
+            sort = [(field, -1 if descending else 1) for field, descending in keys]
+            documents = list(self._collection(table_name).find(query, projection, sort=sort, limit=page_size + 1))
+        except Exception as e:
+            raise RuntimeError(f"Error fetching page: {str(e)}")
+        token = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            last = []
+            for field, _ in keys:
+                value = documents[-1]
+                for part in field.split('.'):
+                    value = value[part]
+                last.append(value)
+            token = _page_token(table_name, keys, last)
+        if columns:
+            wanted = {column.split('.')[0] for column in columns} | {'_id'}
+            documents = [{name: value for name, value in document.items() if name in wanted} for document in documents]
+        return {'rows': documents, 'next': token}
+
+    @_pooled
+    def create_table(self, table_name, columns=None):
+        """
+        Create a table in the database. On MongoDB the collection is created if it does not exist.
+
+        Args:
+            table_name (str): Name of the table to be created.
+            columns (list): List of tuples containing column names and data types. Ignored on MongoDB.
+
+        Raises:
+            RuntimeError: If there is an error creating the table.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                database = self.connection[self.db_name]
+                if table_name not in database.list_collection_names():
+                    database.create_collection(table_name)
+                return
+            if not columns:
+                raise ValueError("columns are required to create a table")
+            if self.db_type == 'sqlite':
+                query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join([f'{col} {data_type}' for col, data_type in columns])})"
+            elif self.db_type in ['mysql', 'postgresql', 'sqlserver']:
+                query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join([f'{col} {data_type}' for col, data_type in columns])})"
+            else:
+                raise ValueError(f"Table creation not supported for {self.db_type}")
+            self.execute_query(query)
+        except Exception as e:
+            raise RuntimeError(f"Error creating table: {str(e)}")
+
+    @_pooled
+    def drop_table(self, table_name):
+        """
+        Drop a table from the database.
+
+        Args:
+            table_name (str): Name of the table to be dropped.
+
+        Raises:
+            RuntimeError: If there is an error dropping the table.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                self._document_write(table_name, lambda collection, session: collection.drop(session=session))
+                return
+            query = f"DROP TABLE IF EXISTS {table_name}"
+            self.execute_query(query)
+        except Exception as e:
+            raise RuntimeError(f"Error dropping table: {str(e)}")
+
+    @_pooled
+    def add_column(self, table_name, column_name, data_type):
+        """
+        Add a column to an existing table. On MongoDB the field is set to None on the documents that lack it.
+
+        Args:
+            table_name (str): Name of the table to add the column to.
+            column_name (str): Name of the column to be added.
+            data_type (str): Data type of the column. Ignored on MongoDB.
+
+        Raises:
+            RuntimeError: If there is an error adding the column.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                self._document_write(table_name, lambda collection, session: collection.update_many(
+                    {column_name: {'$exists': False}}, {'$set': {column_name: None}}, session=session))
+                return
+            query = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {data_type}"
+            self.execute_query(query)
+        except Exception as e:
+            raise RuntimeError(f"Error adding column: {str(e)}")
+
+    @_pooled
+    def insert_row(self, table_name, values):
+        """
+        Insert a row into the table.
+
+        Args:
+            table_name (str): Name of the table to insert the row into.
+            values (dict): Dictionary of column-value pairs for the row.
+
+        Raises:
+            RuntimeError: If there is an error inserting the row.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                # insert_one adds _id to the document it is given; keep the caller's dict untouched.
+                self._document_write(table_name, lambda collection, session: collection.insert_one(
+                    dict(values), session=session))
+                return
+            query = self.compiler.compile('insert', table_name, values.keys())
+            self.execute_query(query, *values.values())
+        except Exception as e:
+            raise RuntimeError(f"Error inserting row: {str(e)}")
+
+    @_pooled
+    def insert_rows(self, table_name, rows, batch_size=1000, columns=None, on_chunk=None):
+        """
+        Insert many rows into the table in batches.
+
+        Each batch is written with the fastest path the driver offers and committed as one transaction:
+        executemany on SQLite, executemany with fast_executemany on SQL Server, multi-row VALUES on MySQL,
+        execute_values on PostgreSQL and insert_many on MongoDB.
+
+        Args:
+            table_name (str): Name of the table to insert the rows into.
+            rows (iterable): Iterable or generator of dicts (column-value pairs) or tuples.
+            batch_size (int): Number of rows written per transaction.
+            columns (list): Column names. Required for tuple rows; taken from the first row for dicts.
+            on_chunk (callable): Optional callback called as on_chunk(chunk_index, rows_written) after each commit.
+
+        Returns:
+            list: Number of rows written by each chunk.
+
+        Raises:
+            RuntimeError: If there is an error inserting the rows.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        written = []
+        rows = iter(rows)
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, batch_size))
+                if not chunk:
+                    break
+                if columns is None:
+                    if not isinstance(chunk[0], dict):
+                        raise ValueError("columns must be given when rows are tuples")
+                    columns = list(chunk[0].keys())
+                if isinstance(chunk[0], dict):
+                    chunk = [tuple(row[col] for col in columns) for row in chunk]
+                self._insert_chunk(table_name, columns, chunk)
+                written.append(len(chunk))
+                if on_chunk is not None:
+                    on_chunk(len(written) - 1, len(chunk))
+            return written
+        except Exception as e:
+            raise RuntimeError(f"Error inserting rows: {str(e)}")
+
+    def _insert_chunk(self, table_name, columns, chunk):
+        """
+        Write one batch of tuples in a single transaction.
+
+        Args:
+            table_name (str): Name of the table to insert the rows into.
+            columns (list): Column names, in the order of the tuple values.
+            chunk (list): List of value tuples.
+        """
+        if self.db_type == 'mongodb':
+            documents = [dict(zip(columns, row)) for row in chunk]
+            self._document_write(table_name, lambda collection, session: collection.insert_many(
+                documents, ordered=False, session=session))
+            return
+
+        self._mark_written((_table_key(table_name),))
+        try:
+            if self.db_type == 'postgresql':
+                from psycopg2.extras import execute_values
+                query = self.compiler.compile('insert_values', table_name, columns)
+                run = lambda: execute_values(self.cursor, query, chunk, page_size=len(chunk))
+            else:
+                query = self.compiler.compile('insert', table_name, columns)
+                if self.db_type == 'sqlserver':
+                    self.cursor.fast_executemany = True
+                # pymysql rewrites an INSERT ... VALUES executemany into multi-row VALUES statements.
+                run = lambda: self.cursor.executemany(query, chunk)
+            if self._instrumented is None:
+                run()
+            else:
+                self._run_instrumented(query, len(chunk) * len(columns), run, lambda _: len(chunk))
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+
+    @_pooled
+    def delete_column(self, table_name, column_name):
+        """
+        Delete a column from the table.
+
+        Args:
+            table_name (str): Name of the table to delete the column from.
+            column_name (str): Name of the column to be deleted.
+
+        Raises:
+            RuntimeError: If there is an error deleting the column.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                self._document_write(table_name, lambda collection, session: collection.update_many(
+                    {column_name: {'$exists': True}}, {'$unset': {column_name: ''}}, session=session))
+                return
+            query = f"ALTER TABLE {table_name} DROP COLUMN {column_name}"
+            self.execute_query(query)
+        except Exception as e:
+            raise RuntimeError(f"Error deleting column: {str(e)}")
+
+    @_pooled
+    def delete_row(self, table_name, condition):
+        """
+        Delete a row from the table based on a condition. On MongoDB every matching document is deleted.
+
+        Args:
+            table_name (str): Name of the table to delete the row from.
+            condition (str): Condition for row deletion; a filter dict on MongoDB.
+
+        Raises:
+            RuntimeError: If there is an error deleting the row.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                self._document_write(table_name, lambda collection, session: collection.delete_many(
+                    condition, session=session))
+                return
+            query = f"DELETE FROM {table_name} WHERE {condition}"
+            self.execute_query(query)
+        except Exception as e:
+            raise RuntimeError(f"Error deleting row: {str(e)}")
+
+    @_pooled
+    def update_row(self, table_name, values, condition):
+        """
+        Update a row in the table based on a condition. On MongoDB every matching document is updated with $set.
+
+        Args:
+            table_name (str): Name of the table to update the row in.
+            values (dict): Dictionary of column-value pairs to be updated.
+            condition (str): Condition for row update; a filter dict on MongoDB.
+
+        Raises:
+            RuntimeError: If there is an error updating the row.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                self._document_write(table_name, lambda collection, session: collection.update_many(
+                    condition, {'$set': dict(values)}, session=session))
+                return
+            query = self.compiler.compile('update', table_name, values.keys(), condition)
+            self.execute_query(query, *values.values())
+        except Exception as e:
+            raise RuntimeError(f"Error updating row: {str(e)}")
+
+    @_pooled
+    def search_one(self, table_name, condition, columns=None):
+        """
+        Search for a single row in the table based on a condition.
+
+        Args:
+            table_name (str): Name of the table to search in.
+            condition (str): Condition for row search; a filter dict on MongoDB.
+            columns (list): Columns (fields on MongoDB) to return. All columns when None.
+
+        Returns:
+            tuple: A tuple representing the fetched row (a dict on MongoDB).
+
+        Raises:
+            RuntimeError: If there is an error searching for a row.
+        """
+        columns = tuple(columns) if columns else None
+        try:
+            if self.db_type == 'mongodb':
+                projection = {column: 1 for column in columns} if columns else None
+                return self._cached_documents(('search_one', table_name, _filter_key(condition), columns), table_name,
+                                              lambda: self._collection(table_name).find_one(condition, projection))
+            query = f"SELECT {', '.join(columns) if columns else '*'} FROM {table_name} WHERE {condition} LIMIT 1"
+            rows = self._cached_read(('search_one', table_name, condition, columns), (_table_key(table_name),),
+                                     lambda: tuple(self.fetch_all(query)))
+            if rows:
+                return rows[0]
+            return None
+        except Exception as e:
+            raise RuntimeError(f"Error searching for one row: {str(e)}")
+
+    @_pooled
+    def list_tables(self):
+        """
+        Get a list of all tables in the database.
+
+        Returns:
+            list: A list of table names.
+        
+        Raises:
+            RuntimeError: If there is an error listing tables.
+        """
+        try:
+            if self.db_type == 'mongodb':
+                return self.connection[self.db_name].list_collection_names()
+            elif self.db_type == 'mysql':
+                query = "SHOW TABLES"
+            elif self.db_type == 'postgresql':
+                query = "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema() AND table_type = 'BASE TABLE'"
+            elif self.db_type == 'sqlserver':
+                query = "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'"
+            else:
+                query = "SELECT name FROM sqlite_master WHERE type='table'"
+            self.cursor.execute(query)
+            tables = self.cursor.fetchall()
+            return [table[0] for table in tables]
+        except Exception as e:
+            raise RuntimeError(f"Error listing tables: {str(e)}")
+
+    @_pooled
+    def chart_data(self, table_name, x_name, y_name, chart_type='bar', bins=50, max_points=2000, aggregate='sum'):
+        """
+        Compute the data a chart needs, doing the heavy lifting in the database.
+
+        Histogram bins are counted with a SQL GROUP BY over a bucket expression, bar heights are computed
+        with a SQL aggregate per x value, and line/scatter series are streamed in x order and downsampled
+        to max_points with Largest-Triangle-Three-Buckets. The cost therefore depends on the size of the
+        picture, not on the number of rows.
+
+        Downsampled series are sorted by x and leave out rows whose y is NULL, so a line over a table that is
+        not stored in x order is drawn left to right rather than in row order. A y column that is not numeric
+        cannot be aggregated or downsampled: line and scatter series then return every row as stored, and
+        bars are counted per x value ('count') or plotted raw (any other aggregate).
+
+        Args:
+            table_name (str): Name of the database table to retrieve data from.
+            x_name (str): Name of the x-axis column.
+            y_name (str): Name of the y-axis column.
+            chart_type (str): 'bar', 'line', 'scatter' or 'histogram'.
+            bins (int): Number of histogram bins.
+            max_points (int): Maximum number of points of a line or scatter series.
+            aggregate (str): SQL aggregate for bar heights ('sum', 'avg', 'count', 'min', 'max'), or None for raw rows.
+
+        Returns:
+            dict: 'edges' and 'counts' for histograms, 'x' and 'y' otherwise (plus 'width' for grouped bars).
+
+        Raises:
+            RuntimeError: If there is an error computing the chart data.
+        """
+        try:
+            if chart_type == 'histogram':
+                return self._histogram_data(table_name, y_name, bins)
+            elif chart_type == 'bar':
+                if aggregate is None:
+                    data = self.fetch_columns(f"SELECT {x_name}, {y_name} FROM {table_name}")
+                    return {'x': data[x_name], 'y': data[y_name]}
+                if aggregate.lower() not in ['sum', 'avg', 'count', 'min', 'max']:
+                    raise ValueError(f"Unsupported aggregate: {aggregate}")
+                if aggregate.lower() != 'count' and self._numeric_range(table_name, y_name)[0] is None:
+                    # Text values cannot be summed or averaged; plot them as stored.
+                    data = self.fetch_columns(f"SELECT {x_name}, {y_name} FROM {table_name}")
+                    return {'x': data[x_name], 'y': data[y_name]}
+                return self._bar_data(table_name, x_name, y_name, aggregate.upper(), max_points)
+            elif chart_type in ['line', 'scatter']:
+                low, _, total = self._numeric_range(table_name, y_name)
+                if low is None:
+                    data = self.fetch_columns(f"SELECT {x_name}, {y_name} FROM {table_name}")
+                    return {'x': data[x_name], 'y': data[y_name]}
+                rows = self.iter_query(f"SELECT {x_name}, {y_name} FROM {table_name} WHERE {y_name} IS NOT NULL ORDER BY {x_name}")
+                points = ((_as_number(x, index), x, float(y)) for index, (x, y) in enumerate(rows))
+                selected = list(_lttb(points, total, max_points))
+                return {'x': [point[1] for point in selected], 'y': [point[2] for point in selected]}
+            raise ValueError("Type chart not found!")
+        except Exception as e:
+            raise RuntimeError(f"Error computing chart data: {str(e)}")
+
+    def _bucket_expression(self, column, buckets):
+        """
+        Build the SQL expression that maps a numeric column to an equal-width bucket number.
+
+        The expression takes three parameters: the upper bound, the lower bound and the bucket width.
+        Values equal to the upper bound go to the last bucket.
+
+        Args:
+            column (str): Name of the numeric column.
+            buckets (int): Number of buckets.
+
+        Returns:
+            str: The bucket expression.
+        """
+        placeholder = self.compiler.placeholder
+        offset = f"({column} - {placeholder}) / {placeholder}"
+        # SQLite may be built without FLOOR; the offset is never negative, so truncation is the same.
+        if self.db_type == 'sqlite':
+            bucket = f"CAST({offset} AS INTEGER)"
+        else:
+            bucket = f"FLOOR({offset})"
+        return f"CASE WHEN {column} >= {placeholder} THEN {buckets - 1} ELSE {bucket} END"
+
+    def _numeric_range(self, table_name, column):
+        """
+        Get the minimum, maximum and non-NULL count of a column.
+
+        Args:
+            table_name (str): Name of the table.
+            column (str): Name of the column.
 
-        self.cursor = self.connection.cursor()
+        Returns:
+            tuple: (min, max, count); min and max are None when the column is not numeric (or empty).
+        """
+        low, high, count = self.fetch_all(f"SELECT MIN({column}), MAX({column}), COUNT({column}) FROM {table_name}")[0]
+        # SQLite sorts text above numbers, so a column mixing both has a numeric MIN but a text MAX.
+        if not all(isinstance(value, (int, float, decimal.Decimal)) and not isinstance(value, bool) for value in (low, high)):
+            return None, None, count
+        return float(low), float(high), count
 
-    def set_password(self, password):
+    def _histogram_data(self, table_name, y_name, bins):
         """
-        Set a new password for the database user.
+        Count histogram bins with a SQL GROUP BY.
 
         Args:
-            password (str): The new password.
+            table_name (str): Name of the table.
+            y_name (str): Name of the column to bin.
+            bins (int): Number of equal-width bins.
 
-        Raises:
-            RuntimeError: If there is an error setting the password.
+        Returns:
+            dict: 'edges' (bins + 1 values) and 'counts' (bins values).
         """
-        if self.db_type == 'mysql':
-            try:
-                query = f"ALTER USER '{self.db_name}'@'localhost' IDENTIFIED BY '{password}';"
-                self.execute_query(query)
-            except Exception as e:
-                raise RuntimeError(f"Error setting password: {str(e)}")
-        elif self.db_type == 'postgresql':
-            try:
-                query = f"ALTER USER {self.db_name} WITH PASSWORD '{password}';"
-                self.execute_query(query)
-            except Exception as e:
-                raise RuntimeError(f"Error setting password: {str(e)}")
-        elif self.db_type == 'sqlserver':
-            try:
-                query = f"ALTER LOGIN {self.db_name} WITH PASSWORD = '{password}';"
-                self.execute_query(query)
-            except Exception as e:
-                raise RuntimeError(f"Error setting password: {str(e)}")
-            
-    def transaction(self):
+        low, high, count = self._numeric_range(table_name, y_name)
+        if not count:
+            return {'edges': [], 'counts': []}
+        if low is None:
+            raise ValueError(f"Histogram column {y_name} is not numeric")
+        width = (high - low) / bins if high > low else 1.0
+        query = (f"SELECT bucket, COUNT(*) FROM (SELECT {self._bucket_expression(y_name, bins)} AS bucket FROM {table_name} "
+                 f"WHERE {y_name} IS NOT NULL) buckets GROUP BY bucket")
+        counts = [0] * bins
+        for index, bucket_count in self.fetch_all(query, high, low, width):
+            counts[min(max(int(index), 0), bins - 1)] += bucket_count
+        return {'edges': [low + i * width for i in range(bins + 1)], 'counts': counts}
+
+    def _bar_data(self, table_name, x_name, y_name, aggregate, max_points):
         """
-        Start a database transaction.
+        Compute bar heights with a SQL aggregate per x value.
+
+        When a numeric x column has more distinct values than max_points, x is grouped into max_points
+        equal-width ranges instead, each bar labelled with the start of its range.
+
+        Args:
+            table_name (str): Name of the table.
+            x_name (str): Name of the x-axis column.
+            y_name (str): Name of the aggregated column.
+            aggregate (str): 'SUM', 'AVG', 'COUNT', 'MIN' or 'MAX'.
+            max_points (int): Maximum number of bars for a numeric x column.
 
         Returns:
-            transaction: A database transaction object.
+            dict: 'x' and 'y', plus 'width' when x was grouped into ranges.
+        """
+        low, high, _ = self._numeric_range(table_name, x_name)
+        if low is not None:
+            distinct = self.fetch_all(f"SELECT COUNT(DISTINCT {x_name}) FROM {table_name}")[0][0]
+            if distinct > max_points:
+                width = (high - low) / max_points
+                data = self.fetch_columns(f"SELECT bucket, {aggregate}(y) AS y FROM (SELECT {self._bucket_expression(x_name, max_points)} AS bucket, "
+                                          f"{y_name} AS y FROM {table_name} WHERE {x_name} IS NOT NULL) buckets "
+                                          f"GROUP BY bucket ORDER BY bucket", high, low, width)
+                edges = [low + int(bucket) * width for bucket in data['bucket']]
+                return {'x': edges, 'y': data['y'], 'width': width}
+        data = self.fetch_columns(f"SELECT {x_name} AS x, {aggregate}({y_name}) AS y FROM {table_name} "
+                                  f"GROUP BY {x_name} ORDER BY {x_name}")
+        return {'x': data['x'], 'y': data['y']}
 
-        Raises:
-            RuntimeError: If there is an error starting the transaction.
+    @staticmethod
+    def _draw_chart(ax, chart_type, data):
         """
-        if self.db_type == 'sqlite':
-            try:
-                self.connection.isolation_level = None  
-                transaction = self.connection.cursor()
-                return transaction
-            except Exception as e:
-                raise RuntimeError(f"Error starting transaction: {str(e)}")
+        Draw chart data produced by chart_data on a matplotlib Axes.
+
+        Args:
+            ax (Axes): The axes to draw on.
+            chart_type (str): 'bar', 'line', 'scatter' or 'histogram'.
+            data (dict): The output of chart_data.
+        """
+        if chart_type == 'bar':
+            if 'width' in data:
+                # Bars of grouped x ranges start at the range's lower edge.
+                ax.bar(data['x'], data['y'], width=data['width'], align='edge')
+            else:
+                ax.bar(data['x'], data['y'])
+        elif chart_type == 'line':
+            ax.plot(data['x'], data['y'], marker='o', linestyle='-')
+        elif chart_type == 'scatter':
+            ax.scatter(data['x'], data['y'])
+        elif chart_type == 'histogram':
+            if data['counts']:
+                ax.hist(data['edges'][:-1], bins=data['edges'], weights=data['counts'], edgecolor='k')
         else:
-            raise ValueError(f"Transaction management not supported for {self.db_type}")
+            raise RuntimeError(f"Error, Type chart not found!")
 
-    def backup_database(self, backup_path):
+    @staticmethod
+    def _save_chart(chart_type, data, x_label, y_label, title, save_path):
         """
-        Create a backup of the database.
+        Render chart data on a standalone Figure and save it as an image.
+
+        Args:
+            chart_type (str): 'bar', 'line', 'scatter' or 'histogram'.
+            data (dict): The output of chart_data.
+            x_label (str): Label for the x-axis.
+            y_label (str): Label for the y-axis.
+            title (str): Title of the chart.
+            save_path (str): Path to save the chart image.
+        """
+        figure = _figure_class()(figsize=(8, 6))
+        ax = figure.subplots()
+        DatabaseManager._draw_chart(ax, chart_type, data)
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+        ax.set_title(title)
+        figure.savefig(save_path)
+
+    def _chart_table_report(self, table_name, output_directory, chart_type, x_label, y_label, chart_options):
+        """
+        Render the chart of one table for create_chart_database.
+
+        Only the first two columns are selected. Errors are captured in the report instead of raised.
 
         Args:
-            backup_path (str): The path where the backup should be stored.
+            table_name (str): Name of the table.
+            output_directory (str): The directory where the chart image is saved.
+            chart_type (str): The type of chart to create.
+            x_label (str): Label for the x-axis.
+            y_label (str): Label for the y-axis.
+            chart_options (dict): bins, max_points and aggregate for chart_data.
 
         Returns:
-            bool: True if the backup was successful, False otherwise.
-
-        Raises:
-            RuntimeError: If there is an error creating the database backup.
+            dict: 'path', 'seconds' and 'error' (None on success).
         """
-        if self.db_type == 'sqlite':
-            try:
-                import shutil
-                shutil.copyfile(self.db_name, backup_path)
-                return True
-            except Exception as e:
-                raise RuntimeError(f"Error creating database backup: {str(e)}")
-        elif self.db_type == 'mongodb':
-            try:
-                self.connection.admin.command('copydb', fromdb=self.db_name, todb=backup_path)
-                return True
-            except Exception as e:
-                raise RuntimeError(f"Error creating database backup: {str(e)}")
-        else:
-            raise ValueError(f"Database backup not supported for {self.db_type}")
+        start = time.perf_counter()
+        chart_filename = os.path.join(output_directory, f'{table_name}_{chart_type}_chart.png')
+        try:
+            x_name, y_name = self._table_columns(table_name)[:2]
+            data = self.chart_data(table_name, x_name, y_name, chart_type, **chart_options)
+            if 'x' in data and not all(isinstance(x, (numbers.Number, datetime.date)) for x in data['x']):
+                # Mixed or textual x values are plotted as categories.
+                data['x'] = [str(x) for x in data['x']]
+            self._save_chart(chart_type, data, x_label, y_label, f'{chart_type.capitalize()} Chart for Table: {table_name}', chart_filename)
+            return {'path': chart_filename, 'seconds': time.perf_counter() - start, 'error': None}
+        except Exception as e:
+            return {'path': None, 'seconds': time.perf_counter() - start, 'error': str(e)}
 
-    def restore_database(self, backup_path):
+    def create_chart_database(self, output_directory, chart_type='bar', x_label='X Axis Label', y_label='Y Axis Label',
+                              bins=50, max_points=2000, aggregate='sum', workers=None):
         """
-        Restore the database from a backup.
+        Create charts for all tables in the database and save them as images.
+
+        The first two columns of each table are plotted. Data is prepared by chart_data. With workers, tables
+        are rendered in a process pool where each worker opens its own connection. A table that fails is
+        reported and does not stop the others.
 
         Args:
-            backup_path (str): The path to the backup file.
+            output_directory (str): The directory where chart images will be saved.
+            chart_type (str): The type of chart to create ('bar', 'line', 'scatter', etc.).
+            x_label (str): Label for the x-axis.
+            y_label (str): Label for the y-axis.
+            bins (int): Number of histogram bins.
+            max_points (int): Maximum number of points of a line or scatter chart.
+            aggregate (str): SQL aggregate for bar heights, or None to plot every row.
+            workers (int): Number of worker processes. None renders in this process.
 
         Returns:
-            bool: True if the restore was successful, False otherwise.
+            dict: Table name to a report with 'path', 'seconds' and 'error' (None on success).
 
         Raises:
-            RuntimeError: If there is an error restoring the database.
+            RuntimeError: If there is an error listing the tables or starting the workers.
         """
-        if self.db_type == 'sqlite':
-            try:
-                import shutil
-                shutil.copyfile(backup_path, self.db_name)
-                return True
-            except Exception as e:
-                raise RuntimeError(f"Error restoring database: {str(e)}")
-        elif self.db_type == 'mongodb':
-            try:
-                self.connection.admin.command('copydb', fromdb=backup_path, todb=self.db_name)
-                return True
-            except Exception as e:
-                raise RuntimeError(f"Error restoring database: {str(e)}")
-        else:
-            raise ValueError(f"Database restore not supported for {self.db_type}")
+        try:
+            os.makedirs(output_directory, exist_ok=True)
+            tables = self.list_tables()
+            chart_args = (output_directory, chart_type, x_label, y_label,
+                          {'bins': bins, 'max_points': max_points, 'aggregate': aggregate})
 
-    def execute_query(self, query, *args):
+            # An in-memory SQLite database cannot be opened by another process.
+            if not workers or workers <= 1 or (self.db_type == 'sqlite' and self.db_name == ':memory:'):
+                return {table_name: self._chart_table_report(table_name, *chart_args) for table_name in tables}
+
+            from concurrent.futures import ProcessPoolExecutor
+            clone_args = (self.db_type, self.db_name, self._options, self._connect_kwargs)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_chart_worker_init, initargs=(clone_args,)) as executor:
+                futures = {table_name: executor.submit(_chart_worker_render, table_name, chart_args) for table_name in tables}
+                report = {}
+                for table_name, future in futures.items():
+                    try:
+                        report[table_name] = future.result()
+                    except Exception as e:
+                        report[table_name] = {'path': None, 'seconds': None, 'error': str(e)}
+                return report
+        except Exception as e:
+            raise RuntimeError(f"Error creating charts: {str(e)}")
+
+    @_pooled
+    def create_chart_table(self, table_name, x_column, y_column, x_label='X Axis Label', y_label='Y Axis Label', title='Chart Title', save_path='chart.png', chart_type='bar',
+                           bins=50, max_points=2000, aggregate='sum'):
         """
-        Execute a database query.
+        Create a chart from data in the database and save it as an image.
+
+        Data is prepared by chart_data, so histograms and bar totals are computed in the database and
+        line/scatter series are downsampled to max_points.
 
         Args:
-            query (str): The SQL query to be executed.
-            *args: Parameters to be passed to the query.
+            table_name (str): Name of the database table to retrieve data from.
+            x_column (int): Index of the x-axis column in the retrieved data.
+            y_column (int): Index of the y-axis column in the retrieved data.
+            x_label (str): Label for the x-axis.
+            y_label (str): Label for the y-axis.
+            title (str): Title of the chart.
+            save_path (str): Path to save the chart image.
+            chart_type (str): The type of chart to create ('bar', 'line', 'scatter', etc.).
+            bins (int): Number of histogram bins.
+            max_points (int): Maximum number of points of a line or scatter chart.
+            aggregate (str): SQL aggregate for bar heights, or None to plot every row.
 
         Raises:
-            RuntimeError: If there is an error executing the query.
+            RuntimeError: If there is an error creating the chart or saving it as an image.
         """
         try:
-            self.cursor.execute(query, args)
-            self.connection.commit()
+            columns = self._table_columns(table_name)
+            x_name, y_name = columns[x_column], columns[y_column]
+            data = self.chart_data(table_name, x_name, y_name, chart_type, bins=bins, max_points=max_points, aggregate=aggregate)
+            self._save_chart(chart_type, data, x_label, y_label, title, save_path)
         except Exception as e:
-            self.connection.rollback()
-            raise RuntimeError(f"Error executing query: {str(e)}")
+            raise RuntimeError(f"Error creating chart: {str(e)}")
 
-    def fetch_all(self, query, *args):
+    @_pooled
+    def search_all(self, table_name, columns=None, batch_size=1000):
         """
-        Execute a query and fetch all results.
+        Search for all rows in the table.
 
         Args:
-            query (str): The SQL query to be executed.
-            *args: Parameters to be passed to the query.
+            table_name (str): Name of the table to search in.
+            columns (list): Columns (fields on MongoDB) to return. All columns when None.
+            batch_size (int): Documents fetched per round trip on MongoDB.
 
         Returns:
-            list: List of fetched rows.
+            list: List of tuples representing the fetched rows (dicts on MongoDB).
 
         Raises:
-            RuntimeError: If there is an error fetching data.
+            RuntimeError: If there is an error searching for rows.
         """
+        columns = tuple(columns) if columns else None
         try:
-            self.cursor.execute(query, args)
-            return self.cursor.fetchall()
+            if self.db_type == 'mongodb':
+                return self._cached_documents(('search_all', table_name, columns), table_name,
+                                              lambda: list(self._iter_documents(table_name, columns, batch_size)))
+            query = f"SELECT {', '.join(columns) if columns else '*'} FROM {table_name}"
+            return list(self._cached_read(('search_all', table_name, columns), (_table_key(table_name),),
+                                          lambda: tuple(self.fetch_all(query))))
         except Exception as e:
-            raise RuntimeError(f"Error fetching data: {str(e)}")
-
-    def create_table(self, table_name, columns):
+            raise RuntimeError(f"Error searching for all rows: {str(e)}")
+        
+    @_pooled
+    def export_data_csv(self, table_name, csv_file_path, columns=None, where=None, compression=None, chunk_size=1000):
         """
-        Create a table in the database.
+        Export data from a table to a CSV file.
+
+        Rows are streamed from the database in chunks and written as they arrive, so peak memory is one chunk.
 
         Args:
-            table_name (str): Name of the table to be created.
-            columns (list): List of tuples containing column names and data types.
+            table_name (str): The name of the table to export data from.
+            csv_file_path (str): The path to save the exported CSV file.
+            columns (list): Columns to export. All columns when None.
+            where (str): Optional condition to filter the exported rows.
+            compression (str): None, 'gzip' or 'zstd' (requires the zstandard package).
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            dict: rows, bytes (size of the written file), seconds, rows_per_sec and bytes_per_sec.
 
         Raises:
-            RuntimeError: If there is an error creating the table.
+            Exception: If there is an error during data export.
         """
         try:
-            if self.db_type == 'sqlite':
-                query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join([f'{col} {data_type}' for col, data_type in columns])})"
-            elif self.db_type in ['mysql', 'postgresql', 'sqlserver']:
-                query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join([f'{col} {data_type}' for col, data_type in columns])})"
-            else:
-                raise ValueError(f"Table creation not supported for {self.db_type}")
-            self.execute_query(query)
+            start = time.perf_counter()
+            column_list = ', '.join(columns) if columns else '*'
+            query = f"SELECT {column_list} FROM {table_name}"
+            if where:
+                query += f" WHERE {where}"
+            header = []
+            row_count = 0
+            opened = header_written = False
+            with _open_text(csv_file_path, 'w', compression) as csv_file:
+                opened = True
+                csv_writer = csv.writer(csv_file)
+                for rows in self._iter_chunks(query, (), chunk_size, columns_out=header):
+                    if not header_written:
+                        csv_writer.writerow(header)
+                        header_written = True
+                    csv_writer.writerows(rows)
+                    row_count += len(rows)
+                if not header_written:
+                    csv_writer.writerow(header)
+                    header_written = True
+            return _throughput(row_count, os.path.getsize(csv_file_path), time.perf_counter() - start)
         except Exception as e:
-            raise RuntimeError(f"Error creating table: {str(e)}")
+            if opened and not header_written:
+                # Do not leave an empty file behind when the query itself failed.
+                os.remove(csv_file_path)
+            raise Exception(f"Error exporting data: {str(e)}")
 
-    def drop_table(self, table_name):
+    def export_database_csv(self, output_dir, workers=4, tables=None, **export_options):
         """
-        Drop a table from the database.
+        Export many tables to CSV files concurrently, each on its own connection.
+
+        Files are named <table>.csv (plus .gz / .zst when compressed). A table that fails to export is
+        reported in 'errors' and does not stop the others.
 
         Args:
-            table_name (str): Name of the table to be dropped.
+            output_dir (str): Directory where the CSV files are written.
+            workers (int): Number of tables exported at the same time. An in-memory SQLite database is
+                exported with one worker.
+            tables (list): Tables to export. All tables when None.
+            **export_options: columns, where, compression and chunk_size, passed to export_data_csv.
+
+        Returns:
+            dict: Per-table reports under 'tables', failed tables under 'errors', and overall
+            rows, bytes, seconds, rows_per_sec and bytes_per_sec.
 
         Raises:
-            RuntimeError: If there is an error dropping the table.
+            Exception: If there is an error listing the tables.
         """
+        from concurrent.futures import ThreadPoolExecutor
+
+        start = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+        if tables is None:
+            tables = self.list_tables()
+        suffix = '.csv' + _COMPRESSION_SUFFIXES.get(export_options.get('compression'), '')
+        # An in-memory SQLite database cannot be opened by another connection.
+        if self.db_type == 'sqlite' and self.db_name == ':memory:':
+            workers = 1
+        # Pooled managers already hand each thread its own connection; otherwise each worker opens one.
+        local = threading.local()
+        clones = []
+        clones_lock = threading.Lock()
+
+        def manager():
+            if self.pool is not None or workers <= 1:
+                return self
+            if not hasattr(local, 'manager'):
+                local.manager = self._clone()
+                with clones_lock:
+                    clones.append(local.manager)
+            return local.manager
+
+        def export(table_name):
+            return manager().export_data_csv(table_name, os.path.join(output_dir, table_name + suffix), **export_options)
+
+        report = {'tables': {}, 'errors': {}}
         try:
-            query = f"DROP TABLE IF EXISTS {table_name}"
-            self.execute_query(query)
-        except Exception as e:
-            raise RuntimeError(f"Error dropping table: {str(e)}")
+            if self.pool is None and workers <= 1:
+                # The manager's own connection may only be used from the thread that opened it.
+                for table_name in tables:
+                    try:
+                        report['tables'][table_name] = export(table_name)
+                    except Exception as e:
+                        report['errors'][table_name] = str(e)
+            else:
+                with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                    futures = {table_name: executor.submit(export, table_name) for table_name in tables}
+                    for table_name, future in futures.items():
+                        try:
+                            report['tables'][table_name] = future.result()
+                        except Exception as e:
+                            report['errors'][table_name] = str(e)
+        finally:
+            for clone in clones:
+                try:
+                    clone.close()
+                except Exception:
+                    pass
+        rows = sum(table['rows'] for table in report['tables'].values())
+        nbytes = sum(table['bytes'] for table in report['tables'].values())
+        report.update(_throughput(rows, nbytes, time.perf_counter() - start))
+        return report
 
-    def add_column(self, table_name, column_name, data_type):
+    @_pooled
+    def import_data_csv(self, table_name, csv_file_path, columns=None, create_table=True, infer_types=True,
+                        sample_size=1000, batch_size=10000, delimiter=',', compression=None, relaxed_sync=True,
+                        on_chunk=None):
         """
-        Add a column to an existing table.
+        Stream a CSV file into a table in large batched transactions.
+
+        Rows are read lazily, so memory stays at one batch. Each batch is written with the backend's bulk
+        path and committed as one transaction: COPY FROM STDIN on PostgreSQL, LOAD DATA LOCAL INFILE on MySQL
+        when the manager was created with local_infile=True, and the insert_rows path (executemany, multi-row
+        VALUES) otherwise. Empty fields are stored as NULL.
 
         Args:
-            table_name (str): Name of the table to add the column to.
-            column_name (str): Name of the column to be added.
-            data_type (str): Data type of the column.
+            table_name (str): The name of the table to import into.
+            csv_file_path (str): Path of the CSV file.
+            columns (list): Column names. When None they are read from the header row; when given, the file
+                is taken to have no header row.
+            create_table (bool): Create the table when it does not exist.
+            infer_types (bool): Choose integer, floating point or text column types for a created table from the
+                first sample_size rows. Every column is text otherwise.
+            sample_size (int): Number of rows sampled for type inference.
+            batch_size (int): Number of rows written per transaction.
+            delimiter (str): Field delimiter.
+            compression (str): None, 'gzip' or 'zstd' for compressed input.
+            relaxed_sync (bool): On SQLite, run the load with PRAGMA synchronous=OFF and restore the previous
+                setting afterwards. Skipped inside a transaction block.
+            on_chunk (callable): Optional callback called as on_chunk(chunk_index, rows_written) after each commit.
+
+        Returns:
+            dict: rows, bytes (size of the read file), seconds, rows_per_sec and bytes_per_sec.
 
         Raises:
-            RuntimeError: If there is an error adding the column.
+            RuntimeError: If there is an error reading the file or storing the rows.
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        start = time.perf_counter()
+        synchronous = None
+        row_count = 0
         try:
-            query = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {data_type}"
-            self.execute_query(query)
+            with _open_text(csv_file_path, 'r', compression) as csv_file:
+                reader = csv.reader(csv_file, delimiter=delimiter)
+                if columns is None:
+                    columns = next(reader, None)
+                    if not columns:
+                        raise ValueError("the CSV file has no header row")
+                columns = [column.strip().lstrip('\ufeff') for column in columns]
+                rows = (tuple(value if value != '' else None for value in row) for row in reader if row)
+                if create_table and self.db_type != 'mongodb' and table_name not in self.list_tables():
+                    sample = list(itertools.islice(rows, sample_size)) if infer_types else []
+                    rows = itertools.chain(sample, rows)
+                    column_types = [_infer_csv_type((row[i] for row in sample if i < len(row)), self.db_type)
+                                    for i in range(len(columns))]
+                    self.create_table(table_name, list(zip(columns, column_types)))
+                if relaxed_sync and self.db_type == 'sqlite' and not self._state.tx_depth:
+                    synchronous = self.cursor.execute("PRAGMA synchronous").fetchone()[0]
+                    self.cursor.execute("PRAGMA synchronous = OFF")
+                for index in itertools.count():
+                    chunk = list(itertools.islice(rows, batch_size))
+                    if not chunk:
+                        break
+                    self._load_chunk(table_name, columns, chunk)
+                    row_count += len(chunk)
+                    if on_chunk is not None:
+                        on_chunk(index, len(chunk))
+            return _throughput(row_count, os.path.getsize(csv_file_path), time.perf_counter() - start)
         except Exception as e:
-            raise RuntimeError(f"Error adding column: {str(e)}")
+            raise RuntimeError(f"Error importing CSV data: {str(e)}")
+        finally:
+            if synchronous is not None:
+                self.cursor.execute(f"PRAGMA synchronous = {int(synchronous)}")
 
-    def insert_row(self, table_name, values):
+    def _load_chunk(self, table_name, columns, chunk):
         """
-        Insert a row into the table.
+        Write one batch of CSV rows with the backend's bulk-load statement, in a single transaction.
 
         Args:
-            table_name (str): Name of the table to insert the row into.
-            values (dict): Dictionary of column-value pairs for the row.
+            table_name (str): Name of the table to load the rows into.
+            columns (list): Column names, in the order of the tuple values.
+            chunk (list): List of tuples of strings (None for NULL).
+        """
+        if self.db_type == 'postgresql':
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(chunk)
+            buffer.seek(0)
+            query = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+            run = lambda: self.cursor.copy_expert(query, buffer)
+        elif self.db_type == 'mysql' and self._connect_kwargs.get('local_infile'):
+            # With ESCAPED BY '' an unquoted NULL is read as NULL, and every real value is quoted.
+            quote = lambda value: 'NULL' if value is None else '"' + value.replace('"', '""') + '"'
+            fd, path = tempfile.mkstemp(suffix='.csv')
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(','.join(map(quote, row)) + '\n' for row in chunk)
+            query = (f"LOAD DATA LOCAL INFILE %s INTO TABLE {table_name} CHARACTER SET utf8mb4 "
+                     f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                     f"LINES TERMINATED BY '\\n' ({', '.join(columns)})")
+            run = lambda: self.cursor.execute(query, (path,))
+        else:
+            self._insert_chunk(table_name, columns, chunk)
+            return
 
-        Raises:
-            RuntimeError: If there is an error inserting the row.
+        self._mark_written((_table_key(table_name),))
+        try:
+            if self._instrumented is None:
+                run()
+            else:
+                self._run_instrumented(query, 0, run, lambda _: len(chunk))
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        finally:
+            if self.db_type == 'mysql':
+                os.remove(path)
+
+    @_pooled
+    def create_json_table(self, table_name):
+        """
+        Create a table to store JSON data.
+
+        Documents are stored as TEXT on SQLite (queried with JSON1), JSONB on PostgreSQL and JSON on MySQL.
+
+        Args:
+            table_name (str): The name of the table.
         """
         try:
-            columns = ', '.join(values.keys())
-            placeholders = ', '.join(['?' for _ in values])
-            query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-            self.execute_query(query, *values.values())
+            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
+                json_type = {'postgresql': 'JSONB', 'mysql': 'JSON'}.get(self.db_type, 'TEXT')
+                query = f"CREATE TABLE IF NOT EXISTS {table_name} ({self._id_column()}, json_data {json_type})"
+                self.cursor.execute(query)
+                self._commit()
+            else:
+                raise NotImplementedError(f"JSON tables are not supported for {self.db_type}")
         except Exception as e:
-            raise RuntimeError(f"Error inserting row: {str(e)}")
+            self._rollback()
+            raise e
 
-    def delete_column(self, table_name, column_name):
+    def _id_column(self):
         """
-        Delete a column from the table.
+        Get the definition of an auto-incrementing integer id primary key for the backend.
 
-        Args:
-            table_name (str): Name of the table to delete the column from.
-            column_name (str): Name of the column to be deleted.
+        Returns:
+            str: The column definition.
+        """
+        if self.db_type == 'postgresql':
+            return "id SERIAL PRIMARY KEY"
+        elif self.db_type == 'mysql':
+            return "id INTEGER AUTO_INCREMENT PRIMARY KEY"
+        elif self.db_type == 'sqlserver':
+            return "id INT IDENTITY(1,1) PRIMARY KEY"
+        return "id INTEGER PRIMARY KEY"
 
-        Raises:
-            RuntimeError: If there is an error deleting the column.
+    @_pooled
+    def create_xml_table(self, table_name):
+        """
+        Create a table to store XML data.
+
+        Args:
+            table_name (str): The name of the table.
         """
         try:
-            query = f"ALTER TABLE {table_name} DROP COLUMN {column_name}"
-            self.execute_query(query)
+            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
+                query = f"CREATE TABLE IF NOT EXISTS {table_name} ({self._id_column()}, xml_data TEXT)"
+                self.cursor.execute(query)
+                self._commit()
+            else:
+                raise NotImplementedError(f"XML tables are not supported for {self.db_type}")
         except Exception as e:
-            raise RuntimeError(f"Error deleting column: {str(e)}")
+            self._rollback()
+            raise e
 
-    def delete_row(self, table_name, condition):
+    @_pooled
+    def insert_json_data(self, table_name, json_data):
         """
-        Delete a row from the table based on a condition.
+        Insert JSON data into a JSON table. On MongoDB the data is inserted as a document.
 
         Args:
-            table_name (str): Name of the table to delete the row from.
-            condition (str): Condition for row deletion.
+            table_name (str): The name of the JSON table.
+            json_data (dict): The JSON data to insert.
 
-        Raises:
-            RuntimeError: If there is an error deleting the row.
+        Returns:
+            The _id of the new document on MongoDB, else None.
         """
+        if self.db_type == 'mongodb':
+            return self._document_write(table_name, lambda collection, session: collection.insert_one(
+                dict(json_data), session=session)).inserted_id
         try:
-            query = f"DELETE FROM {table_name} WHERE {condition}"
-            self.execute_query(query)
+            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
+                json_str = self._json.dumps(json_data)
+                self._mark_written((_table_key(table_name),))
+                query = self.compiler.compile('insert', table_name, ('json_data',))
+                self.cursor.execute(query, (json_str,))
+                self._commit()
+            else:
+                raise NotImplementedError(f"JSON data insertion is not supported for {self.db_type}")
+        except Exception as e:
+            self._rollback()
+            raise e
+
+    @_pooled
+    def insert_xml_data(self, table_name, xml_data):
+        """
+        Insert XML data into an XML table.
+
+        Args:
+            table_name (str): The name of the XML table.
+            xml_data (str): The XML data to insert as a string.
+        """
+        try:
+            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
+                self._mark_written((_table_key(table_name),))
+                query = self.compiler.compile('insert', table_name, ('xml_data',))
+                self.cursor.execute(query, (xml_data,))
+                self._commit()
+            else:
+                raise NotImplementedError(f"XML data insertion is not supported for {self.db_type}")
         except Exception as e:
-            raise RuntimeError(f"Error deleting row: {str(e)}")
+            self._rollback()
+            raise e
 
-    def update_row(self, table_name, values, condition):
+    def _fetch_one(self, query, *args):
         """
-        Update a row in the table based on a condition.
+        Execute a query and fetch its first row.
 
         Args:
-            table_name (str): Name of the table to update the row in.
-            values (dict): Dictionary of column-value pairs to be updated.
-            condition (str): Condition for row update.
+            query (str): The SQL query to be executed.
+            *args: Parameters to be passed to the query.
 
-        Raises:
-            RuntimeError: If there is an error updating the row.
+        Returns:
+            tuple: The first row, or None.
         """
-        try:
-            set_clause = ', '.join([f"{key} = ?" for key in values])
-            query = f"UPDATE {table_name} SET {set_clause} WHERE {condition}"
-            self.execute_query(query, *values.values())
-        except Exception as e:
-            raise RuntimeError(f"Error updating row: {str(e)}")
+        if self._instrumented is None:
+            self.cursor.execute(query, args)
+            return self.cursor.fetchone()
+        return self._run_instrumented(query, len(args), lambda: self._execute_fetch(query, args, 'fetchone'),
+                                      lambda row: 0 if row is None else 1)
 
-    def search_one(self, table_name, condition):
+    def _execute_fetch(self, query, args, fetch):
         """
-        Search for a single row in the table based on a condition.
+        Execute a query and fetch its result with the named cursor method ('fetchall' or 'fetchone').
+        """
+        self.cursor.execute(query, args)
+        return getattr(self.cursor, fetch)()
+
+    @_pooled
+    def import_xml(self, table_name, file_path, record_tag, extract=None, batch_size=1000, index=True,
+                   compression=None, on_chunk=None):
+        """
+        Stream records from an XML file into an XML table, materializing XPath values as indexed columns.
+
+        The file is read with iterparse and every record element is detached from the tree once it has
+        been stored, so memory stays flat for files of any size. Records are written in batches through
+        insert_rows. The table is created (like create_xml_table) when missing, and missing extract
+        columns are added. Records are stored with the namespace prefixes declared in the file, which are
+        registered with ElementTree (ET.register_namespace) for the whole process.
 
         Args:
-            table_name (str): Name of the table to search in.
-            condition (str): Condition for row search.
+            table_name (str): The name of the XML table.
+            file_path (str): Path of the XML file.
+            record_tag (str): Tag of the record elements. A tag without a '{namespace}' matches any namespace.
+            extract (dict): Column name -> ElementTree XPath relative to the record, e.g. 'title', 'author/name',
+                '@id' or 'price/@currency'. Tag names without a '{namespace}' match any namespace. A value may
+                also be an (xpath, sql_type) tuple; INT/REAL-like types convert the text to numbers. Other
+                columns are TEXT (VARCHAR(255) on MySQL).
+            batch_size (int): Number of records written per transaction.
+            index (bool): Create an index on every extract column.
+            compression (str): None, 'gzip' or 'zstd' for compressed input.
+            on_chunk (callable): Optional callback called as on_chunk(chunk_index, rows_written) after each commit.
 
         Returns:
-            tuple: A tuple representing the fetched row.
+            int: Number of records imported.
 
         Raises:
-            RuntimeError: If there is an error searching for a row.
+            RuntimeError: If there is an error parsing the file or storing the records.
         """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql']:
+            raise NotImplementedError(f"XML tables are not supported for {self.db_type}")
+        fields = []
+        for column, spec in (extract or {}).items():
+            xpath, sql_type = spec if isinstance(spec, tuple) else (spec, None)
+            sql_type = sql_type or ('VARCHAR(255)' if self.db_type == 'mysql' else 'TEXT')
+            fields.append((column, sql_type, _xml_extractor(xpath, sql_type)))
         try:
-            query = f"SELECT * FROM {table_name} WHERE {condition} LIMIT 1"
-            rows = self.fetch_all(query)
-            if rows:
-                return rows[0]
-            return None
+            if table_name not in self.list_tables():
+                self.create_xml_table(table_name)
+            existing = {name.lower() for name in self._table_columns(table_name)}
+            for column, sql_type, _ in fields:
+                if column.lower() not in existing:
+                    self.add_column(table_name, column, sql_type)
+            if index:
+                for column, _, _ in fields:
+                    self._create_index_if_missing(f"ix_{table_name}_{column}", table_name, column)
+            with _open_binary(file_path, 'r', compression) as f:
+                rows = _iter_xml_records(f, record_tag, [extractor for _, _, extractor in fields])
+                written = self.insert_rows(table_name, rows, batch_size=batch_size,
+                                           columns=['xml_data'] + [column for column, _, _ in fields], on_chunk=on_chunk)
+            return sum(written)
         except Exception as e:
-            raise RuntimeError(f"Error searching for one row: {str(e)}")
+            raise RuntimeError(f"Error importing XML data: {str(e)}")
 
-    def list_tables(self):
+    def _create_index_if_missing(self, index_name, table_name, columns, unique=False):
+        """
+        Create an index unless one with the same name exists.
+
+        Args:
+            index_name (str): Name of the index.
+            table_name (str): Name of the table.
+            columns (str): Indexed column list or expression.
+            unique (bool): Create a unique index.
+        """
+        create = f"CREATE {'UNIQUE ' if unique else ''}INDEX"
+        if self.db_type == 'mysql':
+            # MySQL has no CREATE INDEX IF NOT EXISTS.
+            if self.fetch_all(f"SHOW INDEX FROM {table_name} WHERE Key_name = %s", index_name):
+                return
+            self.execute_query(f"{create} {index_name} ON {table_name} ({columns})")
+        elif self.db_type == 'sqlserver':
+            self.execute_query(f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = ? AND object_id = OBJECT_ID(?)) "
+                               f"{create} {index_name} ON {table_name} ({columns})", index_name, table_name)
+        else:
+            self.execute_query(f"{create} IF NOT EXISTS {index_name} ON {table_name} ({columns})")
+
+    @_pooled
+    def create_index(self, table_name, columns, index_name=None, unique=False):
         """
-        Get a list of all tables in the SQLite database.
+        Create an index on one or more columns, unless an index with the same name exists.
+
+        Args:
+            table_name (str): Name of the table.
+            columns (str or list): Column name, or column names in index order.
+            index_name (str): Name of the index. Defaults to ix_<table>_<columns>.
+            unique (bool): Create a unique index.
 
         Returns:
-            list: A list of table names.
-        
+            str: The index name.
+
         Raises:
-            RuntimeError: If there is an error listing tables.
+            RuntimeError: If there is an error creating the index.
         """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        index_name = index_name or f"ix_{_table_key(table_name)}_{'_'.join(columns)}"
         try:
-            query = "SELECT name FROM sqlite_master WHERE type='table'"
-            self.cursor.execute(query)
-            tables = self.cursor.fetchall()
-            return [table[0] for table in tables]
+            if self.db_type == 'mongodb':
+                self._collection(table_name).create_index([(column, 1) for column in columns], name=index_name,
+                                                          unique=unique)
+            else:
+                self._create_index_if_missing(index_name, table_name, ', '.join(columns), unique)
+            return index_name
         except Exception as e:
-            raise RuntimeError(f"Error listing tables: {str(e)}")
+            raise RuntimeError(f"Error creating index: {str(e)}")
 
-    def create_chart_database(self, output_directory, chart_type='bar', x_label='X Axis Label', y_label='Y Axis Label'):
+    @_pooled
+    def drop_index(self, table_name, index_name):
         """
-        Create charts for all tables in the database and save them as images.
+        Drop an index if it exists.
 
         Args:
-            output_directory (str): The directory where chart images will be saved.
-            chart_type (str): The type of chart to create ('bar', 'line', 'scatter', etc.).
-            x_label (str): Label for the x-axis.
-            y_label (str): Label for the y-axis.
+            table_name (str): Name of the table the index belongs to.
+            index_name (str): Name of the index.
 
         Raises:
-            RuntimeError: If there is an error creating charts or saving them as images.
+            RuntimeError: If there is an error dropping the index.
         """
         try:
-            os.makedirs(output_directory, exist_ok=True)
-            tables = self.list_tables()
-
-            for table_name in tables:
-                data = self.search_all(table_name)
-                x_values = [str(row[0]) for row in data] 
-                y_values = [row[1] for row in data] 
-                plt.figure(figsize=(8, 6))
-                if chart_type == 'bar':
-                    plt.bar(x_values, y_values)
-                elif chart_type == 'line':
-                    plt.plot(x_values, y_values, marker='o', linestyle='-')
-                elif chart_type == 'scatter':
-                    plt.scatter(x_values, y_values)
-                elif chart_type == 'histogram':
-                    plt.hist(y_values, bins='auto', edgecolor='k')
-                else:
-                    raise RuntimeError(f"Error, Type chart not found!")
-                
-                plt.xlabel(x_label)
-                plt.ylabel(y_label)
-                plt.title(f'{chart_type.capitalize()} Chart for Table: {table_name}')
-
-                chart_filename = os.path.join(output_directory, f'{table_name}_{chart_type}_chart.png')
-                plt.savefig(chart_filename)
-
-                plt.close()
-
+            if self.db_type == 'mongodb':
+                if index_name in self._collection(table_name).index_information():
+                    self._collection(table_name).drop_index(index_name)
+            elif self.db_type == 'mysql':
+                if self.fetch_all(f"SHOW INDEX FROM {table_name} WHERE Key_name = %s", index_name):
+                    self.execute_query(f"DROP INDEX {index_name} ON {table_name}")
+            elif self.db_type == 'sqlserver':
+                self.execute_query(f"DROP INDEX IF EXISTS {index_name} ON {table_name}")
+            else:
+                self.execute_query(f"DROP INDEX IF EXISTS {index_name}")
         except Exception as e:
-            raise RuntimeError(f"Error creating charts: {str(e)}")
+            raise RuntimeError(f"Error dropping index: {str(e)}")
 
-    def create_chart_table(self, table_name, x_column, y_column, x_label='X Axis Label', y_label='Y Axis Label', title='Chart Title', save_path='chart.png', chart_type='bar'):
+    @_pooled
+    def list_indexes(self, table_name):
         """
-        Create a chart from data in the database and save it as an image.
+        List the indexes of a table, including those backing primary keys and unique constraints.
 
         Args:
-            table_name (str): Name of the database table to retrieve data from.
-            x_column (int): Index of the x-axis column in the retrieved data.
-            y_column (int): Index of the y-axis column in the retrieved data.
-            x_label (str): Label for the x-axis.
-            y_label (str): Label for the y-axis.
-            title (str): Title of the chart.
-            save_path (str): Path to save the chart image.
-            chart_type (str): The type of chart to create ('bar', 'line', 'scatter', etc.).
+            table_name (str): Name of the table.
+
+        Returns:
+            list: Dicts with name, columns (in index order; None for expressions on SQLite) and unique.
 
         Raises:
-            RuntimeError: If there is an error creating the chart or saving it as an image.
+            RuntimeError: If there is an error reading the indexes.
         """
         try:
-            data = self.search_all(table_name)
-            x_values = [row[x_column] for row in data]
-            y_values = [row[y_column] for row in data]
-            plt.figure(figsize=(8, 6))
-            if chart_type == 'bar':
-                plt.bar(x_values, y_values)
-            elif chart_type == 'line':
-                plt.plot(x_values, y_values, marker='o', linestyle='-')
-            elif chart_type == 'scatter':
-                plt.scatter(x_values, y_values)
-            elif chart_type == 'histogram':
-                plt.hist(y_values, bins='auto', edgecolor='k')
+            if self.db_type == 'mongodb':
+                return [{'name': name, 'columns': [key for key, _ in info['key']], 'unique': bool(info.get('unique'))}
+                        for name, info in self._collection(table_name).index_information().items()]
+            if self.db_type == 'sqlite':
+                indexes = []
+                for _, name, unique, *_ in self.cursor.execute(f"PRAGMA index_list({table_name})").fetchall():
+                    columns = [column for _, _, column in self.cursor.execute(f"PRAGMA index_info({name})").fetchall()]
+                    indexes.append({'name': name, 'columns': columns, 'unique': bool(unique)})
+                return sorted(indexes, key=lambda index: index['name'])
+            if self.db_type == 'postgresql':
+                query = ("SELECT i.relname, ix.indisunique, pg_get_indexdef(ix.indexrelid, k.n, true) "
+                         "FROM pg_index ix JOIN pg_class i ON i.oid = ix.indexrelid "
+                         "CROSS JOIN generate_series(1, ix.indnatts) AS k(n) "
+                         "WHERE ix.indrelid = %s::regclass ORDER BY i.relname, k.n")
+            elif self.db_type == 'mysql':
+                query = ("SELECT INDEX_NAME, NON_UNIQUE = 0, COLUMN_NAME FROM information_schema.STATISTICS "
+                         "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX")
+            elif self.db_type == 'sqlserver':
+                query = ("SELECT i.name, i.is_unique, c.name FROM sys.indexes i "
+                         "JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id "
+                         "JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id "
+                         "WHERE i.object_id = OBJECT_ID(?) AND ic.is_included_column = 0 ORDER BY i.name, ic.key_ordinal")
             else:
-                raise RuntimeError(f"Error, Type chart not found!")
-                
-            plt.xlabel(x_label)
-            plt.ylabel(y_label)
-            plt.title(title)
-            plt.savefig(save_path)
-            plt.close()
-
+                raise NotImplementedError(f"Index listing is not supported for {self.db_type}")
+            self.cursor.execute(query, (table_name,))
+            indexes = {}
+            for name, unique, column in self.cursor.fetchall():
+                index = indexes.setdefault(name, {'name': name, 'columns': [], 'unique': bool(unique)})
+                index['columns'].append(column)
+            return list(indexes.values())
         except Exception as e:
-            raise RuntimeError(f"Error creating chart: {str(e)}")
+            raise RuntimeError(f"Error listing indexes: {str(e)}")
 
-    def search_all(self, table_name):
+    @_pooled
+    def explain(self, query, *args):
         """
-        Search for all rows in the table.
+        Get the query plan of a statement in one structure for every backend.
+
+        Runs EXPLAIN QUERY PLAN on SQLite, EXPLAIN (FORMAT JSON) on PostgreSQL, EXPLAIN on MySQL and
+        SHOWPLAN_XML on SQL Server. The statement itself is not executed.
 
         Args:
-            table_name (str): Name of the table to search in.
+            query (str): The SQL statement.
+            *args: Parameters to be passed to the statement.
 
         Returns:
-            list: List of tuples representing the fetched rows.
+            dict: 'nodes', the plan steps in plan order as dicts with depth, operation (the backend's name
+            for the step), access ('full_scan', 'index_scan', 'index_seek' or 'other'), table, index,
+            rows (estimate), cost and detail; 'full_scans', the tables read without an index; and 'raw',
+            the backend's own output.
 
         Raises:
-            RuntimeError: If there is an error searching for rows.
+            RuntimeError: If there is an error explaining the statement.
         """
         try:
-            query = f"SELECT * FROM {table_name}"
-            return self.fetch_all(query)
+            if self.db_type == 'sqlite':
+                raw = self.cursor.execute(f"EXPLAIN QUERY PLAN {query}", args).fetchall()
+                nodes = _sqlite_plan(raw)
+            elif self.db_type == 'postgresql':
+                self.cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", args)
+                raw = self.cursor.fetchone()[0]
+                if isinstance(raw, str):
+                    raw = json.loads(raw)
+                nodes = _postgresql_plan(raw[0]['Plan'])
+            elif self.db_type == 'mysql':
+                self.cursor.execute(f"EXPLAIN {query}", args)
+                raw = self.cursor.fetchall()
+                nodes = _mysql_plan([description[0] for description in self.cursor.description], raw)
+            elif self.db_type == 'sqlserver':
+                self.cursor.execute("SET SHOWPLAN_XML ON")
+                try:
+                    self.cursor.execute(query, args)
+                    raw = self.cursor.fetchone()[0]
+                finally:
+                    self.cursor.execute("SET SHOWPLAN_XML OFF")
+                nodes = _sqlserver_plan(raw)
+            else:
+                raise NotImplementedError(f"Query plans are not supported for {self.db_type}")
         except Exception as e:
-            raise RuntimeError(f"Error searching for all rows: {str(e)}")
-        
-    def export_data_csv(self, table_name, csv_file_path):
+            raise RuntimeError(f"Error explaining query: {str(e)}")
+        full_scans = []
+        for node in nodes:
+            if node['access'] == 'full_scan' and node['table'] and node['table'] not in full_scans:
+                full_scans.append(node['table'])
+        return {'nodes': nodes, 'full_scans': full_scans, 'raw': raw}
+
+    @_pooled
+    def index_advice(self, limit=10):
         """
-        Export data from a table to a CSV file.
+        Suggest indexes for the conditions recorded by the index advisor, ranked by cumulative time.
+
+        Each recorded condition is explained as SELECT * FROM <table> WHERE <condition>; conditions whose
+        plan reads their table without an index yield a suggestion covering the columns they compare
+        (equality columns first, then one range column). Suggestions for the same columns are merged.
 
         Args:
-            table_name (str): The name of the table to export data from.
-            csv_file_path (str): The path to save the exported CSV file.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            list: Dicts with table, columns, calls, total_time (seconds), conditions (fingerprints) and
+            statement (the CREATE INDEX to run), slowest first. A suggestion whose columns start another
+            suggestion's columns is merged into that one.
 
         Raises:
-            Exception: If there is an error during data export.
+            RuntimeError: If the index advisor is not enabled.
         """
-        try:
-            self.cursor.execute(f"SELECT * FROM {table_name}")
-            rows = self.cursor.fetchall()
-
-            with open(csv_file_path, 'w', newline='') as csv_file:
-                csv_writer = csv.writer(csv_file)
-                header = [description[0] for description in self.cursor.description]
-                csv_writer.writerow(header)
-                csv_writer.writerows(rows)
-        except Exception as e:
-            raise Exception(f"Error exporting data: {str(e)}")
+        recorded = self.instrumentation.conditions()
+        if recorded is None:
+            raise RuntimeError("The index advisor is not enabled; call set_index_advisor() first")
+        placeholder = self.compiler.placeholder
+        table_columns = {}
+        suggestions = {}
+        for table, fingerprint, condition, calls, total in recorded:
+            args = ()
+            if placeholder in condition:
+                if self.db_type != 'sqlite':
+                    # The plan of a parameterized condition cannot be taken without its values.
+                    continue
+                args = (None,) * condition.count(placeholder)
+            try:
+                if _table_key(table) not in {_table_key(scanned) for scanned in
+                                             self.explain(f"SELECT * FROM {table} WHERE {condition}", *args)['full_scans']}:
+                    continue
+                if table not in table_columns:
+                    table_columns[table] = {column.lower(): column for column in self._table_columns(table)}
+            except Exception:
+                continue
+            known = table_columns[table]
+            columns = [known[column.lower()] for column in _condition_columns(condition) if column.lower() in known]
+            if not columns:
+                continue
+            suggestion = suggestions.get((_table_key(table), tuple(columns)))
+            if suggestion is None:
+                suggestion = suggestions[(_table_key(table), tuple(columns))] = {
+                    'table': table,
+                    'columns': columns,
+                    'calls': 0,
+                    'total_time': 0.0,
+                    'conditions': [],
+                    'statement': f"CREATE INDEX ix_{_table_key(table)}_{'_'.join(columns)} ON {table} ({', '.join(columns)})",
+                }
+            suggestion['calls'] += calls
+            suggestion['total_time'] += total
+            suggestion['conditions'].append(fingerprint)
+        # An index on (a, b) also serves conditions on a alone: fold prefix suggestions into the longest one.
+        for (table_key, columns), suggestion in sorted(suggestions.items(), key=lambda item: len(item[0][1])):
+            wider = [other for (other_table, other_columns), other in suggestions.items()
+                     if other_table == table_key and len(other_columns) > len(columns) and other_columns[:len(columns)] == columns]
+            if wider:
+                target = max(wider, key=lambda other: len(other['columns']))
+                target['calls'] += suggestion['calls']
+                target['total_time'] += suggestion['total_time']
+                target['conditions'] += suggestion['conditions']
+                del suggestions[(table_key, columns)]
+        return sorted(suggestions.values(), key=lambda suggestion: suggestion['total_time'], reverse=True)[:limit]
 
-    def create_json_table(self, table_name):
+    @_pooled
+    def retrieve_json_data(self, table_name, record_id):
         """
-        Create a table to store JSON data.
+        Retrieve JSON data from a JSON table.
 
         Args:
-            table_name (str): The name of the table.
+            table_name (str): The name of the JSON table.
+            record_id (int): The ID of the record to retrieve (the _id on MongoDB).
+
+        Returns:
+            dict: The retrieved JSON data.
         """
         try:
-            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
-                query = f"CREATE TABLE IF NOT EXISTS {table_name} (id INTEGER PRIMARY KEY, json_data TEXT)"
-                self.cursor.execute(query)
-                self.connection.commit()
+            if self.db_type == 'mongodb':
+                return self._cached_documents(('retrieve_json_data', table_name, _filter_key(record_id)), table_name,
+                                              lambda: self._collection(table_name).find_one({'_id': record_id}))
+            elif self.db_type in ['sqlite', 'mysql', 'postgresql']:
+                query = self.compiler.compile('select_by_id', table_name, (self.compiler.json_document(),))
+                result = self._cached_read(('retrieve_json_data', table_name, record_id), (_table_key(table_name),),
+                                           lambda: self._fetch_one(query, record_id))
+                if result:
+                    return self._json.loads(result[0])
+                else:
+                    return None
             else:
-                raise NotImplementedError(f"JSON tables are not supported for {self.db_type}")
+                raise NotImplementedError(f"JSON data retrieval is not supported for {self.db_type}")
         except Exception as e:
-            self.connection.rollback()
             raise e
 
-    def create_xml_table(self, table_name):
+    @_pooled
+    def find_json(self, table_name, path, op='=', value=None, limit=None):
         """
-        Create a table to store XML data.
+        Find the documents of a JSON table whose value at a path matches a condition.
+
+        The filter runs in the database: json_extract on SQLite, JSONB operators on PostgreSQL, ->>
+        (JSON_EXTRACT) on MySQL and a dotted-path query on MongoDB, so it can use the indexes made by
+        create_json_index (create_index on MongoDB).
 
         Args:
-            table_name (str): The name of the table.
+            table_name (str): The name of the JSON table.
+            path (str): JSON path of the field, e.g. 'address.city', 'items[0].sku' or '$.status'.
+            op (str): Comparison operator ('=', '!=', '<', '<=', '>', '>=') or 'exists'.
+            value: The value to compare with. Ignored for 'exists'.
+            limit (int): Maximum number of documents to return.
+
+        Returns:
+            list: (id, document) tuples ordered by id.
+
+        Raises:
+            ValueError: If the path or operator is invalid.
+            RuntimeError: If there is an error querying the table.
         """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql', 'mongodb']:
+            raise NotImplementedError(f"JSON queries are not supported for {self.db_type}")
+        segments = _json_path(path)
+        operator = _JSON_OPERATORS.get(str(op).lower())
+        if operator is None:
+            raise ValueError(f"Unsupported JSON operator: {op}")
+        if operator != 'exists' and value is None:
+            raise ValueError("find_json needs a value to compare with; use op='exists' to test for a field")
+        if self.db_type == 'mongodb':
+            condition = {'$exists': True} if operator == 'exists' else {_MONGO_OPERATORS[operator]: value}
+            try:
+                cursor = self._collection(table_name).find({'.'.join(segments): condition}, sort=[('_id', 1)],
+                                                           limit=int(limit) if limit is not None else 0)
+                return [(document['_id'], document) for document in cursor]
+            except Exception as e:
+                raise RuntimeError(f"Error querying JSON data: {str(e)}")
+        query = self.compiler.compile('find_json', table_name, segments, operator)
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        if operator == 'exists':
+            params = ()
+        elif self.db_type == 'postgresql':
+            params = (self._json.dumps(value),)
+            if operator == '=' and not any(segment.isdigit() for segment in segments):
+                document = value
+                for segment in reversed(segments):
+                    document = {segment: document}
+                params = (self._json.dumps(document),) + params
+        elif self.db_type == 'mysql' and isinstance(value, bool):
+            # ->> renders JSON booleans as 'true' / 'false'.
+            params = (self._json.dumps(value),)
+        else:
+            params = (value,)
         try:
-            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
-                query = f"CREATE TABLE IF NOT EXISTS {table_name} (id INTEGER PRIMARY KEY, xml_data TEXT)"
-                self.cursor.execute(query)
-                self.connection.commit()
-            else:
-                raise NotImplementedError(f"XML tables are not supported for {self.db_type}")
+            return [(record_id, self._json.loads(document)) for record_id, document in self.fetch_all(query, *params)]
         except Exception as e:
-            self.connection.rollback()
-            raise e
+            raise RuntimeError(f"Error querying JSON data: {str(e)}")
 
-    def insert_json_data(self, table_name, json_data):
+    @_pooled
+    def create_json_index(self, table_name, path=None, value_type='text'):
         """
-        Insert JSON data into a JSON table.
+        Index a field of a JSON table so that find_json lookups on it avoid full scans.
+
+        SQLite gets an expression index on json_extract, PostgreSQL a btree expression index on the JSONB
+        path (or a GIN index on the whole document when path is None), and MySQL an indexed virtual
+        generated column. Calling it again for an indexed path does nothing.
 
         Args:
             table_name (str): The name of the JSON table.
-            json_data (dict): The JSON data to insert.
+            path (str): JSON path of the field. None indexes the whole document (PostgreSQL only).
+            value_type (str): 'text' or 'number'; the type of the MySQL generated column.
+
+        Returns:
+            str: The name of the index.
+
+        Raises:
+            ValueError: If the path is invalid or missing where required.
+            RuntimeError: If there is an error creating the index.
         """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql']:
+            raise NotImplementedError(f"JSON indexes are not supported for {self.db_type}")
+        if path is None:
+            if self.db_type != 'postgresql':
+                raise ValueError(f"A path is required for JSON indexes on {self.db_type}")
+            index_name = f"ix_{table_name}_json_data"
+            statement = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} USING GIN (json_data jsonb_path_ops)"
+        else:
+            segments = _json_path(path)
+            index_name = f"ix_{table_name}_json_{'_'.join(segments)}"
+            expression = self.compiler.json_expression(segments)
+            if self.db_type == 'mysql':
+                if value_type not in ['text', 'number']:
+                    raise ValueError(f"Unsupported value_type: {value_type}")
+                column = f"json_{'_'.join(segments)}"
+                column_type = 'DOUBLE' if value_type == 'number' else 'VARCHAR(255)'
+            else:
+                statement = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({expression})"
         try:
-            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
-                json_str = json.dumps(json_data)
-                query = f"INSERT INTO {table_name} (json_data) VALUES (?)"
-                self.cursor.execute(query, (json_str,))
-                self.connection.commit()
+            if self.db_type == 'mysql':
+                # MySQL has no ADD COLUMN IF NOT EXISTS; look the generated column up so that calls are idempotent.
+                if not self.fetch_all("SELECT 1 FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                                      "AND TABLE_NAME = %s AND COLUMN_NAME = %s", table_name, column):
+                    self.execute_query(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type} "
+                                       f"GENERATED ALWAYS AS {expression} VIRTUAL")
+                self._create_index_if_missing(index_name, table_name, column)
             else:
-                raise NotImplementedError(f"JSON data insertion is not supported for {self.db_type}")
+                self.execute_query(statement)
+            return index_name
         except Exception as e:
-            self.connection.rollback()
-            raise e
+            raise RuntimeError(f"Error creating JSON index: {str(e)}")
 
-    def insert_xml_data(self, table_name, xml_data):
+    @_pooled
+    def insert_json_many(self, table_name, documents, batch_size=1000):
         """
-        Insert XML data into an XML table.
+        Insert many documents into a JSON table, committing once per batch.
+
+        Documents are encoded with the manager's json_codec and written through insert_rows, so each
+        batch uses the backend's bulk insert path. On MongoDB each batch is one unordered insert_many.
 
         Args:
-            table_name (str): The name of the XML table.
-            xml_data (str): The XML data to insert as a string.
+            table_name (str): The name of the JSON table.
+            documents (iterable): Iterable or generator of JSON-serializable documents.
+            batch_size (int): Number of documents written per transaction.
+
+        Returns:
+            int: Number of documents inserted.
+
+        Raises:
+            RuntimeError: If there is an error inserting the documents.
         """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql', 'mongodb']:
+            raise NotImplementedError(f"JSON data insertion is not supported for {self.db_type}")
+        if self.db_type == 'mongodb':
+            if batch_size < 1:
+                raise ValueError("batch_size must be at least 1")
+            documents, inserted = iter(documents), 0
+            try:
+                while True:
+                    batch = [dict(document) for document in itertools.islice(documents, batch_size)]
+                    if not batch:
+                        return inserted
+                    self._document_write(table_name, lambda collection, session: collection.insert_many(
+                        batch, ordered=False, session=session))
+                    inserted += len(batch)
+            except Exception as e:
+                raise RuntimeError(f"Error inserting JSON data: {str(e)}")
+        dumps = self._json.dumps
         try:
-            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
-                query = f"INSERT INTO {table_name} (xml_data) VALUES (?)"
-                self.cursor.execute(query, (xml_data,))
-                self.connection.commit()
-            else:
-                raise NotImplementedError(f"XML data insertion is not supported for {self.db_type}")
+            return sum(self.insert_rows(table_name, ((dumps(document),) for document in documents),
+                                        batch_size=batch_size, columns=['json_data']))
         except Exception as e:
-            self.connection.rollback()
-            raise e
+            raise RuntimeError(f"Error inserting JSON data: {str(e)}")
 
-    def retrieve_json_data(self, table_name, record_id):
+    @_pooled
+    def retrieve_json_many(self, table_name, record_ids, chunk_size=None):
         """
-        Retrieve JSON data from a JSON table.
+        Retrieve many documents of a JSON table by id with a few IN (...) queries.
 
         Args:
             table_name (str): The name of the JSON table.
-            record_id (int): The ID of the record to retrieve.
+            record_ids (iterable): The ids of the records to retrieve (_id values on MongoDB).
+            chunk_size (int): Ids per query. Defaults to the backend's bound-parameter limit (at most 10000;
+                10000 on MongoDB, where each query is an $in filter).
 
         Returns:
-            dict: The retrieved JSON data.
+            dict: id -> document, in the order of record_ids. Ids that do not exist are left out.
+
+        Raises:
+            RuntimeError: If there is an error retrieving the documents.
         """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql', 'mongodb']:
+            raise NotImplementedError(f"JSON data retrieval is not supported for {self.db_type}")
+        record_ids = list(dict.fromkeys(record_ids))
+        if chunk_size is None:
+            chunk_size = 10000 if self.db_type == 'mongodb' else min(self._max_parameters(), 10000)
+        loads, found = self._json.loads, {}
         try:
-            if self.db_type in ['sqlite', 'mysql', 'postgresql']:
-                query = f"SELECT json_data FROM {table_name} WHERE id = ?"
-                self.cursor.execute(query, (record_id,))
-                result = self.cursor.fetchone()
-                if result:
-                    return json.loads(result[0])
-                else:
-                    return None
-            else:
-                raise NotImplementedError(f"JSON data retrieval is not supported for {self.db_type}")
+            if self.db_type == 'mongodb':
+                collection = self._collection(table_name)
+                for start in range(0, len(record_ids), chunk_size):
+                    chunk = record_ids[start:start + chunk_size]
+                    for document in collection.find({'_id': {'$in': chunk}}, batch_size=len(chunk)):
+                        found[document['_id']] = document
+                return {record_id: found[record_id] for record_id in record_ids if record_id in found}
+            for start in range(0, len(record_ids), chunk_size):
+                chunk = record_ids[start:start + chunk_size]
+                query = self.compiler.compile('select_by_ids', table_name, (self.compiler.json_document(),), str(len(chunk)))
+                for record_id, document in self.fetch_all(query, *chunk):
+                    found[record_id] = document
+            return {record_id: loads(found[record_id]) for record_id in record_ids if record_id in found}
         except Exception as e:
-            raise e
+            raise RuntimeError(f"Error retrieving JSON data: {str(e)}")
+
+    def _max_parameters(self):
+        """
+        Get the maximum number of bound parameters per statement for the backend.
+
+        Returns:
+            int: The parameter limit.
+        """
+        if self.db_type == 'sqlite' and hasattr(self.connection, 'getlimit'):
+            return self.connection.getlimit(self._driver.SQLITE_LIMIT_VARIABLE_NUMBER)
+        return _MAX_PARAMETERS.get(self.db_type, 999)
 
+    @_pooled
     def retrieve_xml_data(self, table_name, record_id):
         """
         Retrieve XML data from an XML table.
@@ -599,9 +4743,9 @@ class DatabaseManager:
         """
         try:
             if self.db_type in ['sqlite', 'mysql', 'postgresql']:
-                query = f"SELECT xml_data FROM {table_name} WHERE id = ?"
-                self.cursor.execute(query, (record_id,))
-                result = self.cursor.fetchone()
+                query = self.compiler.compile('select_by_id', table_name, ('xml_data',))
+                result = self._cached_read(('retrieve_xml_data', table_name, record_id), (_table_key(table_name),),
+                                           lambda: self._fetch_one(query, record_id))
                 if result:
                     return result[0]
                 else:
@@ -611,49 +4755,90 @@ class DatabaseManager:
         except Exception as e:
             raise e
 
+    @_pooled
     def export_to_pdf(self, table_name, pdf_file_path,
                       background_color=None, text_color=None,
-                      font_name=None, font_size=12):
+                      font_name=None, font_size=12, columns=None, max_rows=None, col_widths=None, chunk_size=1000):
         """
         Export data from a database table to a PDF document with customizable styles.
 
+        Rows are streamed in chunks and laid out as one page-sized LongTable per page, with the header
+        repeated and fixed column widths and row heights, so neither memory nor layout time grows with
+        the table size. Column widths are derived from the first page unless col_widths is given; text
+        that does not fit its column is truncated.
+
         Args:
             table_name (str): The name of the database table to export data from.
             pdf_file_path (str): The path to save the exported PDF file.
             background_color (str): Background color for the table cells (e.g., 'lightblue').
             text_color (str): Text color for the table cells (e.g., 'black').
-            font_name (str): Font name for the table text (e.g., 'Helvetica').
+            font_name (str): Font name for the table text (e.g., 'Helvetica'), or the path of a .ttf file.
             font_size (int): Font size for the table text.
+            columns (list): Columns to export. All columns when None.
+            max_rows (int): Export at most this many rows.
+            col_widths (list): Column widths in points.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            dict: rows, bytes, seconds, rows_per_sec and bytes_per_sec of the export.
 
         Raises:
             Exception: If there is an error during data export.
         """
+        start = time.perf_counter()
+        header = []
+        select = ', '.join(columns) if columns else '*'
+        chunks = self._iter_chunks(f"SELECT {select} FROM {table_name}", (), chunk_size, columns_out=header)
         try:
-            data = self.search_all(table_name)
-            doc = SimpleDocTemplate(pdf_file_path, pagesize=letter)
-            if font_name:
-                pdfmetrics.registerFont(TTFont('CustomFont', font_name))
-            table_data = [list(description[0] for description in self.cursor.description)] + [list(row) for row in data]
-            table = Table(table_data)
+            rl = _reportlab()
+            font, header_font = _pdf_fonts(font_name)
+            doc = rl.SimpleDocTemplate(pdf_file_path, pagesize=rl.letter)
+            rows = (row for chunk in chunks for row in chunk)
+            if max_rows is not None:
+                rows = itertools.islice(rows, max_rows)
+
+            # Frame padding is 6pt on each side; cell padding is 3pt plus 12pt below the header.
+            row_height = font_size * 1.2 + 6
+            header_height = font_size * 1.2 + 15
+            rows_per_page = max(1, int((doc.height - 12 - header_height) // row_height))
+            page = list(itertools.islice(rows, rows_per_page))
+            widths = col_widths or _pdf_column_widths(header, page, doc.width - 12)
+            limits = [max(1, int(width / (font_size * 0.55))) for width in widths]
+            header_cells = [_pdf_cell(name, limit) for name, limit in zip(header, limits)]
+
             table_style = [
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), font_name or 'Helvetica-Bold'),
+                ('FONTNAME', (0, 0), (-1, -1), font),
+                ('FONTNAME', (0, 0), (-1, 0), header_font),
+                ('FONTSIZE', (0, 0), (-1, -1), font_size),
                 ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('GRID', (0, 1), (-1, -1), 1, colors.black),
+                ('GRID', (0, 0), (-1, -1), 1, rl.colors.black),
             ]
-
             if background_color:
-                table_style.append(('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(background_color)))
-
+                table_style.append(('BACKGROUND', (0, 0), (-1, 0), rl.colors.HexColor(background_color)))
             if text_color:
-                table_style.append(('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor(text_color)))
+                table_style.append(('TEXTCOLOR', (0, 0), (-1, 0), rl.colors.HexColor(text_color)))
+            style = rl.TableStyle(table_style)
+            written = [0]
 
-            table.setStyle(TableStyle(table_style))
-            doc.build([table])
+            def tables(page):
+                while True:
+                    data = [header_cells] + [[_pdf_cell(value, limit) for value, limit in zip(row, limits)] for row in page]
+                    yield rl.LongTable(data, colWidths=widths, rowHeights=[header_height] + [row_height] * len(page),
+                                       repeatRows=1, style=style)
+                    written[0] += len(page)
+                    page = list(itertools.islice(rows, rows_per_page))
+                    if not page:
+                        return
+
+            doc.build(_FlowableFeed(tables(page)))
+            return _throughput(written[0], os.path.getsize(pdf_file_path), time.perf_counter() - start)
         except Exception as e:
             raise Exception(f"Error exporting data to PDF: {str(e)}")
+        finally:
+            chunks.close()
 
+    @_pooled
     def insert_base64(self, table_name, data_dict):
         """
         Insert base64 encoded data into a database table.
@@ -667,16 +4852,172 @@ class DatabaseManager:
         """
         try:
             encoded_data_dict = {column: base64.b64encode(data.encode()).decode() for column, data in data_dict.items()}
-            columns = ', '.join(encoded_data_dict.keys())
-            values = ', '.join(['?' for _ in encoded_data_dict])
-            query = f"INSERT INTO {table_name} ({columns}) VALUES ({values})"
+            query = self.compiler.compile('insert', table_name, encoded_data_dict.keys())
             self.execute_query(query, *encoded_data_dict.values())
         except Exception as e:
             raise RuntimeError(f"Error inserting base64 data: {str(e)}")
 
+    @_pooled
+    def write_blob(self, table_name, column_name, row_id, source, chunk_size=1024 * 1024):
+        """
+        Store raw bytes in a BLOB column of an existing row, streaming them from a file object.
+
+        SQLite writes through incremental blob I/O (Connection.blobopen) and SQL Server appends chunks with
+        UPDATE ... .WRITE, so the value never has to be in memory at once. PostgreSQL (bytea) and MySQL have
+        no incremental write, so the value is sent in one statement.
+
+        Args:
+            table_name (str): Name of the table.
+            column_name (str): Name of the BLOB / bytea / varbinary(max) column.
+            row_id: Value of the row's id column.
+            source (bytes or file): The bytes, or a binary file object to read them from.
+            chunk_size (int): Bytes copied per write.
+
+        Returns:
+            int: Number of bytes written.
+
+        Raises:
+            RuntimeError: If the row does not exist or there is an error writing the value.
+        """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql', 'sqlserver']:
+            raise NotImplementedError(f"BLOB storage is not supported for {self.db_type}")
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        spool = None
+        try:
+            if self.db_type == 'sqlite' and not source.seekable():
+                # zeroblob() needs the final size up front.
+                spool = tempfile.SpooledTemporaryFile(max_size=chunk_size * 8)
+                shutil.copyfileobj(source, spool, chunk_size)
+                spool.seek(0)
+                source = spool
+            self._mark_written((_table_key(table_name),))
+            where = f"WHERE id = {self.compiler.placeholder}"
+            written = 0
+            if self.db_type == 'sqlite':
+                start = source.tell()
+                size = source.seek(0, io.SEEK_END) - start
+                source.seek(start)
+                self.cursor.execute(f"UPDATE {table_name} SET {column_name} = zeroblob(?) {where}", (size, row_id))
+                if self.cursor.rowcount == 0:
+                    raise KeyError(f"no row with id {row_id!r}")
+                self.cursor.execute(f"SELECT rowid FROM {table_name} {where}", (row_id,))
+                with self.connection.blobopen(table_name, column_name, self.cursor.fetchone()[0]) as blob:
+                    while written < size:
+                        chunk = source.read(min(chunk_size, size - written))
+                        if not chunk:
+                            break
+                        blob.write(chunk)
+                        written += len(chunk)
+            elif self.db_type == 'sqlserver':
+                self.cursor.execute(f"UPDATE {table_name} SET {column_name} = 0x {where}", (row_id,))
+                if self.cursor.rowcount == 0:
+                    raise KeyError(f"no row with id {row_id!r}")
+                for chunk in iter(lambda: source.read(chunk_size), b''):
+                    self.cursor.execute(f"UPDATE {table_name} SET {column_name}.WRITE(?, NULL, NULL) {where}", (chunk, row_id))
+                    written += len(chunk)
+            else:
+                data = source.read()
+                self.cursor.execute(f"UPDATE {table_name} SET {column_name} = %s {where}", (data, row_id))
+                if self.cursor.rowcount == 0:
+                    raise KeyError(f"no row with id {row_id!r}")
+                written = len(data)
+            self._commit()
+            return written
+        except Exception as e:
+            self._rollback()
+            raise RuntimeError(f"Error writing BLOB data: {str(e)}")
+        finally:
+            if spool is not None:
+                spool.close()
+
+    def open_blob(self, table_name, column_name, row_id, chunk_size=1024 * 1024):
+        """
+        Open a BLOB value for reading as a seekable binary file object.
+
+        SQLite reads through incremental blob I/O; PostgreSQL, MySQL and SQL Server read chunk_size bytes per
+        SUBSTRING query. Close the file (or use it in a with block) to release the connection.
+
+        Args:
+            table_name (str): Name of the table.
+            column_name (str): Name of the BLOB / bytea / varbinary column.
+            row_id: Value of the row's id column.
+            chunk_size (int): Bytes fetched per read.
+
+        Returns:
+            io.BufferedReader: The readable file object.
+
+        Raises:
+            RuntimeError: If the row does not exist or there is an error opening the value.
+        """
+        if self.db_type not in ['sqlite', 'mysql', 'postgresql', 'sqlserver']:
+            raise NotImplementedError(f"BLOB storage is not supported for {self.db_type}")
+        self._hold()
+        try:
+            placeholder = self.compiler.placeholder
+            if self.db_type == 'sqlite':
+                rows = self.fetch_all(f"SELECT rowid FROM {table_name} WHERE id = ?", row_id)
+                if not rows:
+                    raise KeyError(f"no row with id {row_id!r}")
+                blob = self.connection.blobopen(table_name, column_name, rows[0][0], readonly=True)
+
+                def read_at(offset, length):
+                    blob.seek(offset)
+                    return blob.read(length)
+
+                def on_close():
+                    try:
+                        blob.close()
+                    finally:
+                        self._release_hold()
+
+                raw = _BlobReader(len(blob), read_at, on_close)
+            else:
+                length = {'postgresql': 'octet_length', 'mysql': 'LENGTH', 'sqlserver': 'DATALENGTH'}[self.db_type]
+                rows = self.fetch_all(f"SELECT {length}({column_name}) FROM {table_name} WHERE id = {placeholder}", row_id)
+                if not rows:
+                    raise KeyError(f"no row with id {row_id!r}")
+                query = f"SELECT SUBSTRING({column_name}, {placeholder}, {placeholder}) FROM {table_name} WHERE id = {placeholder}"
+
+                def read_at(offset, length):
+                    return bytes(self.fetch_all(query, offset + 1, length, row_id)[0][0])
+
+                raw = _BlobReader(rows[0][0] or 0, read_at, self._release_hold)
+        except Exception as e:
+            self._release_hold()
+            raise RuntimeError(f"Error opening BLOB data: {str(e)}")
+        return io.BufferedReader(raw, buffer_size=chunk_size)
+
+    def iter_base64(self, table_name, columns=None, chunk_size=1000):
+        """
+        Read and decode base64 encoded data from every row of a table, chunk_size rows at a time.
+
+        Args:
+            table_name (str): Name of the table to read data from.
+            columns (list): Columns to read and decode. All columns when None.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            dict: Column name -> decoded bytes (None for NULL) for one row.
+
+        Raises:
+            RuntimeError: If there is an error selecting or decoding the data.
+        """
+        names = []
+        select = ', '.join(columns) if columns else '*'
+        try:
+            for chunk in self._iter_chunks(f"SELECT {select} FROM {table_name}", (), chunk_size, columns_out=names):
+                for row in chunk:
+                    yield {name: None if value is None else base64.b64decode(value) for name, value in zip(names, row)}
+        except Exception as e:
+            raise RuntimeError(f"Error reading and decoding base64 data: {str(e)}")
+
+    @_pooled
     def read_base64(self, table_name):
         """
-        Read and decode base64 encoded data from a database table.
+        Read and decode base64 encoded data from the first row of a database table.
+
+        Use iter_base64() to read every row.
 
         Args:
             table_name (str): Name of the table to read data from.
@@ -687,28 +5028,62 @@ class DatabaseManager:
         Raises:
             RuntimeError: If there is an error selecting or decoding the data.
         """
+        rows = self.iter_base64(table_name, chunk_size=1)
         try:
-            query = f"SELECT * FROM {table_name}"
-            self.cursor.execute(query)
-            row = self.cursor.fetchone()
+            return next(rows, None)
+        finally:
+            rows.close()
 
-            if row:
-                column_names = [description[0] for description in self.cursor.description]
-                decoded_data = {column_names[i]: base64.b64decode(row[i]) for i in range(len(row))}
-                return decoded_data
-            else:
-                return None
-        except Exception as e:
-            raise RuntimeError(f"Error reading and decoding base64 data: {str(e)}")
+    def statement_cache_info(self):
+        """
+        Get hit/miss statistics of the generated-statement cache.
+
+        Returns:
+            dict: Hits, misses, current size and maximum size of the cache.
+        """
+        return self.compiler.cache_info()
 
     def close(self):
         """
-        Close the database connection.
+        Close the database connection. SQLite connections run PRAGMA optimize first.
 
         Raises:
             ConnectionError: If there is an error closing the connection.
         """
         try:
-            self.connection.close()
+            self.flush()
+            if self.pool is not None:
+                self.pool.close()
+            else:
+                if self.db_type == 'sqlite':
+                    self._optimize(self.connection)
+                self.connection.close()
         except Exception as e:
             raise ConnectionError(f"Error closing the database connection: {str(e)}")
+
+# Manager opened once per chart worker process by _chart_worker_init.
+_worker_manager = None
+
+def _chart_worker_init(clone_args):
+    """
+    Open the worker process's own connection for create_chart_database.
+
+    Args:
+        clone_args (tuple): (db_type, db_name, options, connect_kwargs) of the parent manager.
+    """
+    global _worker_manager
+    db_type, db_name, options, connect_kwargs = clone_args
+    _worker_manager = DatabaseManager(db_type, db_name, **options, **connect_kwargs)
+
+def _chart_worker_render(table_name, chart_args):
+    """
+    Render one table's chart in a worker process.
+
+    Args:
+        table_name (str): Name of the table.
+        chart_args (tuple): Arguments for DatabaseManager._chart_table_report.
+
+    Returns:
+        dict: The table's report.
+    """
+    return _worker_manager._chart_table_report(table_name, *chart_args)
@@ -6,4 +6,13 @@ Effortlessly manage database connections, execute queries, and enhance security
 Experience the power of DbUnify and streamline your database interactions for efficient development.
 """
 
-from DbUnify.DbUnify import DatabaseManager
\ No newline at end of file
+from DbUnify.DbUnify import DatabaseManager
+
+__all__ = ['DatabaseManager', 'AsyncDatabaseManager']
+
+def __getattr__(name):
+    # AsyncDatabaseManager pulls in asyncio and concurrent.futures; import it on first use only.
+    if name == 'AsyncDatabaseManager':
+        from DbUnify.AsyncDbUnify import AsyncDatabaseManager
+        return AsyncDatabaseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,93 @@
+"""
+Cold-start benchmark for DbUnify.
+
+Measures how long `from DbUnify import DatabaseManager` takes in a fresh
+interpreter, and which heavy modules get pulled in by the import. Exits with 1
+when a forbidden module is loaded or the median import time exceeds --max-ms.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 10] [--max-ms 60] [--json result.json]
+"""
+
+import argparse , json , os , statistics , subprocess , sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should never be loaded by a bare `import DbUnify`: drivers and chart/PDF libraries, and
+# the stdlib modules only AsyncDatabaseManager and the slow-query log need.
+HEAVY_MODULES = ['pymysql', 'psycopg2', 'pymongo', 'pyodbc', 'matplotlib', 'seaborn', 'reportlab', 'numpy',
+                 'asyncio', 'concurrent.futures', 'logging']
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "from DbUnify import DatabaseManager\n"
+    "elapsed = time.perf_counter() - start\n"
+    "heavy = [m for m in {heavy!r} if m in sys.modules]\n"
+    "rss = 0\n"
+    "try:\n"
+    "    import resource\n"
+    "    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "except ImportError:\n"
+    "    pass\n"
+    "print(elapsed, rss, ','.join(heavy))\n"
+).format(heavy=HEAVY_MODULES)
+
+
+def run_once():
+    """
+    Import DbUnify in a fresh interpreter.
+
+    Returns:
+        tuple: (import seconds, peak RSS in KiB, list of heavy modules loaded).
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    # -c puts the working directory first on sys.path; run from ROOT so that this tree is measured.
+    output = subprocess.check_output([sys.executable, '-c', PROBE], env=env, cwd=ROOT, text=True).split()
+    heavy = output[2].split(',') if len(output) > 2 else []
+    return float(output[0]), int(output[1]), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure DbUnify cold import time.')
+    parser.add_argument('--runs', type=int, default=10, help='Number of fresh interpreters to start.')
+    parser.add_argument('--max-ms', type=float, default=60.0,
+                        help='Fail when the median import time exceeds this many milliseconds.')
+    parser.add_argument('--json', dest='json_path', help='Write the result to this JSON file.')
+    args = parser.parse_args()
+
+    # The first run warms the bytecode cache and the OS page cache.
+    run_once()
+    timings, rss_values, heavy = [], [], set()
+    for _ in range(args.runs):
+        elapsed, rss, loaded = run_once()
+        timings.append(elapsed * 1000)
+        rss_values.append(rss)
+        heavy.update(loaded)
+
+    result = {
+        'benchmark': 'import',
+        'runs': args.runs,
+        'import_ms_median': statistics.median(timings),
+        'import_ms_min': min(timings),
+        'import_ms_max': max(timings),
+        'import_ms_budget': args.max_ms,
+        'peak_rss_kib': max(rss_values),
+        'heavy_modules_loaded': sorted(heavy),
+    }
+    print(f"import DbUnify: median {result['import_ms_median']:.2f} ms "
+          f"(min {result['import_ms_min']:.2f}, max {result['import_ms_max']:.2f}), "
+          f"peak RSS {result['peak_rss_kib']} KiB")
+    if heavy:
+        print(f"heavy modules loaded at import: {', '.join(sorted(heavy))}")
+    slow = result['import_ms_median'] > args.max_ms
+    if slow:
+        print(f"median import time exceeds the {args.max_ms:.0f} ms budget")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 1 if heavy or slow else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
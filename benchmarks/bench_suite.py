@@ -0,0 +1,444 @@
+"""
+Benchmark suite for DbUnify hot paths.
+
+Runs every benchmark in a fresh interpreter against a synthetic table, so peak RSS is per benchmark,
+and reports rows/s, per-call latency percentiles and peak RSS. SQLite always runs (fully offline);
+PostgreSQL and MySQL run when a throwaway instance is configured through an environment variable
+holding the DatabaseManager arguments as JSON, e.g.
+
+    DBUNIFY_BENCH_POSTGRESQL='{"db_name": "bench", "user": "postgres", "password": "x", "host": "localhost"}'
+    DBUNIFY_BENCH_MYSQL='{"db_name": "bench", "user": "root", "password": "x", "host": "127.0.0.1"}'
+
+Tables created there are named dbunify_bench_* and dropped afterwards.
+
+SQLite connection profiles are benchmarked as backends of their own, e.g. --backends sqlite,sqlite:write_heavy,
+or all of them next to the defaults with --sqlite-profiles.
+
+Usage:
+    python benchmarks/bench_suite.py [--rows 20000] [--backends sqlite,postgresql,mysql]
+                                     [--only insert_row,fetch_all] [--json result.json]
+    python benchmarks/bench_suite.py --compare baseline.json result.json [--threshold 10]
+"""
+
+import argparse , csv , itertools , json , os , platform , random , shutil , subprocess , sys , tempfile , time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BACKENDS = ['sqlite', 'postgresql', 'mysql']
+SQLITE_PROFILES = ['read_heavy', 'write_heavy', 'durable']
+
+# Column types of the synthetic table per backend.
+COLUMN_TYPES = {
+    'sqlite': [('id', 'INTEGER'), ('name', 'TEXT'), ('category', 'TEXT'), ('amount', 'REAL'), ('created', 'TEXT')],
+    'postgresql': [('id', 'INTEGER'), ('name', 'VARCHAR(64)'), ('category', 'VARCHAR(16)'), ('amount', 'DOUBLE PRECISION'), ('created', 'VARCHAR(32)')],
+    'mysql': [('id', 'INTEGER'), ('name', 'VARCHAR(64)'), ('category', 'VARCHAR(16)'), ('amount', 'DOUBLE'), ('created', 'VARCHAR(32)')],
+}
+
+CATEGORIES = ['alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta']
+
+# Calls made by the per-row benchmarks and rows rendered by the slow exporters, at most.
+MAX_CALLS = 2000
+MAX_PDF_ROWS = 5000
+# Repetitions of the whole-table reads.
+READ_REPEATS = 5
+# Fewer latency samples than this give no meaningful p95 / p99; only p50 and max are reported.
+MIN_TAIL_SAMPLES = 100
+
+TABLE = 'dbunify_bench_rows'
+SCRATCH = 'dbunify_bench_scratch'
+
+
+def synthetic_rows(count, seed=42):
+    """
+    Generate the rows of the synthetic table. The same seed always gives the same rows.
+
+    Args:
+        count (int): Number of rows.
+        seed (int): Random seed.
+
+    Yields:
+        tuple: (id, name, category, amount, created).
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        yield (i, f'name-{rng.randrange(10 ** 9):09d}', rng.choice(CATEGORIES), round(rng.uniform(0, 10000), 2),
+               f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}')
+
+
+def connect_args(backend, workdir):
+    """
+    Get the DatabaseManager arguments for a backend.
+
+    Args:
+        backend (str): 'sqlite', 'sqlite:<profile>', 'postgresql' or 'mysql'.
+        workdir (str): Scratch directory for SQLite databases and exported files.
+
+    Returns:
+        dict: db_type, db_name and connection keyword arguments, or None if the backend is not configured.
+    """
+    if backend.startswith('sqlite'):
+        # One file per profile: WAL mode persists in the database file.
+        profile = backend.partition(':')[2] or None
+        return {'db_type': 'sqlite', 'db_name': os.path.join(workdir, f"bench-{profile or 'default'}.db"), 'profile': profile}
+    config = os.environ.get(f'DBUNIFY_BENCH_{backend.upper()}')
+    if not config:
+        return None
+    return dict(json.loads(config), db_type=backend)
+
+
+def percentiles(latencies):
+    """
+    Summarize per-call latencies.
+
+    Args:
+        latencies (list): Latencies in seconds.
+
+    Returns:
+        dict: p50, p95, p99 and max in milliseconds, or None without latencies. p95 and p99 are None
+        with fewer than MIN_TAIL_SAMPLES latencies, where they would only repeat the max.
+    """
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+
+    def pick(fraction):
+        if fraction > 0.5 and len(ordered) < MIN_TAIL_SAMPLES:
+            return None
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': ordered[-1] * 1000,
+            'samples': len(ordered)}
+
+
+def timed_calls(calls):
+    """
+    Run callables one by one and time each.
+
+    Args:
+        calls (iterable): Callables taking no arguments.
+
+    Returns:
+        list: Latency of each call in seconds.
+    """
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def fill_table(db, backend, rows):
+    db.drop_table(TABLE)
+    db.create_table(TABLE, COLUMN_TYPES[backend])
+    db.insert_rows(TABLE, synthetic_rows(rows), columns=[name for name, _ in COLUMN_TYPES[backend]], batch_size=5000)
+
+
+def reset_scratch(db, columns):
+    db.drop_table(SCRATCH)
+    db.create_table(SCRATCH, columns)
+
+
+# Each benchmark prepares its own data, then returns (rows processed, per-call latencies) for the timed part.
+
+def bench_insert_row(db, backend, rows, workdir):
+    reset_scratch(db, COLUMN_TYPES[backend])
+    names = [name for name, _ in COLUMN_TYPES[backend]]
+    data = [dict(zip(names, row)) for row in synthetic_rows(min(rows, MAX_CALLS))]
+    return len(data), timed_calls(lambda row=row: db.insert_row(SCRATCH, row) for row in data)
+
+
+def bench_insert_rows(db, backend, rows, workdir):
+    reset_scratch(db, COLUMN_TYPES[backend])
+    data = list(synthetic_rows(rows))
+    names = [name for name, _ in COLUMN_TYPES[backend]]
+    return len(data), timed_calls([lambda: db.insert_rows(SCRATCH, data, columns=names, batch_size=5000)])
+
+
+def bench_fetch_all(db, backend, rows, workdir):
+    fill_table(db, backend, rows)
+    return rows * READ_REPEATS, timed_calls([lambda: db.fetch_all(f"SELECT * FROM {TABLE}")] * READ_REPEATS)
+
+
+def bench_search_all(db, backend, rows, workdir):
+    fill_table(db, backend, rows)
+    return rows * READ_REPEATS, timed_calls([lambda: db.search_all(TABLE)] * READ_REPEATS)
+
+
+def bench_search_one(db, backend, rows, workdir):
+    fill_table(db, backend, rows)
+    calls = min(rows, MAX_CALLS)
+    rng = random.Random(7)
+    return calls, timed_calls(lambda i=rng.randrange(rows): db.search_one(TABLE, f"id = {i}") for _ in range(calls))
+
+
+def bench_read_during_writes(db, backend, rows, workdir):
+    # Point reads on one connection while another connection keeps committing single-row inserts.
+    import threading
+    fill_table(db, backend, rows)
+    stop = threading.Event()
+
+    def write():
+        # SQLite connections belong to the thread that opened them.
+        writer = db._clone()
+        try:
+            for i in itertools.count(rows):
+                if stop.is_set():
+                    break
+                writer.insert_row(TABLE, {'id': i, 'name': 'writer', 'category': 'alpha', 'amount': 1.0, 'created': '2024-01-01'})
+                # Without a pause a rollback-journal writer starves readers until their busy timeout expires.
+                time.sleep(0.001)
+        finally:
+            writer.close()
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        rng = random.Random(7)
+        calls = min(rows, MAX_CALLS)
+        return calls, timed_calls(lambda i=rng.randrange(rows): db.search_one(TABLE, f"id = {i}") for _ in range(calls))
+    finally:
+        stop.set()
+        thread.join()
+
+
+def bench_export_data_csv(db, backend, rows, workdir):
+    fill_table(db, backend, rows)
+    path = os.path.join(workdir, 'export.csv')
+    return rows, timed_calls([lambda: db.export_data_csv(TABLE, path)])
+
+
+def bench_import_data_csv(db, backend, rows, workdir):
+    path = os.path.join(workdir, 'import.csv')
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in COLUMN_TYPES[backend]])
+        writer.writerows(synthetic_rows(rows))
+    db.drop_table(SCRATCH)
+    return rows, timed_calls([lambda: db.import_data_csv(SCRATCH, path)])
+
+
+def bench_export_to_pdf(db, backend, rows, workdir):
+    import reportlab  # noqa: F401 - skip cleanly when the optional dependency is missing
+    fill_table(db, backend, min(rows, MAX_PDF_ROWS))
+    path = os.path.join(workdir, 'export.pdf')
+    return min(rows, MAX_PDF_ROWS), timed_calls([lambda: db.export_to_pdf(TABLE, path)])
+
+
+def bench_create_chart_table(db, backend, rows, workdir):
+    import matplotlib  # noqa: F401 - skip cleanly when the optional dependency is missing
+    fill_table(db, backend, rows)
+    path = os.path.join(workdir, 'chart.png')
+    return rows, timed_calls([lambda: db.create_chart_table(TABLE, 2, 3, save_path=path, chart_type='bar')])
+
+
+def bench_insert_json_data(db, backend, rows, workdir):
+    db.drop_table(SCRATCH)
+    db.create_json_table(SCRATCH)
+    documents = [{'id': row[0], 'name': row[1], 'tags': [row[2]] * 3, 'amount': row[3]} for row in synthetic_rows(min(rows, MAX_CALLS))]
+    return len(documents), timed_calls(lambda document=document: db.insert_json_data(SCRATCH, document) for document in documents)
+
+
+def bench_insert_base64(db, backend, rows, workdir):
+    reset_scratch(db, [('payload', 'TEXT')])
+    payloads = [row[1] * 8 for row in synthetic_rows(min(rows, MAX_CALLS))]
+    return len(payloads), timed_calls(lambda payload=payload: db.insert_base64(SCRATCH, {'payload': payload}) for payload in payloads)
+
+
+BENCHMARKS = {
+    'insert_row': bench_insert_row,
+    'insert_rows': bench_insert_rows,
+    'fetch_all': bench_fetch_all,
+    'search_all': bench_search_all,
+    'search_one': bench_search_one,
+    'read_during_writes': bench_read_during_writes,
+    'export_data_csv': bench_export_data_csv,
+    'import_data_csv': bench_import_data_csv,
+    'export_to_pdf': bench_export_to_pdf,
+    'create_chart_table': bench_create_chart_table,
+    'insert_json_data': bench_insert_json_data,
+    'insert_base64': bench_insert_base64,
+}
+
+
+def run_worker(backend, name, rows, workdir):
+    """
+    Run one benchmark in this process and print its result as JSON. Used by run_benchmark().
+    """
+    from DbUnify import DatabaseManager
+    args = connect_args(backend, workdir)
+    db = DatabaseManager(args.pop('db_type'), args.pop('db_name'), **args)
+    try:
+        try:
+            processed, latencies = BENCHMARKS[name](db, backend.partition(':')[0], rows, workdir)
+        except ImportError as e:
+            print(json.dumps({'skipped': f'missing optional dependency: {e.name}'}))
+            return
+        seconds = sum(latencies)
+        peak_rss = 0
+        try:
+            import resource
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            pass
+        print(json.dumps({
+            'calls': len(latencies),
+            'rows': processed,
+            'seconds': seconds,
+            'rows_per_s': processed / seconds if seconds else None,
+            'latency_ms': percentiles(latencies) if len(latencies) > 1 else None,
+            'peak_rss_kib': peak_rss,
+        }))
+    finally:
+        for table in (TABLE, SCRATCH):
+            db.drop_table(table)
+        db.close()
+
+
+def run_benchmark(backend, name, rows, workdir):
+    """
+    Run one benchmark in a fresh interpreter.
+
+    Returns:
+        dict: The worker's result.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', backend, name, '--rows', str(rows),
+                             '--workdir', workdir], env=env, capture_output=True, text=True)
+    if output.returncode != 0:
+        return {'error': output.stderr.strip().splitlines()[-1] if output.stderr.strip() else f'exit code {output.returncode}'}
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def backend_available(backend, workdir):
+    """
+    Check that a backend is configured and reachable.
+
+    Returns:
+        str: None if it is usable, else the reason it is skipped.
+    """
+    args = connect_args(backend, workdir)
+    if args is None:
+        return f'DBUNIFY_BENCH_{backend.upper()} is not set'
+    try:
+        from DbUnify import DatabaseManager
+        DatabaseManager(args.pop('db_type'), args.pop('db_name'), **args).close()
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def run_suite(args):
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(unknown)}")
+    result = {
+        'benchmark': 'suite',
+        'version': 1,
+        'rows': args.rows,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [],
+        'skipped': [],
+    }
+    workdir = tempfile.mkdtemp(prefix='dbunify-bench-')
+    try:
+        backends = args.backends.split(',')
+        if args.sqlite_profiles:
+            backends += [f'sqlite:{profile}' for profile in SQLITE_PROFILES if f'sqlite:{profile}' not in backends]
+        for backend in backends:
+            reason = backend_available(backend, workdir)
+            if reason is not None:
+                result['skipped'].append({'backend': backend, 'reason': reason})
+                print(f"{backend}: skipped ({reason})")
+                continue
+            for name in names:
+                outcome = run_benchmark(backend, name, args.rows, workdir)
+                if 'skipped' in outcome or 'error' in outcome:
+                    reason = outcome.get('skipped') or f"error: {outcome['error']}"
+                    result['skipped'].append({'backend': backend, 'name': name, 'reason': reason})
+                    print(f"{backend:<18} {name:<20} skipped ({reason})")
+                    continue
+                result['results'].append(dict(outcome, backend=backend, name=name))
+                latency = outcome['latency_ms']
+                if latency is None:
+                    latency_text = f"{outcome['seconds'] * 1000:.1f} ms"
+                elif latency['p95'] is None:
+                    latency_text = f"p50 {latency['p50']:.3f} ms, max {latency['max']:.3f} ms ({latency['samples']} calls)"
+                else:
+                    latency_text = f"p50 {latency['p50']:.3f} ms, p95 {latency['p95']:.3f} ms, p99 {latency['p99']:.3f} ms"
+                print(f"{backend:<18} {name:<20} {outcome['rows_per_s']:>12,.0f} rows/s  {latency_text}, peak RSS {outcome['peak_rss_kib']} KiB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 1 if any('name' in skipped and skipped['reason'].startswith('error') for skipped in result['skipped']) else 0
+
+
+def compare(baseline_path, current_path, threshold):
+    """
+    Compare two suite results and flag regressions.
+
+    A benchmark regresses when its rows/s dropped, or its p95 latency grew, by more than threshold percent.
+    p95 is only compared when both runs have enough samples to report it.
+
+    Args:
+        baseline_path (str): JSON result of the reference run.
+        current_path (str): JSON result of the run to check.
+        threshold (float): Tolerated change in percent.
+
+    Returns:
+        int: 1 if any benchmark regressed, else 0.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['backend'], r['name']): r for r in json.load(f)['results']}
+    with open(current_path) as f:
+        current = {(r['backend'], r['name']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        notes = []
+        throughput_change = (new['rows_per_s'] / old['rows_per_s'] - 1) * 100
+        if throughput_change < -threshold:
+            notes.append(f"rows/s {throughput_change:+.1f}%")
+        if old['latency_ms'] and new['latency_ms'] and old['latency_ms'].get('p95') and new['latency_ms'].get('p95'):
+            latency_change = (new['latency_ms']['p95'] / old['latency_ms']['p95'] - 1) * 100
+            if latency_change > threshold:
+                notes.append(f"p95 {latency_change:+.1f}%")
+        status = 'REGRESSION ' + ', '.join(notes) if notes else 'ok'
+        regressions += bool(notes)
+        print(f"{key[0]:<18} {key[1]:<20} {old['rows_per_s']:>12,.0f} -> {new['rows_per_s']:>12,.0f} rows/s ({throughput_change:+.1f}%)  {status}")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key[0]:<18} {key[1]:<20} missing from {current_path}")
+    print(f"{regressions} regression(s) above {threshold}%")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DbUnify hot paths.')
+    parser.add_argument('--rows', type=int, default=20000, help='Rows in the synthetic table.')
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='Comma-separated backends to run.')
+    parser.add_argument('--only', help='Comma-separated benchmarks to run. All by default.')
+    parser.add_argument('--sqlite-profiles', action='store_true', help='Also run SQLite with every connection profile.')
+    parser.add_argument('--json', dest='json_path', help='Write the results to this JSON file.')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='Compare two JSON results instead of running.')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Regression threshold in percent for --compare.')
+    parser.add_argument('--worker', nargs=2, metavar=('BACKEND', 'NAME'), help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker[0], args.worker[1], args.rows, args.workdir)
+        return 0
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.threshold)
+    return run_suite(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
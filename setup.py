@@ -12,13 +12,16 @@ setup(
     url="https://github.com/Sepehr0Day/DbUnify",
     long_description_content_type='text/markdown',
     packages=['DbUnify'],
-    install_requires=[
-        'pymysql',
-        'psycopg2',
-        'pymongo',
-        'pyodbc',
-        'matplotlib',
-        'seaborn', 
-        'reportlab'
-    ],
+    # Drivers and the chart / PDF libraries are imported on demand; install the extras you use,
+    # e.g. pip install DbUnify[postgresql,chart].
+    extras_require={
+        'mysql': ['pymysql'],
+        'postgresql': ['psycopg2'],
+        'mongodb': ['pymongo'],
+        'sqlserver': ['pyodbc'],
+        'chart': ['matplotlib', 'numpy'],
+        'pdf': ['reportlab'],
+        'zstd': ['zstandard'],
+        'all': ['pymysql', 'psycopg2', 'pymongo', 'pyodbc', 'matplotlib', 'numpy', 'reportlab', 'zstandard'],
+    },
 )
@@ -0,0 +1,66 @@
+"""
+AsyncDatabaseManager tests on a SQLite file, run with asyncio.run.
+"""
+
+import asyncio , base64 , time
+
+import pytest
+
+from DbUnify import AsyncDatabaseManager, DatabaseManager
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'async.db')
+
+
+def run(path, scenario, **kwargs):
+    async def main():
+        async with AsyncDatabaseManager('sqlite', path, **kwargs) as db:
+            return await scenario(db)
+    return asyncio.run(main())
+
+
+def test_iter_base64_and_open_blob(path):
+    def read_blob(manager):
+        with manager.open_blob('files', 'raw', 3) as blob:
+            return blob.read()
+
+    async def scenario(db):
+        await db.create_table('files', [('id', 'INTEGER PRIMARY KEY'), ('data', 'TEXT'), ('raw', 'BLOB')])
+        for i in range(5):
+            await db.insert_row('files', {'id': i, 'data': base64.b64encode(b'x' * i).decode(), 'raw': b'y' * i})
+        decoded = [row async for row in db.iter_base64('files', ['data'], chunk_size=2)]
+        return decoded, await db.run(read_blob)
+
+    decoded, blob = run(path, scenario)
+    assert decoded == [{'data': b'x' * i} for i in range(5)]
+    assert blob == b'yyy'
+
+
+def test_group_commit_applies_to_every_connection(path):
+    def setting(manager):
+        time.sleep(0.05)
+        return manager._group_commit
+
+    async def reader():
+        manager = DatabaseManager('sqlite', path)
+        try:
+            return len(manager.fetch_all("SELECT id FROM items"))
+        finally:
+            manager.close()
+
+    async def scenario(db):
+        await db.create_table('items', [('id', 'INTEGER PRIMARY KEY'), ('name', 'TEXT')])
+        await db.set_group_commit(commit_every=100)
+        # Three concurrent calls open a third connection after the setting changed.
+        settings = await asyncio.gather(*(db.run(setting) for _ in range(3)))
+        for i in range(4):
+            await db.insert_row('items', {'name': f'row{i}'})
+        pending = await reader()
+        await db.flush()
+        return settings, pending, await reader(), db.pool_stats()['size']
+
+    settings, pending, flushed, size = run(path, scenario, pool_min_size=2, pool_max_size=3)
+    assert settings == [(100, None)] * 3 and size == 3
+    assert (pending, flushed) == (0, 4)
@@ -0,0 +1,64 @@
+"""
+chart_data and create_chart_table tests on an in-memory SQLite database.
+"""
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from DbUnify import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager('sqlite', ':memory:')
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def statuses(db):
+    db.create_table('statuses', [('day', 'INTEGER'), ('status', 'TEXT')])
+    db.insert_rows('statuses', [{'day': day, 'status': status}
+                                for day, status in [(3, 'ok'), (1, 'down'), (2, 'ok'), (1, 'ok')]])
+    return 'statuses'
+
+
+def chart_data(db, *args, **kwargs):
+    # fetch_columns hands back ndarrays; compare plain lists.
+    return {key: list(values) for key, values in db.chart_data(*args, **kwargs).items()}
+
+
+def test_text_y_line_and_scatter_keep_raw_rows(db, statuses):
+    for chart_type in ['line', 'scatter']:
+        data = chart_data(db, statuses, 'day', 'status', chart_type, max_points=3)
+        assert data == {'x': [3, 1, 2, 1], 'y': ['ok', 'down', 'ok', 'ok']}
+
+
+def test_text_y_bars_are_counted_or_raw(db, statuses):
+    assert chart_data(db, statuses, 'day', 'status', 'bar', aggregate='count') == {'x': [1, 2, 3], 'y': [2, 1, 1]}
+    for aggregate in ['sum', 'avg', None]:
+        data = chart_data(db, statuses, 'day', 'status', 'bar', aggregate=aggregate)
+        assert data == {'x': [3, 1, 2, 1], 'y': ['ok', 'down', 'ok', 'ok']}
+
+
+def test_mixed_text_and_numbers_is_not_numeric(db):
+    db.create_table('readings', [('t', 'INTEGER'), ('v', '')])
+    db.insert_rows('readings', [{'t': 1, 'v': 5}, {'t': 2, 'v': 'n/a'}])
+    assert chart_data(db, 'readings', 't', 'v', 'line') == {'x': [1, 2], 'y': [5, 'n/a']}
+
+
+def test_numeric_y_is_downsampled_in_x_order(db):
+    db.create_table('series', [('t', 'INTEGER'), ('v', 'REAL')])
+    db.insert_rows('series', [{'t': t, 'v': None if t == 5 else float(t % 7)} for t in reversed(range(100))])
+    data = chart_data(db, 'series', 't', 'v', 'line', max_points=10)
+    assert len(data['y']) == 10
+    assert data['x'] == sorted(data['x']) and 5 not in data['x']
+    assert chart_data(db, 'series', 't', 'v', 'bar', aggregate='sum')['y'][:3] == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.parametrize('chart_type', ['bar', 'line', 'scatter'])
+def test_create_chart_table_with_text_y(db, statuses, tmp_path, chart_type):
+    path = tmp_path / f'{chart_type}.png'
+    db.create_chart_table(statuses, 0, 1, save_path=str(path), chart_type=chart_type)
+    assert path.stat().st_size > 0
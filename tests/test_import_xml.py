@@ -0,0 +1,45 @@
+"""
+import_xml tests on an in-memory SQLite database.
+"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from DbUnify import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager('sqlite', ':memory:')
+    yield manager
+    manager.close()
+
+
+def import_records(db, tmp_path, document):
+    path = tmp_path / 'catalog.xml'
+    path.write_text(document)
+    db.import_xml('books', str(path), 'book', extract={'title': 'title', 'author': 'author/name'})
+    return db.fetch_all("SELECT title, author, xml_data FROM books ORDER BY id")
+
+
+def test_keeps_the_documents_namespace_prefixes(db, tmp_path):
+    rows = import_records(db, tmp_path, '<catalog xmlns="urn:dbunify:books" xmlns:p="urn:dbunify:people">'
+                                        '<book id="1"><title>T</title><author><p:name>N</p:name></author></book>'
+                                        '</catalog>')
+    assert rows == [('T', 'N', '<book xmlns="urn:dbunify:books" xmlns:p="urn:dbunify:people" id="1"><title>T</title>'
+                                '<author><p:name>N</p:name></author></book>')]
+
+
+def test_extract_paths_match_any_namespace(db, tmp_path):
+    rows = import_records(db, tmp_path, '<catalog xmlns="urn:dbunify:catalog"><book><title>T</title>'
+                                        '<author><name>N</name></author></book></catalog>')
+    assert rows[0][:2] == ('T', 'N')
+
+
+def test_unqualified_elements_below_a_default_namespace(db, tmp_path):
+    rows = import_records(db, tmp_path, '<catalog xmlns="urn:dbunify:reset"><book><title>T</title></book>'
+                                        '<book><title xmlns="">U</title></book></catalog>')
+    first, second = (ET.fromstring(xml_data) for _, _, xml_data in rows)
+    assert first.find('{urn:dbunify:reset}title').text == 'T'
+    assert second.tag == '{urn:dbunify:reset}book' and second.find('title').text == 'U'
@@ -0,0 +1,165 @@
+"""
+MongoDB backend tests, run in-process against mongomock.
+
+mongomock stands in for pymongo, so the tests need no mongod; they are skipped when it is not installed.
+"""
+
+import sys , types
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from DbUnify import DatabaseManager
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    # DatabaseManager imports the driver on demand; hand it mongomock's client instead of pymongo's.
+    monkeypatch.setitem(sys.modules, 'pymongo', types.SimpleNamespace(MongoClient=mongomock.MongoClient))
+
+
+@pytest.fixture
+def db(driver):
+    manager = DatabaseManager('mongodb', 'dbunify_test')
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def find_calls(monkeypatch):
+    # Record the keyword arguments of every find() to check the batch sizes.
+    calls = []
+    find = mongomock.collection.Collection.find
+
+    def recording_find(self, *args, **kwargs):
+        calls.append(kwargs)
+        return find(self, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, 'find', recording_find)
+    return calls
+
+
+def fill(db, count):
+    db.insert_rows('users', ({'n': i, 'name': f'user{i}', 'group': i % 3} for i in range(count)), batch_size=1000)
+
+
+def test_connects_without_cursor(db):
+    db.create_table('users')
+    db.create_table('users')
+    assert db.list_tables() == ['users']
+    assert db.cursor is None
+
+
+def test_insert_rows_writes_unordered_batches(db):
+    assert db.insert_rows('users', ({'n': i} for i in range(2500)), batch_size=1000) == [1000, 1000, 500]
+    assert len(db.search_all('users')) == 2500
+
+    # An unordered batch keeps going past a duplicate key and reports the failure afterwards.
+    db.insert_row('dupes', {'_id': 2})
+    with pytest.raises(RuntimeError):
+        db.insert_rows('dupes', [{'_id': 1}, {'_id': 2}, {'_id': 3}])
+    assert sorted(document['_id'] for document in db.search_all('dupes')) == [1, 2, 3]
+
+
+def test_insert_row_leaves_values_untouched(db):
+    values = {'name': 'Alice', 'age': 25}
+    db.insert_row('users', values)
+    assert values == {'name': 'Alice', 'age': 25}
+    assert db.search_one('users', {'name': 'Alice'})['age'] == 25
+
+
+def test_search_all_uses_batched_projection(db, find_calls):
+    fill(db, 250)
+    documents = db.search_all('users', columns=['name'], batch_size=50)
+    assert len(documents) == 250
+    assert all(set(document) == {'_id', 'name'} for document in documents)
+    assert find_calls[-1]['batch_size'] == 50
+
+
+def test_search_one_with_projection(db):
+    fill(db, 10)
+    assert db.search_one('users', {'n': 4}, columns=['name']) == {
+        '_id': db.search_one('users', {'n': 4})['_id'], 'name': 'user4'}
+    assert db.search_one('users', {'n': 99}) is None
+
+
+def test_update_and_delete_all_matching_documents(db):
+    fill(db, 30)
+    db.update_row('users', {'flag': True}, {'group': 0})
+    assert len([d for d in db.search_all('users') if d.get('flag')]) == 10
+    db.delete_row('users', {'n': {'$lt': 15}})
+    assert sorted(d['n'] for d in db.search_all('users')) == list(range(15, 30))
+
+
+def test_add_and_delete_column(db):
+    fill(db, 5)
+    db.add_column('users', 'active', 'BOOLEAN')
+    assert all(d['active'] is None for d in db.search_all('users'))
+    db.delete_column('users', 'active')
+    assert all('active' not in d for d in db.search_all('users'))
+
+
+def test_result_cache_is_invalidated_and_copied(driver):
+    cached = DatabaseManager('mongodb', 'dbunify_cached', result_cache_size=100)
+    try:
+        cached.insert_row('users', {'n': 1})
+        first = cached.search_all('users')
+        first[0]['n'] = 99
+        assert cached.search_all('users')[0]['n'] == 1
+        cached.insert_rows('users', [{'n': 2}])
+        assert len(cached.search_all('users')) == 2
+        cached.update_row('users', {'n': 3}, {'n': 2})
+        assert cached.search_one('users', {'n': 3}) is not None
+    finally:
+        cached.close()
+
+
+def test_paginate_walks_every_document_once(db):
+    fill(db, 95)
+    seen, after = [], None
+    while True:
+        page = db.paginate('users', 'n', 20, after=after, columns=['name'])
+        seen += [document['name'] for document in page['rows']]
+        after = page['next']
+        if after is None:
+            break
+    assert seen == [f'user{i}' for i in range(95)]
+
+    page = db.paginate('users', ['group DESC', 'n DESC'], 5, where={'group': {'$gte': 1}})
+    page = db.paginate('users', ['group DESC', 'n DESC'], 5, after=page['next'], where={'group': {'$gte': 1}})
+    assert [d['n'] for d in page['rows']] == [77, 74, 71, 68, 65]
+
+
+def test_backup_and_restore(db):
+    fill(db, 1500)
+    db.create_index('users', ['n'], unique=True)
+    assert db.backup_database('dbunify_test_backup')
+
+    db.delete_row('users', {})
+    db.drop_table('users')
+    db.insert_row('scratch', {'n': 1})
+    assert db.restore_database('dbunify_test_backup')
+
+    assert db.list_tables() == ['users']
+    assert len(db.search_all('users')) == 1500
+    assert 'ix_users_n' in [index['name'] for index in db.list_indexes('users')]
+
+    with pytest.raises(RuntimeError):
+        db.restore_database('dbunify_missing')
+    with pytest.raises(RuntimeError):
+        db.backup_database('dbunify_test')
+
+
+def test_json_retrieval(db):
+    record_id = db.insert_json_data('docs', {'a': {'b': 1}})
+    assert db.retrieve_json_data('docs', record_id)['a'] == {'b': 1}
+    assert db.retrieve_json_data('docs', 'missing') is None
+
+    assert db.insert_json_many('docs', ({'_id': i, 'a': {'b': i}} for i in range(100)), batch_size=30) == 100
+    documents = db.retrieve_json_many('docs', [42, 7, 1000, 7, 3], chunk_size=2)
+    assert list(documents) == [42, 7, 3]
+    assert documents[42]['a'] == {'b': 42}
+
+    assert [record_id for record_id, _ in db.find_json('docs', 'a.b', '>=', 97)] == [97, 98, 99]
+    assert len(db.find_json('docs', '$.a.b', 'exists', limit=5)) == 5
@@ -0,0 +1,57 @@
+"""
+Result cache invalidation tests on an in-memory SQLite database.
+"""
+
+import pytest
+
+from DbUnify import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    manager = DatabaseManager('sqlite', ':memory:', result_cache_size=100)
+    manager.create_table('items', [('id', 'INTEGER PRIMARY KEY'), ('name', 'TEXT')])
+    manager.insert_row('items', {'id': 1, 'name': 'a'})
+    yield manager
+    manager.close()
+
+
+def names(db):
+    return [row[1] for row in db.search_all('items')]
+
+
+def test_cached_select_is_served_from_the_cache(db):
+    assert names(db) == ['a']
+    assert names(db) == ['a']
+    assert db.result_cache_info()['hits'] == 1
+
+
+def test_refreshed_after_insert_update_and_delete(db):
+    assert names(db) == ['a']
+    assert db.search_one('items', 'id = 1')[1] == 'a'
+
+    db.insert_row('items', {'id': 2, 'name': 'b'})
+    assert names(db) == ['a', 'b']
+
+    db.update_row('items', {'name': 'c'}, 'id = 1')
+    assert names(db) == ['c', 'b']
+    assert db.search_one('items', 'id = 1')[1] == 'c'
+
+    db.delete_row('items', 'id = 2')
+    assert names(db) == ['c']
+
+
+def test_refreshed_after_raw_write(db):
+    assert names(db) == ['a']
+    db.execute_query("UPDATE items SET name = ? WHERE id = ?", 'raw', 1)
+    assert names(db) == ['raw']
+    db.execute_query("INSERT INTO items (id, name) VALUES (?, ?)", 2, 'b')
+    assert names(db) == ['raw', 'b']
+
+
+def test_refreshed_after_write_inside_cte(db):
+    assert names(db) == ['a']
+    db.execute_query("WITH doomed AS (SELECT id FROM items WHERE name = 'a') DELETE FROM items WHERE id IN (SELECT id FROM doomed)")
+    assert names(db) == []
+    db.execute_query("WITH fresh(id, name) AS (VALUES (3, 'cte')) INSERT INTO items (id, name) SELECT id, name FROM fresh")
+    assert names(db) == ['cte']
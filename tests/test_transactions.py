@@ -0,0 +1,62 @@
+"""
+Transaction, batch and group-commit tests on a SQLite file, checked from a second connection.
+"""
+
+import pytest
+
+from DbUnify import DatabaseManager
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'transactions.db')
+
+
+@pytest.fixture
+def db(path):
+    manager = DatabaseManager('sqlite', path)
+    manager.create_table('items', [('id', 'INTEGER PRIMARY KEY'), ('name', 'TEXT')])
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def reader(db, path):
+    manager = DatabaseManager('sqlite', path)
+    yield lambda: [name for (name,) in manager.fetch_all("SELECT name FROM items ORDER BY id")]
+    manager.close()
+
+
+def test_inner_rollback_keeps_the_outer_writes(db, reader):
+    with db.transaction():
+        db.insert_row('items', {'name': 'outer'})
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.insert_row('items', {'name': 'inner'})
+                raise ValueError('undo the savepoint')
+        db.insert_row('items', {'name': 'after'})
+        assert reader() == []
+    assert reader() == ['outer', 'after']
+
+
+def test_exception_inside_batch_discards_pending_rows(db, reader):
+    with pytest.raises(ValueError):
+        with db.batch(commit_every=3):
+            for i in range(5):
+                db.insert_row('items', {'name': f'row{i}'})
+            raise ValueError('abort the batch')
+    # The first group of three was committed before the failure.
+    assert reader() == ['row0', 'row1', 'row2']
+
+
+def test_group_commit_waits_for_flush(db, reader):
+    db.set_group_commit(commit_every=100)
+    for i in range(3):
+        db.insert_row('items', {'name': f'row{i}'})
+    assert reader() == []
+    db.flush()
+    assert reader() == ['row0', 'row1', 'row2']
+
+    db.insert_row('items', {'name': 'row3'})
+    db.set_group_commit(None)
+    assert reader() == ['row0', 'row1', 'row2', 'row3']